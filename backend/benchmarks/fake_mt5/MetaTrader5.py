@@ -0,0 +1,754 @@
+"""
+Pure-Python stand-in for the MetaTrader5 package.
+
+Put this directory ahead of site-packages on sys.path to run the MT5 Flask app
+and the Django clients on Linux without a Windows terminal. Bars and ticks are
+a deterministic function of (symbol, time), so the same request always returns
+the same prices; positions and order fills live in memory. Every terminal call
+sleeps for the configured latency to mimic the IPC round trip to the terminal.
+
+    import MetaTrader5 as mt5
+    mt5.configure(symbols=100, positions=100, latency=0.002)
+"""
+
+import os
+import time
+import zlib
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import numpy as np
+
+__version__ = '5.0.0-fake'
+__author__ = 'fake'
+
+# --- Constants (values match the real package) ---
+
+TIMEFRAME_M1 = 1
+TIMEFRAME_M2 = 2
+TIMEFRAME_M3 = 3
+TIMEFRAME_M4 = 4
+TIMEFRAME_M5 = 5
+TIMEFRAME_M6 = 6
+TIMEFRAME_M10 = 10
+TIMEFRAME_M12 = 12
+TIMEFRAME_M15 = 15
+TIMEFRAME_M20 = 20
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H2 = 16386
+TIMEFRAME_H3 = 16387
+TIMEFRAME_H4 = 16388
+TIMEFRAME_H6 = 16390
+TIMEFRAME_H8 = 16392
+TIMEFRAME_H12 = 16396
+TIMEFRAME_D1 = 16408
+TIMEFRAME_W1 = 32769
+TIMEFRAME_MN1 = 49153
+
+TIMEFRAME_SECONDS = {
+    TIMEFRAME_M1: 60, TIMEFRAME_M2: 120, TIMEFRAME_M3: 180, TIMEFRAME_M4: 240,
+    TIMEFRAME_M5: 300, TIMEFRAME_M6: 360, TIMEFRAME_M10: 600, TIMEFRAME_M12: 720,
+    TIMEFRAME_M15: 900, TIMEFRAME_M20: 1200, TIMEFRAME_M30: 1800,
+    TIMEFRAME_H1: 3600, TIMEFRAME_H2: 7200, TIMEFRAME_H3: 10800, TIMEFRAME_H4: 14400,
+    TIMEFRAME_H6: 21600, TIMEFRAME_H8: 28800, TIMEFRAME_H12: 43200,
+    TIMEFRAME_D1: 86400, TIMEFRAME_W1: 604800, TIMEFRAME_MN1: 2592000,
+}
+
+COPY_TICKS_ALL = -1
+COPY_TICKS_INFO = 1
+COPY_TICKS_TRADE = 2
+
+TICK_FLAG_BID = 2
+TICK_FLAG_ASK = 4
+TICK_FLAG_LAST = 8
+TICK_FLAG_VOLUME = 16
+TICK_FLAG_BUY = 32
+TICK_FLAG_SELL = 64
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_TYPE_BUY_LIMIT = 2
+ORDER_TYPE_SELL_LIMIT = 3
+ORDER_TYPE_BUY_STOP = 4
+ORDER_TYPE_SELL_STOP = 5
+ORDER_TYPE_CLOSE_BY = 8
+
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+
+ORDER_TIME_GTC = 0
+ORDER_TIME_DAY = 1
+
+ORDER_STATE_FILLED = 4
+
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+
+DEAL_TYPE_BUY = 0
+DEAL_TYPE_SELL = 1
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_PENDING = 5
+TRADE_ACTION_SLTP = 6
+TRADE_ACTION_MODIFY = 7
+TRADE_ACTION_REMOVE = 8
+TRADE_ACTION_CLOSE_BY = 10
+
+TRADE_RETCODE_REQUOTE = 10004
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_CANCEL = 10007
+TRADE_RETCODE_PLACED = 10008
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_DONE_PARTIAL = 10010
+TRADE_RETCODE_ERROR = 10011
+TRADE_RETCODE_TIMEOUT = 10012
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_PRICE = 10015
+TRADE_RETCODE_INVALID_STOPS = 10016
+TRADE_RETCODE_TRADE_DISABLED = 10017
+TRADE_RETCODE_MARKET_CLOSED = 10018
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_PRICE_CHANGED = 10020
+TRADE_RETCODE_PRICE_OFF = 10021
+TRADE_RETCODE_INVALID_EXPIRATION = 10022
+TRADE_RETCODE_ORDER_CHANGED = 10023
+TRADE_RETCODE_TOO_MANY_REQUESTS = 10024
+TRADE_RETCODE_NO_CHANGES = 10025
+TRADE_RETCODE_SERVER_DISABLES_AT = 10026
+TRADE_RETCODE_CLIENT_DISABLES_AT = 10027
+TRADE_RETCODE_LOCKED = 10028
+TRADE_RETCODE_FROZEN = 10029
+TRADE_RETCODE_INVALID_FILL = 10030
+TRADE_RETCODE_CONNECTION = 10031
+TRADE_RETCODE_ONLY_REAL = 10032
+TRADE_RETCODE_LIMIT_ORDERS = 10033
+TRADE_RETCODE_LIMIT_VOLUME = 10034
+TRADE_RETCODE_INVALID_ORDER = 10035
+TRADE_RETCODE_POSITION_CLOSED = 10036
+TRADE_RETCODE_INVALID_CLOSE_VOLUME = 10038
+TRADE_RETCODE_CLOSE_ORDER_EXIST = 10039
+TRADE_RETCODE_LIMIT_POSITIONS = 10040
+TRADE_RETCODE_REJECT_CANCEL = 10041
+TRADE_RETCODE_LONG_ONLY = 10042
+TRADE_RETCODE_SHORT_ONLY = 10043
+TRADE_RETCODE_CLOSE_ONLY = 10044
+TRADE_RETCODE_FIFO_CLOSE = 10045
+
+RES_S_OK = 1
+RES_E_FAIL = -1
+RES_E_INVALID_PARAMS = -2
+RES_E_NOT_FOUND = -4
+RES_E_INTERNAL_FAIL = -10001
+
+# --- Result structures ---
+
+RATE_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8'),
+])
+
+TICK_DTYPE = np.dtype([
+    ('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+    ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8'),
+])
+
+Tick = namedtuple('Tick', ['time', 'bid', 'ask', 'last', 'volume', 'time_msc', 'flags', 'volume_real'])
+
+TerminalInfo = namedtuple('TerminalInfo', [
+    'community_account', 'community_connection', 'connected', 'dlls_allowed', 'trade_allowed',
+    'tradeapi_disabled', 'email_enabled', 'ftp_enabled', 'notifications_enabled', 'mqid',
+    'build', 'maxbars', 'codepage', 'ping_last', 'community_balance', 'retransmission',
+    'company', 'name', 'language', 'path', 'data_path', 'commondata_path',
+])
+
+AccountInfo = namedtuple('AccountInfo', [
+    'login', 'trade_mode', 'leverage', 'limit_orders', 'margin_so_mode', 'trade_allowed',
+    'trade_expert', 'margin_mode', 'currency_digits', 'fifo_close', 'balance', 'credit',
+    'profit', 'equity', 'margin', 'margin_free', 'margin_level', 'margin_so_call',
+    'margin_so_so', 'margin_initial', 'margin_maintenance', 'assets', 'liabilities',
+    'commission_blocked', 'name', 'server', 'currency', 'company',
+])
+
+SymbolInfo = namedtuple('SymbolInfo', [
+    'custom', 'select', 'visible', 'digits', 'spread', 'spread_float', 'trade_mode',
+    'time', 'bid', 'ask', 'last', 'volume', 'point', 'trade_tick_value', 'trade_tick_size',
+    'trade_contract_size', 'volume_min', 'volume_max', 'volume_step', 'currency_base',
+    'currency_profit', 'currency_margin', 'description', 'path', 'name',
+])
+
+TradePosition = namedtuple('TradePosition', [
+    'ticket', 'time', 'time_msc', 'time_update', 'time_update_msc', 'type', 'magic',
+    'identifier', 'reason', 'volume', 'price_open', 'sl', 'tp', 'price_current', 'swap',
+    'profit', 'symbol', 'comment', 'external_id',
+])
+
+OrderSendResult = namedtuple('OrderSendResult', [
+    'retcode', 'deal', 'order', 'volume', 'price', 'bid', 'ask', 'comment', 'request_id',
+    'retcode_external', 'request',
+])
+
+TradeRequest = namedtuple('TradeRequest', [
+    'action', 'magic', 'order', 'symbol', 'volume', 'price', 'stoplimit', 'sl', 'tp',
+    'deviation', 'type', 'type_filling', 'type_time', 'expiration', 'comment', 'position',
+    'position_by',
+])
+
+TradeDeal = namedtuple('TradeDeal', [
+    'ticket', 'order', 'time', 'time_msc', 'type', 'entry', 'magic', 'position_id', 'reason',
+    'volume', 'price', 'commission', 'swap', 'profit', 'fee', 'symbol', 'comment', 'external_id',
+])
+
+TradeOrder = namedtuple('TradeOrder', [
+    'ticket', 'time_setup', 'time_setup_msc', 'time_done', 'time_done_msc', 'time_expiration',
+    'type', 'type_time', 'type_filling', 'state', 'magic', 'position_id', 'position_by_id',
+    'reason', 'volume_initial', 'volume_current', 'price_open', 'sl', 'tp', 'price_current',
+    'price_stoplimit', 'symbol', 'comment', 'external_id',
+])
+
+# --- Simulation state ---
+
+KNOWN_SYMBOLS = [
+    'EURUSD.Z', 'GBPUSD.Z', 'USDJPY.Z', 'AUDUSD.Z', 'USDCAD.Z', 'USDCHF.Z', 'NZDUSD.Z',
+    'EURGBP.Z', 'EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD', 'XAGUSD', 'BITCOIN', 'ETHEREUM',
+]
+
+CONTRACT_SIZE = 100000.0
+TICK_INTERVAL_MSC = 250
+
+_lock = threading.RLock()
+_state = {
+    'latency': float(os.environ.get('FAKE_MT5_LATENCY_MS', 0)) / 1000.0,
+    'now': None,
+    'initialized': False,
+    'last_error': (RES_S_OK, 'Success'),
+    'symbols': list(KNOWN_SYMBOLS),
+    'positions': {},
+    'deals': [],
+    'orders': [],
+    'next_ticket': 100000000,
+    'balance': 100000.0,
+}
+
+
+def _seed(symbol):
+    return zlib.crc32(symbol.encode()) & 0xFFFF
+
+
+def _base_price(symbol):
+    if 'JPY' in symbol:
+        return 150.0
+    if symbol in ('XAUUSD',):
+        return 2000.0
+    if symbol in ('BITCOIN', 'ETHEREUM'):
+        return 40000.0 if symbol == 'BITCOIN' else 2500.0
+    return 1.0 + (_seed(symbol) % 500) / 1000.0
+
+
+def _digits(symbol):
+    price = _base_price(symbol)
+    if price >= 1000:
+        return 2
+    if price >= 100:
+        return 3
+    return 5
+
+
+def _noise(x, seed):
+    # Cheap, vectorised, deterministic pseudo-noise in [-1, 1)
+    return (np.modf(np.sin(x * 12.9898 + seed * 78.233) * 43758.5453)[0])
+
+
+def _mid_price(symbol, t):
+    """Mid price at time t (seconds, float or array)."""
+    t = np.asarray(t, dtype=np.float64)
+    seed = _seed(symbol)
+    base = _base_price(symbol)
+    drift = (
+        0.020 * np.sin(t / 2_592_000.0 + seed)
+        + 0.008 * np.sin(t / 604_800.0 + seed * 0.5)
+        + 0.003 * np.sin(t / 86_400.0 + seed * 0.25)
+        + 0.0008 * np.sin(t / 3_600.0 + seed * 0.125)
+        + 0.0002 * _noise(np.floor(t), seed)
+    )
+    return base * (1.0 + drift)
+
+
+def _now():
+    return _state['now'] if _state['now'] is not None else time.time()
+
+
+def _spread(symbol):
+    return 10 ** (-_digits(symbol)) * (10 + _seed(symbol) % 10)
+
+
+def _sleep():
+    if _state['latency'] > 0:
+        time.sleep(_state['latency'])
+
+
+def _fail(code=RES_E_FAIL, message='Terminal: Call failed'):
+    _state['last_error'] = (code, message)
+    return None
+
+
+def _ok():
+    _state['last_error'] = (RES_S_OK, 'Success')
+
+
+def _next_ticket():
+    with _lock:
+        _state['next_ticket'] += 1
+        return _state['next_ticket']
+
+
+def _make_symbols(count):
+    if count <= len(KNOWN_SYMBOLS):
+        return list(KNOWN_SYMBOLS[:count])
+    return list(KNOWN_SYMBOLS) + [f"SYN{i:04d}" for i in range(count - len(KNOWN_SYMBOLS))]
+
+
+def _bars(symbol, timeframe, bar_times):
+    period = TIMEFRAME_SECONDS[timeframe]
+    n = len(bar_times)
+    rates = np.empty(n, dtype=RATE_DTYPE)
+    rates['time'] = bar_times
+    # Sample the price path at four points inside the bar for OHLC.
+    offsets = np.array([0.0, 0.3, 0.7, 1.0]) * (period - 1)
+    samples = _mid_price(symbol, bar_times[:, None] + offsets[None, :])
+    rates['open'] = samples[:, 0]
+    rates['close'] = samples[:, 3]
+    rates['high'] = samples.max(axis=1)
+    rates['low'] = samples.min(axis=1)
+    rates['tick_volume'] = (100 + (np.abs(_noise(bar_times.astype(np.float64), _seed(symbol))) * 900)).astype(np.uint64)
+    rates['spread'] = int(round(_spread(symbol) / 10 ** (-_digits(symbol))))
+    rates['real_volume'] = 0
+    digits = _digits(symbol)
+    for field in ('open', 'high', 'low', 'close'):
+        rates[field] = np.round(rates[field], digits)
+    return rates
+
+
+def _ticks(symbol, start_msc, end_msc):
+    first = -(-start_msc // TICK_INTERVAL_MSC) * TICK_INTERVAL_MSC
+    if first > end_msc:
+        return np.empty(0, dtype=TICK_DTYPE)
+    time_msc = np.arange(first, end_msc + 1, TICK_INTERVAL_MSC, dtype=np.int64)
+    mid = _mid_price(symbol, time_msc / 1000.0)
+    half_spread = _spread(symbol) / 2
+    digits = _digits(symbol)
+    ticks = np.empty(len(time_msc), dtype=TICK_DTYPE)
+    ticks['time'] = time_msc // 1000
+    ticks['time_msc'] = time_msc
+    ticks['bid'] = np.round(mid - half_spread, digits)
+    ticks['ask'] = np.round(mid + half_spread, digits)
+    ticks['last'] = 0.0
+    ticks['volume'] = 0
+    ticks['flags'] = TICK_FLAG_BID | TICK_FLAG_ASK
+    ticks['volume_real'] = 0.0
+    return ticks
+
+
+def _to_timestamp(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def _quote(symbol, t=None):
+    t = _now() if t is None else t
+    mid = float(_mid_price(symbol, t))
+    half_spread = _spread(symbol) / 2
+    digits = _digits(symbol)
+    return round(mid - half_spread, digits), round(mid + half_spread, digits)
+
+
+def _position_profit(position, bid, ask):
+    price_current = bid if position['type'] == POSITION_TYPE_BUY else ask
+    direction = 1 if position['type'] == POSITION_TYPE_BUY else -1
+    profit = direction * (price_current - position['price_open']) * position['volume'] * CONTRACT_SIZE
+    return price_current, round(profit, 2)
+
+
+def _open_position(symbol, order_type, volume, price, sl=0.0, tp=0.0, magic=0, comment='', t=None):
+    t = _now() if t is None else t
+    ticket = _next_ticket()
+    position = {
+        'ticket': ticket, 'time': int(t), 'time_msc': int(t * 1000),
+        'time_update': int(t), 'time_update_msc': int(t * 1000),
+        'type': order_type, 'magic': magic, 'identifier': ticket, 'reason': 3,
+        'volume': volume, 'price_open': price, 'sl': sl or 0.0, 'tp': tp or 0.0,
+        'swap': 0.0, 'symbol': symbol, 'comment': comment, 'external_id': '',
+    }
+    with _lock:
+        _state['positions'][ticket] = position
+    _record_history(ticket, position, DEAL_ENTRY_IN, order_type, price, t)
+    return position
+
+
+def _record_history(ticket, position, entry, deal_type, price, t, profit=0.0):
+    deal = TradeDeal(
+        ticket=_next_ticket(), order=ticket, time=int(t), time_msc=int(t * 1000), type=deal_type,
+        entry=entry, magic=position['magic'], position_id=position['ticket'], reason=3,
+        volume=position['volume'], price=price, commission=0.0, swap=0.0, profit=profit,
+        fee=0.0, symbol=position['symbol'], comment=position['comment'], external_id='',
+    )
+    order = TradeOrder(
+        ticket=ticket, time_setup=int(t), time_setup_msc=int(t * 1000), time_done=int(t),
+        time_done_msc=int(t * 1000), time_expiration=0, type=deal_type, type_time=ORDER_TIME_GTC,
+        type_filling=ORDER_FILLING_FOK, state=ORDER_STATE_FILLED, magic=position['magic'],
+        position_id=position['ticket'], position_by_id=0, reason=3,
+        volume_initial=position['volume'], volume_current=0.0, price_open=price,
+        sl=position['sl'], tp=position['tp'], price_current=price, price_stoplimit=0.0,
+        symbol=position['symbol'], comment=position['comment'], external_id='',
+    )
+    with _lock:
+        _state['deals'].append(deal)
+        _state['orders'].append(order)
+
+
+def configure(symbols=None, positions=None, latency=None, now=None, balance=None):
+    """
+    Reset the simulation.
+
+    :param symbols: Number of tradable symbols, or an explicit list of names.
+    :param positions: Number of open positions to seed, spread round-robin over the symbols.
+    :param latency: Seconds every terminal call sleeps before returning.
+    :param now: Freeze the clock at this Unix timestamp (None follows the wall clock).
+    :param balance: Account balance in USD.
+    """
+    with _lock:
+        if symbols is not None:
+            _state['symbols'] = list(symbols) if not isinstance(symbols, int) else _make_symbols(symbols)
+        if latency is not None:
+            _state['latency'] = latency
+        if balance is not None:
+            _state['balance'] = balance
+        _state['now'] = now
+        _state['positions'] = {}
+        _state['deals'] = []
+        _state['orders'] = []
+        _state['next_ticket'] = 100000000
+
+    if positions:
+        t = _now()
+        names = _state['symbols']
+        for i in range(positions):
+            symbol = names[i % len(names)]
+            order_type = ORDER_TYPE_BUY if i % 2 == 0 else ORDER_TYPE_SELL
+            # Open in the past so positions carry some profit or loss.
+            opened_at = t - 3600 * (1 + i % 24)
+            bid, ask = _quote(symbol, opened_at)
+            price = ask if order_type == ORDER_TYPE_BUY else bid
+            step = price * 0.01
+            sl = price - step if order_type == ORDER_TYPE_BUY else price + step
+            _open_position(symbol, order_type, 0.1, price, sl=round(sl, _digits(symbol)),
+                           magic=219000, comment='seed', t=opened_at)
+
+
+# --- Terminal API ---
+
+def initialize(*args, **kwargs):
+    _sleep()
+    _state['initialized'] = True
+    _ok()
+    return True
+
+
+def login(*args, **kwargs):
+    _sleep()
+    _ok()
+    return True
+
+
+def shutdown():
+    _state['initialized'] = False
+    return None
+
+
+def version():
+    return (500, 4000, '01 Jan 2024')
+
+
+def last_error():
+    return _state['last_error']
+
+
+def terminal_info():
+    _sleep()
+    if not _state['initialized']:
+        return _fail(RES_E_FAIL, 'Terminal: Not initialized')
+    return TerminalInfo(
+        community_account=False, community_connection=False, connected=True, dlls_allowed=False,
+        trade_allowed=True, tradeapi_disabled=False, email_enabled=False, ftp_enabled=False,
+        notifications_enabled=False, mqid=False, build=4000, maxbars=100000, codepage=0,
+        ping_last=1000, community_balance=0.0, retransmission=0.0, company='Fake Broker',
+        name='MetaTrader 5', language='English', path='C:\\fake', data_path='C:\\fake',
+        commondata_path='C:\\fake',
+    )
+
+
+def account_info():
+    _sleep()
+    with _lock:
+        profit = 0.0
+        for position in _state['positions'].values():
+            bid, ask = _quote(position['symbol'])
+            profit += _position_profit(position, bid, ask)[1]
+        balance = _state['balance']
+    equity = balance + profit
+    margin = 0.0
+    return AccountInfo(
+        login=1234567, trade_mode=0, leverage=500, limit_orders=200, margin_so_mode=0,
+        trade_allowed=True, trade_expert=True, margin_mode=2, currency_digits=2, fifo_close=False,
+        balance=balance, credit=0.0, profit=round(profit, 2), equity=round(equity, 2), margin=margin,
+        margin_free=round(equity - margin, 2), margin_level=0.0, margin_so_call=50.0,
+        margin_so_so=30.0, margin_initial=0.0, margin_maintenance=0.0, assets=0.0,
+        liabilities=0.0, commission_blocked=0.0, name='Fake Account', server='Fake-Server',
+        currency='USD', company='Fake Broker',
+    )
+
+
+def symbols_total():
+    return len(_state['symbols'])
+
+
+def symbols_get(group=None):
+    _sleep()
+    return tuple(symbol_info(name) for name in _state['symbols'])
+
+
+def symbol_select(symbol, enable=True):
+    return symbol in _state['symbols']
+
+
+def symbol_info(symbol):
+    _sleep()
+    if symbol not in _state['symbols']:
+        return _fail(RES_E_NOT_FOUND, 'Terminal: Not found')
+    bid, ask = _quote(symbol)
+    digits = _digits(symbol)
+    point = 10 ** (-digits)
+    _ok()
+    return SymbolInfo(
+        custom=False, select=True, visible=True, digits=digits,
+        spread=int(round((ask - bid) / point)), spread_float=True, trade_mode=4,
+        time=int(_now()), bid=bid, ask=ask, last=0.0, volume=0, point=point,
+        trade_tick_value=1.0, trade_tick_size=point, trade_contract_size=CONTRACT_SIZE,
+        volume_min=0.01, volume_max=100.0, volume_step=0.01, currency_base=symbol[:3],
+        currency_profit='USD', currency_margin=symbol[:3], description=f"Fake {symbol}",
+        path=f"Forex\\{symbol}", name=symbol,
+    )
+
+
+def symbol_info_tick(symbol):
+    _sleep()
+    if symbol not in _state['symbols']:
+        return _fail(RES_E_NOT_FOUND, 'Terminal: Not found')
+    t = _now()
+    bid, ask = _quote(symbol, t)
+    _ok()
+    return Tick(time=int(t), bid=bid, ask=ask, last=0.0, volume=0, time_msc=int(t * 1000),
+                flags=TICK_FLAG_BID | TICK_FLAG_ASK, volume_real=0.0)
+
+
+def copy_rates_from_pos(symbol, timeframe, start_pos, count):
+    _sleep()
+    if symbol not in _state['symbols'] or timeframe not in TIMEFRAME_SECONDS:
+        return _fail(RES_E_INVALID_PARAMS, 'Terminal: Invalid params')
+    period = TIMEFRAME_SECONDS[timeframe]
+    current_bar = int(_now()) // period * period
+    last_bar = current_bar - start_pos * period
+    bar_times = last_bar - np.arange(count - 1, -1, -1, dtype=np.int64) * period
+    _ok()
+    return _bars(symbol, timeframe, bar_times)
+
+
+def copy_rates_from(symbol, timeframe, date_from, count):
+    _sleep()
+    if symbol not in _state['symbols'] or timeframe not in TIMEFRAME_SECONDS:
+        return _fail(RES_E_INVALID_PARAMS, 'Terminal: Invalid params')
+    period = TIMEFRAME_SECONDS[timeframe]
+    last_bar = int(_to_timestamp(date_from)) // period * period
+    bar_times = last_bar - np.arange(count - 1, -1, -1, dtype=np.int64) * period
+    _ok()
+    return _bars(symbol, timeframe, bar_times)
+
+
+def copy_rates_range(symbol, timeframe, date_from, date_to):
+    _sleep()
+    if symbol not in _state['symbols'] or timeframe not in TIMEFRAME_SECONDS:
+        return _fail(RES_E_INVALID_PARAMS, 'Terminal: Invalid params')
+    period = TIMEFRAME_SECONDS[timeframe]
+    start = -(-int(_to_timestamp(date_from)) // period) * period
+    end = min(int(_to_timestamp(date_to)), int(_now()))
+    bar_times = np.arange(start, end + 1, period, dtype=np.int64)
+    _ok()
+    return _bars(symbol, timeframe, bar_times)
+
+
+def copy_ticks_from(symbol, date_from, count, flags=COPY_TICKS_ALL):
+    _sleep()
+    if symbol not in _state['symbols']:
+        return _fail(RES_E_INVALID_PARAMS, 'Terminal: Invalid params')
+    start_msc = int(_to_timestamp(date_from) * 1000)
+    end_msc = min(start_msc + count * TICK_INTERVAL_MSC, int(_now() * 1000))
+    _ok()
+    return _ticks(symbol, start_msc, end_msc)[:count]
+
+
+def copy_ticks_range(symbol, date_from, date_to, flags=COPY_TICKS_ALL):
+    _sleep()
+    if symbol not in _state['symbols']:
+        return _fail(RES_E_INVALID_PARAMS, 'Terminal: Invalid params')
+    start_msc = int(_to_timestamp(date_from) * 1000)
+    end_msc = min(int(_to_timestamp(date_to) * 1000), int(_now() * 1000))
+    _ok()
+    return _ticks(symbol, start_msc, end_msc)
+
+
+def positions_total():
+    _sleep()
+    return len(_state['positions'])
+
+
+def positions_get(symbol=None, group=None, ticket=None):
+    _sleep()
+    with _lock:
+        positions = list(_state['positions'].values())
+    if ticket is not None:
+        positions = [p for p in positions if p['ticket'] == ticket]
+    if symbol is not None:
+        positions = [p for p in positions if p['symbol'] == symbol]
+
+    quotes = {}
+    result = []
+    for position in positions:
+        if position['symbol'] not in quotes:
+            quotes[position['symbol']] = _quote(position['symbol'])
+        price_current, profit = _position_profit(position, *quotes[position['symbol']])
+        result.append(TradePosition(price_current=price_current, profit=profit, **position))
+    _ok()
+    return tuple(result)
+
+
+def orders_total():
+    return 0
+
+
+def orders_get(*args, **kwargs):
+    return ()
+
+
+def order_check(request):
+    return None
+
+
+def order_send(request):
+    _sleep()
+    action = request.get('action')
+    symbol = request.get('symbol')
+    trade_request = TradeRequest(
+        action=action or 0, magic=request.get('magic', 0), order=0, symbol=symbol or '',
+        volume=request.get('volume', 0.0), price=request.get('price', 0.0), stoplimit=0.0,
+        sl=request.get('sl', 0.0), tp=request.get('tp', 0.0), deviation=request.get('deviation', 0),
+        type=request.get('type', 0), type_filling=request.get('type_filling', 0),
+        type_time=request.get('type_time', 0), expiration=0, comment=request.get('comment', ''),
+        position=request.get('position', 0), position_by=0,
+    )
+
+    def result(retcode, comment, deal=0, order=0, volume=0.0, price=0.0, bid=0.0, ask=0.0):
+        _ok()
+        return OrderSendResult(retcode=retcode, deal=deal, order=order, volume=volume, price=price,
+                               bid=bid, ask=ask, comment=comment, request_id=0,
+                               retcode_external=0, request=trade_request)
+
+    if action == TRADE_ACTION_SLTP:
+        with _lock:
+            position = _state['positions'].get(request.get('position'))
+            if position is None:
+                return result(TRADE_RETCODE_POSITION_CLOSED, 'Position closed')
+            t = _now()
+            position['sl'] = request.get('sl') or 0.0
+            position['tp'] = request.get('tp') or 0.0
+            position['time_update'] = int(t)
+            position['time_update_msc'] = int(t * 1000)
+        return result(TRADE_RETCODE_DONE, 'Request executed')
+
+    if action != TRADE_ACTION_DEAL:
+        return result(TRADE_RETCODE_INVALID, 'Invalid request')
+    if symbol not in _state['symbols']:
+        return result(TRADE_RETCODE_INVALID, 'Invalid symbol')
+
+    volume = float(request.get('volume', 0.0))
+    if volume <= 0:
+        return result(TRADE_RETCODE_INVALID_VOLUME, 'Invalid volume')
+
+    bid, ask = _quote(symbol)
+    order_type = request.get('type')
+    price = ask if order_type == ORDER_TYPE_BUY else bid
+    ticket_to_close = request.get('position')
+
+    if ticket_to_close:
+        with _lock:
+            position = _state['positions'].pop(ticket_to_close, None)
+        if position is None:
+            return result(TRADE_RETCODE_POSITION_CLOSED, 'Position closed')
+        _, profit = _position_profit(position, bid, ask)
+        with _lock:
+            _state['balance'] += profit
+        order_ticket = _next_ticket()
+        _record_history(order_ticket, position, DEAL_ENTRY_OUT, order_type, price, _now(), profit)
+        return result(TRADE_RETCODE_DONE, 'Request executed', deal=order_ticket, order=order_ticket,
+                      volume=position['volume'], price=price, bid=bid, ask=ask)
+
+    position = _open_position(symbol, order_type, volume, price, sl=request.get('sl', 0.0),
+                              tp=request.get('tp', 0.0), magic=request.get('magic', 0),
+                              comment=request.get('comment', ''))
+    return result(TRADE_RETCODE_DONE, 'Request executed', deal=position['ticket'], order=position['ticket'],
+                  volume=volume, price=price, bid=bid, ask=ask)
+
+
+def history_deals_total(date_from, date_to):
+    return len(history_deals_get(date_from, date_to) or ())
+
+
+def history_deals_get(date_from=None, date_to=None, group=None, ticket=None, position=None):
+    _sleep()
+    with _lock:
+        deals = list(_state['deals'])
+    if position is not None:
+        deals = [d for d in deals if d.position_id == position]
+    elif ticket is not None:
+        deals = [d for d in deals if d.order == ticket]
+    elif date_from is not None and date_to is not None:
+        start, end = _to_timestamp(date_from), _to_timestamp(date_to)
+        deals = [d for d in deals if start <= d.time <= end]
+    _ok()
+    return tuple(deals)
+
+
+def history_orders_total(date_from, date_to):
+    return len(history_orders_get(date_from, date_to) or ())
+
+
+def history_orders_get(date_from=None, date_to=None, group=None, ticket=None, position=None):
+    _sleep()
+    with _lock:
+        orders = list(_state['orders'])
+    if ticket is not None:
+        orders = [o for o in orders if o.ticket == ticket]
+    elif position is not None:
+        orders = [o for o in orders if o.position_id == position]
+    elif date_from is not None and date_to is not None:
+        start, end = _to_timestamp(date_from), _to_timestamp(date_to)
+        orders = [o for o in orders if start <= o.time_setup <= end]
+    _ok()
+    return tuple(orders)
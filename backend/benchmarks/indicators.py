@@ -0,0 +1,276 @@
+"""
+Micro-benchmarks for app.quant.indicators with reference-equivalence checks.
+
+Each indicator is run over synthetic OHLC bars (same column order as the
+/fetch_data_pos response: time, open, high, low, close, tick_volume, spread,
+real_volume) and timed together with its peak traced memory. The current
+implementations in app.quant.indicators are the reference: an optimized
+candidate registered with --candidate is run on the same input and its output
+must be bit-identical to the reference, otherwise the run fails.
+
+    python backend/benchmarks/indicators.py
+    python backend/benchmarks/indicators.py --bars 1000 100000 10000000
+    python backend/benchmarks/indicators.py --candidate mean_reversion=app.quant.indicators.streaming:mean_reversion
+
+The reference implementations loop in Python, so they are only run up to
+--max-reference-bars; larger sizes time the candidate alone.
+"""
+
+import os
+import sys
+import time
+import struct
+import argparse
+import importlib
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'django'))
+
+from app.quant.indicators.mean_reversion import mean_reversion  # noqa: E402
+from app.quant.indicators.trend import get_enhanced_swing_points, detect_trend  # noqa: E402
+from app.quant.indicators.candlestick import detect_candlestick_pattern  # noqa: E402
+from app.quant.indicators.fibonacci import calculate_fib_levels  # noqa: E402
+from app.quant.indicators.streaming import BollingerBands, MeanReversionSignal, SwingPoints  # noqa: E402
+
+DEFAULT_BARS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+RATE_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume']
+FIB_LEVELS = [0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0]
+
+
+def synthetic_rates(bars, seed=42):
+    """Random-walk M15 bars; the same (bars, seed) always gives the same frame."""
+    rng = np.random.default_rng(seed)
+    close = 1.1 * np.exp(np.cumsum(rng.normal(0.0, 0.0005, bars)))
+    open_ = np.empty(bars)
+    open_[0] = 1.1
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.normal(0.0, 0.0003, (2, bars)))
+    return pd.DataFrame({
+        'time': pd.to_datetime(1_700_000_000 + np.arange(bars, dtype=np.int64) * 900, unit='s', utc=True),
+        'open': open_,
+        'high': np.maximum(open_, close) + wick[0],
+        'low': np.minimum(open_, close) - wick[1],
+        'close': close,
+        'tick_volume': rng.integers(50, 1000, bars),
+        'spread': rng.integers(5, 20, bars, dtype=np.int32),
+        'real_volume': np.zeros(bars, dtype=np.int64),
+    }, columns=RATE_COLUMNS)
+
+
+# --- Signal adapters ---
+#
+# Each adapter takes the synthetic frame and returns the signal the strategies act
+# on, so a candidate with the same call signature as the reference can be dropped in.
+
+def run_mean_reversion(func, rates):
+    # The reference adds and drops columns on its input, so hand it a copy.
+    return func(rates[['close']].copy())
+
+
+def run_swing_points(func, rates):
+    return func(rates)
+
+
+def run_trend(func, rates):
+    highs, lows = get_enhanced_swing_points(rates)
+    # detect_trend only looks at the last two swings; evaluate it after every swing.
+    return [func(highs[:i], lows[:i]) for i in range(2, min(len(highs), len(lows)) + 1)]
+
+
+def run_candlestick(func, rates):
+    values = rates.to_numpy()
+    return [func(values[i - 2:i + 1]) for i in range(2, len(values))]
+
+
+def run_fib_levels(func, rates):
+    highs, lows = get_enhanced_swing_points(rates)
+    return [func(high['price'], low['price'], FIB_LEVELS) for high, low in zip(highs, lows)]
+
+
+INDICATORS = {
+    'mean_reversion': (mean_reversion, run_mean_reversion),
+    'swing_points': (get_enhanced_swing_points, run_swing_points),
+    'trend': (detect_trend, run_trend),
+    'candlestick': (detect_candlestick_pattern, run_candlestick),
+    'fib_levels': (calculate_fib_levels, run_fib_levels),
+}
+
+
+# --- Streaming parity ---
+#
+# Streaming indicators must give the same values from batch() as from update()
+# fed one bar at a time. Each entry builds an indicator and turns the per-bar
+# update() results into the shape batch() returns.
+
+def _bands_from_updates(indicator, updates):
+    return tuple(np.array(column) for column in zip(*updates))
+
+
+def _signals_from_updates(indicator, updates):
+    return np.array(updates, dtype=object)
+
+
+def _swings_from_updates(indicator, updates):
+    return list(indicator.highs), list(indicator.lows)
+
+
+STREAMING = {
+    'bollinger_bands': (lambda: BollingerBands(20, 2), _bands_from_updates),
+    'mean_reversion': (lambda: MeanReversionSignal(20, 2), _signals_from_updates),
+    'swing_points': (lambda: SwingPoints('low', 'close'), _swings_from_updates),
+}
+
+
+def check_streaming(rates):
+    """Names of streaming indicators whose batch() and update() paths disagree."""
+    records = rates.to_dict('records')
+    failures = []
+    for name, (factory, collect) in STREAMING.items():
+        batched = factory().batch(rates)
+        indicator = factory()
+        updates = [indicator.update(bar) for bar in records]
+        try:
+            assert_identical(batched, collect(indicator, updates))
+        except AssertionError as e:
+            failures.append(f"{name}: {e}")
+    return failures
+
+
+# --- Equivalence ---
+
+def _float_bits(value):
+    return struct.pack('<d', value)
+
+
+def assert_identical(reference, candidate, path='result'):
+    """Raise AssertionError unless candidate matches reference bit for bit (NaNs included)."""
+    if isinstance(reference, pd.Series):
+        assert isinstance(candidate, pd.Series), f"{path}: expected Series, got {type(candidate).__name__}"
+        assert reference.dtype == candidate.dtype, f"{path}: dtype {reference.dtype} != {candidate.dtype}"
+        assert reference.index.equals(candidate.index), f"{path}: index differs"
+        assert reference.name == candidate.name, f"{path}: name {reference.name!r} != {candidate.name!r}"
+        assert_identical(reference.to_numpy(), candidate.to_numpy(), path)
+    elif isinstance(reference, np.ndarray):
+        assert isinstance(candidate, np.ndarray), f"{path}: expected ndarray, got {type(candidate).__name__}"
+        assert reference.shape == candidate.shape, f"{path}: shape {reference.shape} != {candidate.shape}"
+        if reference.dtype == object:
+            for i, (a, b) in enumerate(zip(reference, candidate)):
+                assert_identical(a, b, f"{path}[{i}]")
+        else:
+            assert reference.dtype == candidate.dtype, f"{path}: dtype {reference.dtype} != {candidate.dtype}"
+            mismatch = np.flatnonzero(np.ascontiguousarray(reference).view(np.uint8)
+                                      != np.ascontiguousarray(candidate).view(np.uint8))
+            assert mismatch.size == 0, f"{path}: first difference at element {mismatch[0] // reference.itemsize}"
+    elif isinstance(reference, (list, tuple)):
+        assert type(reference) is type(candidate), f"{path}: expected {type(reference).__name__}, got {type(candidate).__name__}"
+        assert len(reference) == len(candidate), f"{path}: length {len(reference)} != {len(candidate)}"
+        for i, (a, b) in enumerate(zip(reference, candidate)):
+            assert_identical(a, b, f"{path}[{i}]")
+    elif isinstance(reference, dict):
+        assert isinstance(candidate, dict), f"{path}: expected dict, got {type(candidate).__name__}"
+        assert reference.keys() == candidate.keys(), f"{path}: keys {sorted(reference)} != {sorted(candidate)}"
+        for key in reference:
+            assert_identical(reference[key], candidate[key], f"{path}[{key!r}]")
+    elif isinstance(reference, (float, np.floating)):
+        assert isinstance(candidate, (float, np.floating)), f"{path}: expected float, got {type(candidate).__name__}"
+        assert _float_bits(reference) == _float_bits(candidate), f"{path}: {reference!r} != {candidate!r}"
+    else:
+        assert type(reference) is type(candidate) and reference == candidate, f"{path}: {reference!r} != {candidate!r}"
+
+
+# --- Measurement ---
+
+def measure(func, adapter, rates):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = adapter(func, rates)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def load_candidate(spec):
+    name, _, target = spec.partition('=')
+    module_name, _, attr = target.partition(':')
+    if name not in INDICATORS or not module_name or not attr:
+        raise argparse.ArgumentTypeError(f"Expected <indicator>=<module>:<function>, got {spec!r}")
+    return name, getattr(importlib.import_module(module_name), attr)
+
+
+def format_row(name, bars, ref, cand, status):
+    def fmt(measurement):
+        if measurement is None:
+            return f"{'-':>10}{'-':>10}"
+        return f"{measurement[1] * 1000:>10.1f}{measurement[2] / 1048576:>10.1f}"
+
+    speedup = '-'
+    if ref is not None and cand is not None and cand[1] > 0:
+        speedup = f"{ref[1] / cand[1]:.1f}x"
+    return f"{name:<16}{bars:>10}{fmt(ref)}{fmt(cand)}{speedup:>9}  {status}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indicator micro-benchmarks with equivalence checks.')
+    parser.add_argument('--bars', type=int, nargs='+', default=DEFAULT_BARS, help='Bar counts to benchmark.')
+    parser.add_argument('--indicators', nargs='+', choices=sorted(INDICATORS), default=sorted(INDICATORS))
+    parser.add_argument('--candidate', action='append', default=[], type=load_candidate,
+                        help='Optimized implementation as <indicator>=<module>:<function>.')
+    parser.add_argument('--max-reference-bars', type=int, default=100_000,
+                        help='Skip the reference implementation above this many bars.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--check-streaming', action='store_true',
+                        help='Also check that streaming indicators give the same values from batch() and update().')
+    args = parser.parse_args()
+
+    candidates = dict(args.candidate)
+    failures = []
+
+    print(f"{'indicator':<16}{'bars':>10}{'ref ms':>10}{'ref MiB':>10}{'cand ms':>10}{'cand MiB':>10}{'speedup':>9}  check")
+    for bars in args.bars:
+        rates = synthetic_rates(bars, args.seed)
+        for name in args.indicators:
+            reference_func, adapter = INDICATORS[name]
+            candidate_func = candidates.get(name)
+
+            ref = None
+            if bars <= args.max_reference_bars:
+                ref = measure(reference_func, adapter, rates)
+
+            cand = None
+            status = 'reference only'
+            if candidate_func is not None:
+                cand = measure(candidate_func, adapter, rates)
+                if ref is None:
+                    status = 'not checked'
+                else:
+                    try:
+                        assert_identical(ref[0], cand[0])
+                        status = 'identical'
+                    except AssertionError as e:
+                        status = 'MISMATCH'
+                        failures.append(f"{name}[{bars}]: {e}")
+            elif ref is None:
+                status = 'skipped'
+
+            print(format_row(name, bars, ref, cand, status), flush=True)
+
+        if args.check_streaming and bars <= args.max_reference_bars:
+            mismatches = check_streaming(rates)
+            failures.extend(f"streaming[{bars}] {mismatch}" for mismatch in mismatches)
+            print(f"{'streaming':<16}{bars:>10}  {'MISMATCH' if mismatches else 'batch == update'}", flush=True)
+
+    if failures:
+        print('\nCandidates that change signals:')
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
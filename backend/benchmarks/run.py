@@ -0,0 +1,335 @@
+"""
+End-to-end benchmarks for the MT5 API and the quant cycles.
+
+Runs the real Flask app in a background thread on top of the fake MetaTrader5
+module in fake_mt5/, points the Django API clients at it and times:
+
+    fetch_data_pos    GET  /fetch_data_pos through app.utils.api.data
+    get_positions     GET  /get_positions through app.utils.api.positions
+    order             POST /order through app.utils.api.order
+    fibonacci_cycle   one fibonacci entry_algorithm() over N symbols
+    trailing_cycle    one trailing_stop_algorithm() over N open positions
+
+Each benchmark runs once per size (symbols / open positions). A sample fails
+when the call raises, any HTTP response it got had an error status, or its
+result is not what the benchmark expects; failures are reported as an error
+rate. Results are compared against baseline.json and the run exits non-zero
+when any sample failed, or p50 latency or throughput regressed by more than the
+tolerance. --save-baseline refuses to record a run with failures.
+
+    python backend/benchmarks/run.py
+    python backend/benchmarks/run.py --sizes 10 100 --latency-ms 2
+    python backend/benchmarks/run.py --save-baseline
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import importlib.util
+from statistics import median
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+MT5_APP_DIR = os.path.join(BACKEND_DIR, 'mt5', 'app')
+DJANGO_DIR = os.path.join(BACKEND_DIR, 'django')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# The fake must shadow any installed MetaTrader5 package. The Django project goes
+# ahead of the MT5 app directory because both define a top-level "app".
+sys.path.insert(0, MT5_APP_DIR)
+sys.path.insert(0, DJANGO_DIR)
+sys.path.insert(0, os.path.join(BENCH_DIR, 'fake_mt5'))
+
+import MetaTrader5 as mt5  # noqa: E402
+
+DEFAULT_SIZES = [10, 100, 1000]
+# Fixed clock (a Wednesday, 12:00 UTC) so markets are open and bars are identical run to run.
+FROZEN_NOW = datetime(2024, 6, 12, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples, wall_time, errors=0):
+    return {
+        'count': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else None,
+        'throughput': round(len(samples) / wall_time, 3) if wall_time > 0 else None,
+        'p50_ms': round(median(samples) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def start_flask_app():
+    """Load backend/mt5/app/app.py under its own module name and serve it on a free port."""
+    from werkzeug.serving import make_server
+
+    spec = importlib.util.spec_from_file_location('mt5_api', os.path.join(MT5_APP_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    from connection import connection
+    connection.connect()
+
+    server = make_server('127.0.0.1', 0, module.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    os.makedirs(os.path.join(DJANGO_DIR, 'logs'), exist_ok=True)
+
+    from django.conf import settings
+    settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', run_syncdb=True, verbosity=0)
+
+
+_calls = threading.local()
+
+
+def record_responses():
+    """Keep the HTTP responses of the call being timed on each thread, for call_ok."""
+    import requests
+
+    send = requests.Session.send
+
+    def recording_send(self, request, **kwargs):
+        response = send(self, request, **kwargs)
+        responses = getattr(_calls, 'responses', None)
+        if responses is not None:
+            responses.append(response)
+        return response
+
+    requests.Session.send = recording_send
+
+
+def call_ok(func, args, check):
+    """Run func(*args) and tell whether it succeeded: no exception, no HTTP error status, check(result) holds."""
+    _calls.responses = []
+    try:
+        result = func(*args)
+    except Exception:
+        return False
+    finally:
+        responses, _calls.responses = _calls.responses, None
+    if any(response.status_code >= 400 for response in responses):
+        return False
+    return check is None or bool(check(result))
+
+
+def run_requests(func, args_list, concurrency, check=None):
+    samples = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(args):
+        nonlocal errors
+        start = time.perf_counter()
+        ok = call_ok(func, args, check)
+        elapsed = time.perf_counter() - start
+        with lock:
+            samples.append(elapsed)
+            errors += not ok
+
+    wall_start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed, args_list))
+    else:
+        for args in args_list:
+            timed(args)
+    return summarize(samples, time.perf_counter() - wall_start, errors)
+
+
+def run_cycles(func, cycles):
+    samples = []
+    errors = 0
+    wall_start = time.perf_counter()
+    for _ in range(cycles):
+        start = time.perf_counter()
+        errors += not call_ok(func, (), None)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - wall_start, errors)
+
+
+def seed_trades():
+    """Create a Trade row for every open fake position so the trailing cycle finds them."""
+    from app.nexus.models import Trade, TradeClosePricesMutation
+
+    TradeClosePricesMutation.objects.all().delete()
+    Trade.objects.all().delete()
+    trades = []
+    for position in mt5.positions_get():
+        is_buy = position.type == mt5.POSITION_TYPE_BUY
+        position_size_usd = position.volume * mt5.CONTRACT_SIZE * position.price_open
+        trades.append(Trade(
+            transaction_broker_id=str(position.ticket),
+            symbol=position.symbol[:10],
+            entry_time=datetime.fromtimestamp(position.time, tz=timezone.utc),
+            entry_price=position.price_open,
+            type='BUY' if is_buy else 'SELL',
+            position_size_usd=position_size_usd,
+            capital=position_size_usd / 500,
+            leverage=500,
+            order_volume=position.volume,
+            liquidity_price=0.0,
+            break_even_price=position.price_open,
+            order_commission=0.0,
+            strategy='benchmark',
+            broker='fake',
+            market_type='FOREX',
+            timeframe='1H',
+        ))
+    Trade.objects.bulk_create(trades)
+
+
+def benchmark(size, args):
+    from app.utils.constants import MT5Timeframe
+    from app.utils.api.data import fetch_data_pos
+    from app.utils.api.positions import get_positions
+    from app.utils.api.order import send_market_order
+    from app.quant.algorithms.fibonacci import entry as fibonacci_entry
+    from app.quant.algorithms.mean_reversion.trailing import trailing_stop_algorithm
+
+    results = {}
+    latency = args.latency_ms / 1000.0
+
+    mt5.configure(symbols=size, positions=0, latency=latency, now=FROZEN_NOW)
+    symbols = [info.name for info in mt5.symbols_get()]
+    requests_list = [(symbols[i % size], MT5Timeframe.M15, args.bars) for i in range(args.requests)]
+    results['fetch_data_pos'] = run_requests(fetch_data_pos, requests_list, args.concurrency,
+                                             check=lambda bars: bars is not None and not bars.empty)
+
+    mt5.configure(symbols=size, positions=size, latency=latency, now=FROZEN_NOW)
+    results['get_positions'] = run_requests(get_positions, [()] * args.requests, args.concurrency,
+                                            check=lambda positions: len(positions) == size)
+
+    mt5.configure(symbols=size, positions=0, latency=latency, now=FROZEN_NOW)
+    orders = [(symbols[i % size], 0.1, 'BUY' if i % 2 == 0 else 'SELL', 0.0) for i in range(args.requests)]
+    # send_market_order returns None whenever the order or its response is rejected
+    results['order'] = run_requests(send_market_order, orders, args.concurrency,
+                                    check=lambda order: order is not None)
+
+    mt5.configure(symbols=size, positions=0, latency=latency, now=FROZEN_NOW)
+    original_pairs = fibonacci_entry.PAIRS
+    fibonacci_entry.PAIRS = symbols
+    try:
+        results['fibonacci_cycle'] = run_cycles(fibonacci_entry.entry_algorithm, args.cycles)
+    finally:
+        fibonacci_entry.PAIRS = original_pairs
+
+    mt5.configure(symbols=size, positions=size, latency=latency, now=FROZEN_NOW)
+    seed_trades()
+    results['trailing_cycle'] = run_cycles(trailing_stop_algorithm, args.cycles)
+
+    return {f"{name}[{size}]": result for name, result in results.items()}
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, result in results.items():
+        if result['errors']:
+            regressions.append(f"{key}: {result['errors']} of {result['count']} samples failed")
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if result['p50_ms'] > reference['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{key}: p50 {reference['p50_ms']}ms -> {result['p50_ms']}ms")
+        if reference.get('throughput') and result['throughput'] < reference['throughput'] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {reference['throughput']}/s -> {result['throughput']}/s")
+    return regressions
+
+
+def print_table(results, baseline):
+    header = f"{'benchmark':<28}{'count':>7}{'err %':>8}{'ops/s':>12}{'p50 ms':>12}{'p99 ms':>12}{'base p50':>12}"
+    print(header)
+    print('-' * len(header))
+    for key, result in results.items():
+        reference = baseline.get(key, {})
+        print(
+            f"{key:<28}{result['count']:>7}{result['error_rate'] * 100:>8.1f}{result['throughput']:>12}{result['p50_ms']:>12}"
+            f"{result['p99_ms']:>12}{reference.get('p50_ms', '-'):>12}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end MT5 API and quant cycle benchmarks.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Symbol / open position counts to benchmark.')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint benchmark.')
+    parser.add_argument('--cycles', type=int, default=3, help='Cycles per strategy benchmark.')
+    parser.add_argument('--bars', type=int, default=100, help='Bars requested from /fetch_data_pos.')
+    parser.add_argument('--concurrency', type=int, default=1, help='Client threads for endpoint benchmarks.')
+    parser.add_argument('--latency-ms', type=float, default=1.0, help='Simulated terminal call latency.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression.')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline results file.')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline.')
+    parser.add_argument('--output', help='Also write the results as JSON to this file.')
+    parser.add_argument('--verbose', action='store_true', help='Keep application logging enabled.')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+
+    record_responses()
+    server = start_flask_app()
+    os.environ['MT5_API_URL'] = f"http://127.0.0.1:{server.server_port}"
+    setup_django()
+
+    results = {}
+    try:
+        for size in args.sizes:
+            results.update(benchmark(size, args))
+    finally:
+        server.shutdown()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        failed = [key for key, result in results.items() if result['errors']]
+        if failed:
+            print(f"\nNot saving the baseline, these benchmarks had failures: {', '.join(failed)}")
+            return 1
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print('\nRegressions:')
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
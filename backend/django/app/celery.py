@@ -3,6 +3,7 @@
 from __future__ import absolute_import, unicode_literals
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
@@ -16,5 +17,16 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
 
+@worker_init.connect
+def start_worker_metrics_server(**kwargs):
+    # Imported lazily because Django settings are not configured at module import time.
+    from app.utils.instrumentation import start_metrics_server
+    start_metrics_server()
+
+@worker_process_shutdown.connect
+def mark_worker_process_dead(pid=None, **kwargs):
+    from app.utils.instrumentation import mark_process_dead
+    mark_process_dead(pid)
+
 # Optional: Set a rate limit if necessary
 # app.conf.worker_prefetch_multiplier = 1
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Trade, TradeClosePricesMutation
+from .models import Trade, TradeClosePricesMutation, TradeMutationSummary, TradeDailySummary, AccountSnapshot
 
 @admin.register(Trade)
 class TradeAdmin(admin.ModelAdmin):
@@ -16,3 +16,24 @@ class TradeClosePricesMutationAdmin(admin.ModelAdmin):
     search_fields = [field.name for field in TradeClosePricesMutation._meta.fields]
     
     ordering = ('-mutation_time',)
+
+
+@admin.register(TradeMutationSummary)
+class TradeMutationSummaryAdmin(admin.ModelAdmin):
+    list_display = [field.name for field in TradeMutationSummary._meta.fields]
+
+    ordering = ('-last_mutation_time',)
+
+@admin.register(TradeDailySummary)
+class TradeDailySummaryAdmin(admin.ModelAdmin):
+    list_display = [field.name for field in TradeDailySummary._meta.fields]
+    list_filter = ['strategy', 'symbol', 'day']
+
+    ordering = ('-day',)
+
+@admin.register(AccountSnapshot)
+class AccountSnapshotAdmin(admin.ModelAdmin):
+    list_display = [field.name for field in AccountSnapshot._meta.fields]
+    list_filter = ['resolution']
+
+    ordering = ('-time',)
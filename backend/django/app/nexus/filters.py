@@ -14,12 +14,13 @@ class TradeFilter(filters.FilterSet):
     position_size_min = filters.NumberFilter(field_name='position_size_usd', lookup_expr='gte')
     position_size_max = filters.NumberFilter(field_name='position_size_usd', lookup_expr='lte')
     
-    # Symbol filters
-    symbol = filters.CharFilter(lookup_expr='iexact')
+    # Symbol filters. Exact matches, so the symbol indexes are used instead of
+    # an UPPER() scan; symbols are stored as MT5 names, mostly upper case.
+    symbol = filters.CharFilter(method='filter_symbol')
     symbols = filters.BaseInFilter(field_name='symbol', lookup_expr='in')
     
     # Trade type filter
-    type = filters.CharFilter(lookup_expr='iexact')
+    type = filters.CharFilter(method='filter_type')
     
     # Status filters
     is_open = filters.BooleanFilter(field_name='close_time', lookup_expr='isnull')
@@ -31,4 +32,10 @@ class TradeFilter(filters.FilterSet):
             'max_drawdown': ['gte', 'lte'],
             'max_profit': ['gte', 'lte'],
             'closing_reason': ['exact', 'icontains'],
-        }
\ No newline at end of file
+        }
+
+    def filter_symbol(self, queryset, name, value):
+        return queryset.filter(symbol__in={value, value.upper()})
+
+    def filter_type(self, queryset, name, value):
+        return queryset.filter(type=value.upper())
@@ -0,0 +1,16 @@
+# backend/django/app/nexus/management/commands/rebuild_trade_stats.py
+
+from django.core.management.base import BaseCommand
+from app.utils.db.stats import rebuild_trade_stats
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the trade daily summary table from every Trade row.'
+
+    def handle(self, *args, **options):
+        rows = rebuild_trade_stats()
+        logger.info(f"Rebuilt trade daily summary with {rows} rows.")
+        self.stdout.write(f"Rebuilt {rows} summary rows")
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nexus', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['symbol', 'entry_time'], name='trade_symbol_entry_time'),
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['strategy', 'close_time'], name='trade_strategy_close_time'),
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(condition=models.Q(('close_time__isnull', True)), fields=['symbol', 'entry_time'], name='trade_open'),
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['transaction_broker_id'], name='trade_transaction_broker_id'),
+        ),
+        migrations.AddIndex(
+            model_name='tradeclosepricesmutation',
+            index=models.Index(fields=['trade', 'mutation_time'], name='trade_mutation_time'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nexus', '0002_trade_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TradeDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('strategy', models.CharField(max_length=50)),
+                ('symbol', models.CharField(max_length=10)),
+                ('trades_opened', models.IntegerField(default=0)),
+                ('position_size_opened_usd', models.FloatField(default=0.0)),
+                ('trades_closed', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('pnl', models.FloatField(default=0.0)),
+                ('pnl_excluding_commission', models.FloatField(default=0.0)),
+                ('gross_profit', models.FloatField(default=0.0)),
+                ('gross_loss', models.FloatField(default=0.0)),
+                ('commission', models.FloatField(default=0.0)),
+                ('r_multiple_sum', models.FloatField(default=0.0)),
+                ('r_multiple_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Trade Daily Summary',
+                'verbose_name_plural': 'Trade Daily Summaries',
+                'indexes': [models.Index(fields=['strategy', 'day'], name='trade_daily_summary_strategy'), models.Index(fields=['symbol', 'day'], name='trade_daily_summary_symbol')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tradedailysummary',
+            constraint=models.UniqueConstraint(fields=('day', 'strategy', 'symbol'), name='trade_daily_summary_key'),
+        ),
+    ]
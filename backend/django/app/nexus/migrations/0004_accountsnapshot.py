@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nexus', '0003_tradedailysummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('1m', '1 Minute'), ('1h', '1 Hour'), ('1d', '1 Day')], max_length=2)),
+                ('time', models.DateTimeField()),
+                ('balance', models.FloatField()),
+                ('equity', models.FloatField()),
+                ('equity_low', models.FloatField()),
+                ('equity_high', models.FloatField()),
+                ('margin', models.FloatField()),
+                ('margin_free', models.FloatField()),
+                ('margin_level', models.FloatField(blank=True, null=True)),
+                ('floating_pnl', models.FloatField(default=0.0)),
+                ('open_positions', models.IntegerField(default=0)),
+                ('samples', models.IntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'Account Snapshot',
+                'verbose_name_plural': 'Account Snapshots',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='accountsnapshot',
+            constraint=models.UniqueConstraint(fields=('resolution', 'time'), name='account_snapshot_key'),
+        ),
+    ]
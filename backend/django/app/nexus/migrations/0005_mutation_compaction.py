@@ -0,0 +1,34 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nexus', '0004_accountsnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='tradeclosepricesmutation',
+            options={'verbose_name': 'Trade Close Prices Mutation', 'verbose_name_plural': 'Trade Close Prices Mutations'},
+        ),
+        migrations.CreateModel(
+            name='TradeMutationSummary',
+            fields=[
+                ('trade', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='mutation_summary', serialize=False, to='nexus.trade')),
+                ('mutation_count', models.IntegerField()),
+                ('first_mutation_time', models.DateTimeField()),
+                ('last_mutation_time', models.DateTimeField()),
+                ('min_sl_price', models.FloatField(blank=True, null=True)),
+                ('max_sl_price', models.FloatField(blank=True, null=True)),
+                ('min_tp_price', models.FloatField(blank=True, null=True)),
+                ('max_tp_price', models.FloatField(blank=True, null=True)),
+                ('compacted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Trade Mutation Summary',
+                'verbose_name_plural': 'Trade Mutation Summaries',
+            },
+        ),
+    ]
@@ -58,6 +58,19 @@ class Trade(models.Model):
     market_type = models.CharField(max_length=50, choices=MARKET_TYPE_CHOICES)
     timeframe = models.CharField(max_length=50, choices=TIMEFRAME_CHOICES)
 
+    class Meta:
+        indexes = [
+            # TradeFilter symbol and entry_time ranges, dashboards per symbol
+            models.Index(fields=['symbol', 'entry_time'], name='trade_symbol_entry_time'),
+            # Closed trades per strategy over close_time ranges
+            models.Index(fields=['strategy', 'close_time'], name='trade_strategy_close_time'),
+            # Open trades (is_open, close and trailing loops, exposure), a small slice of the table
+            models.Index(fields=['symbol', 'entry_time'], name='trade_open',
+                         condition=models.Q(close_time__isnull=True)),
+            # Lookups by MT5 position ticket
+            models.Index(fields=['transaction_broker_id'], name='trade_transaction_broker_id'),
+        ]
+
     def __str__(self):
         return f"{self.type} {self.symbol} at {self.entry_price}"
 
@@ -72,9 +85,115 @@ class TradeClosePricesMutation(models.Model):
     pnl_at_new_sl_price = models.FloatField(null=True, blank=True)
 
     class Meta:
-        ordering = ['mutation_time']
+        # No default ordering: queries that need the path order ask for it,
+        # and get it from the (trade, mutation_time) index
+        indexes = [
+            # A trade's mutations in order, e.g. its first stop loss
+            models.Index(fields=['trade', 'mutation_time'], name='trade_mutation_time'),
+        ]
         verbose_name = "Trade Close Prices Mutation"
         verbose_name_plural = "Trade Close Prices Mutations"
 
     def __str__(self):
-        return f"Mutation for {self.trade} at {self.mutation_time}"
\ No newline at end of file
+        return f"Mutation for {self.trade} at {self.mutation_time}"
+
+class TradeMutationSummary(models.Model):
+    """The SL/TP path of a closed trade whose intermediate mutations were compacted.
+
+    Compaction (see app.utils.db.compaction) keeps a trade's first and last
+    mutation rows and records the rest of the path here.
+    """
+    trade = models.OneToOneField(Trade, on_delete=models.CASCADE, primary_key=True, related_name='mutation_summary')
+    mutation_count = models.IntegerField()
+    first_mutation_time = models.DateTimeField()
+    last_mutation_time = models.DateTimeField()
+    min_sl_price = models.FloatField(null=True, blank=True)
+    max_sl_price = models.FloatField(null=True, blank=True)
+    min_tp_price = models.FloatField(null=True, blank=True)
+    max_tp_price = models.FloatField(null=True, blank=True)
+    compacted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Trade Mutation Summary"
+        verbose_name_plural = "Trade Mutation Summaries"
+
+    def __str__(self):
+        return f"{self.mutation_count} mutations for {self.trade}"
+
+class TradeDailySummary(models.Model):
+    """Per day, strategy and symbol aggregates of the Trade table.
+
+    Rows are updated in place as trades are opened and closed (see
+    app.utils.db.stats), so analytics read days instead of trades.
+    """
+    day = models.DateField()
+    strategy = models.CharField(max_length=50)
+    symbol = models.CharField(max_length=10)
+
+    # Opened on this day
+    trades_opened = models.IntegerField(default=0)
+    position_size_opened_usd = models.FloatField(default=0.0)
+
+    # Closed on this day
+    trades_closed = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    pnl = models.FloatField(default=0.0)
+    pnl_excluding_commission = models.FloatField(default=0.0)
+    gross_profit = models.FloatField(default=0.0)
+    gross_loss = models.FloatField(default=0.0)
+    commission = models.FloatField(default=0.0)
+    r_multiple_sum = models.FloatField(default=0.0)
+    r_multiple_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'strategy', 'symbol'], name='trade_daily_summary_key'),
+        ]
+        indexes = [
+            models.Index(fields=['strategy', 'day'], name='trade_daily_summary_strategy'),
+            models.Index(fields=['symbol', 'day'], name='trade_daily_summary_symbol'),
+        ]
+        verbose_name = "Trade Daily Summary"
+        verbose_name_plural = "Trade Daily Summaries"
+
+    def __str__(self):
+        return f"{self.day} {self.strategy} {self.symbol}"
+
+
+class AccountSnapshot(models.Model):
+    """Balance, equity and margin of the MT5 account over one time bucket.
+
+    1m rows are sampled from the terminal (see app.utils.db.equity); 1h and
+    1d rows are rolled up from the resolution below. Values are those at the
+    end of the bucket, with the equity range over it.
+    """
+    RESOLUTION_CHOICES = [
+        ('1m', '1 Minute'),
+        ('1h', '1 Hour'),
+        ('1d', '1 Day'),
+    ]
+
+    resolution = models.CharField(max_length=2, choices=RESOLUTION_CHOICES)
+    time = models.DateTimeField()  # Bucket start
+
+    balance = models.FloatField()
+    equity = models.FloatField()
+    equity_low = models.FloatField()
+    equity_high = models.FloatField()
+    margin = models.FloatField()
+    margin_free = models.FloatField()
+    margin_level = models.FloatField(null=True, blank=True)
+    floating_pnl = models.FloatField(default=0.0)
+    open_positions = models.IntegerField(default=0)
+    samples = models.IntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['resolution', 'time'], name='account_snapshot_key'),
+        ]
+        verbose_name = "Account Snapshot"
+        verbose_name_plural = "Account Snapshots"
+
+    def __str__(self):
+        return f"{self.resolution} {self.time} equity {self.equity}"
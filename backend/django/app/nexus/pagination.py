@@ -0,0 +1,23 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TradeCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (entry_time, id).
+
+    Each page is a range scan on the entry_time indexes seeded by the cursor,
+    so deep pages cost the same as the first one. id breaks ties between
+    trades opened in the same instant.
+    """
+    ordering = ('-entry_time', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    # Orderings that can seed a cursor: indexed and never null
+    KEYSET_FIELDS = ('entry_time',)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if not any(field.lstrip('-') == 'id' for field in ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return tuple(ordering)
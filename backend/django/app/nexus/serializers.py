@@ -1,14 +1,64 @@
 from rest_framework import serializers
 from .models import Trade, TradeClosePricesMutation
 
+INCLUDE_OPTIONS = ['mutations']
+
+
+def query_list(request, param):
+    """A comma-separated query parameter as a set, empty when absent."""
+    if request is None:
+        return set()
+    return {value.strip() for value in request.query_params.get(param, '').split(',') if value.strip()}
+
+
 class TradeClosePricesMutationSerializer(serializers.ModelSerializer):
     class Meta:
         model = TradeClosePricesMutation
         fields = '__all__'
 
 class TradeSerializer(serializers.ModelSerializer):
+    """
+    A trade with its close price mutations.
+
+    Given a request, the response is shaped by its query parameters:
+    fields=a,b,c keeps only those fields, and only include=mutations returns
+    every mutation; otherwise just latest_mutation is returned.
+    """
     close_prices_mutations = TradeClosePricesMutationSerializer(many=True, read_only=True)
+    latest_mutation = serializers.SerializerMethodField()
 
     class Meta:
         model = Trade
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            self.fields.pop('latest_mutation')
+            return
+
+        include = query_list(request, 'include')
+        invalid = include - set(INCLUDE_OPTIONS)
+        if invalid:
+            raise serializers.ValidationError(
+                {'include': f"Invalid include: {', '.join(sorted(invalid))}. Valid options are: {', '.join(INCLUDE_OPTIONS)}"})
+        self.fields.pop('latest_mutation' if 'mutations' in include else 'close_prices_mutations')
+
+        requested = query_list(request, 'fields')
+        if requested:
+            invalid = requested - set(self.fields)
+            if invalid:
+                raise serializers.ValidationError(
+                    {'fields': f"Invalid fields: {', '.join(sorted(invalid))}. Valid options are: {', '.join(self.fields)}"})
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+    def get_latest_mutation(self, obj):
+        # Prefetched by TradeViewSet as a one-element list
+        mutations = getattr(obj, 'latest_mutations', None)
+        if mutations is None:
+            mutation = obj.close_prices_mutations.order_by('-mutation_time', '-id').first()
+        else:
+            mutation = mutations[0] if mutations else None
+        return TradeClosePricesMutationSerializer(mutation).data if mutation else None
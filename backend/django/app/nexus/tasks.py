@@ -0,0 +1,41 @@
+# backend/django/app/nexus/tasks.py
+
+from celery import shared_task
+import logging
+
+from app.utils.db.equity import record_account_snapshot, rollup_account_snapshots
+from app.utils.db.compaction import compact_mutations
+from app.utils.db.outbox import trade_outbox
+
+logger = logging.getLogger(__name__)
+
+@shared_task(name='nexus.tasks.drain_trade_outbox', soft_time_limit=30)
+def drain_trade_outbox_task():
+    try:
+        created = trade_outbox.drain()
+        if created:
+            logger.info(f"Persisted {created} trades from the outbox")
+    except Exception as e:
+        logger.error(f"Error draining trade outbox: {e}")
+
+@shared_task(name='nexus.tasks.record_account_snapshot', soft_time_limit=30)
+def record_account_snapshot_task():
+    try:
+        record_account_snapshot()
+    except Exception as e:
+        logger.error(f"Error recording account snapshot: {e}")
+
+@shared_task(name='nexus.tasks.rollup_account_snapshots', soft_time_limit=120)
+def rollup_account_snapshots_task():
+    try:
+        written = rollup_account_snapshots()
+        logger.info(f"Account snapshot rollup: {written}")
+    except Exception as e:
+        logger.error(f"Error rolling up account snapshots: {e}")
+
+@shared_task(name='nexus.tasks.compact_trade_mutations', soft_time_limit=600)
+def compact_trade_mutations_task():
+    try:
+        compact_mutations()
+    except Exception as e:
+        logger.error(f"Error compacting trade mutations: {e}")
@@ -1,3 +1,68 @@
+import redis
+from django.conf import settings
 from django.test import TestCase
 
-# Create your tests here.
+from app.nexus.models import Trade
+from app.utils.constants import MT5Timeframe
+from app.utils.db.outbox import TradeOutbox
+
+ORDER = {'order': 123456, 'price': 1.1}
+
+
+def enqueue(outbox, order=ORDER):
+    # As the entry algorithms call it, with the timeframe as an MT5Timeframe
+    outbox.enqueue(order, 'EURUSD', 10.0, 5000.0, 500, 0.25, 'BUY', 'Alpari',
+                   'FOREX', 'FIBONACCI', MT5Timeframe.H1, 0.05, 1.09, 1.12)
+
+
+class TradeOutboxTests(TestCase):
+    def setUp(self):
+        self.outbox = TradeOutbox(getattr(settings, 'TRADE_OUTBOX_URL', None), key='outbox:trades:test')
+        if not self.outbox.enabled:
+            self.skipTest("TRADE_OUTBOX_URL is not set")
+        try:
+            self.outbox.client().ping()
+        except redis.RedisError:
+            self.skipTest("Redis is not reachable")
+        self.clear()
+        self.addCleanup(self.clear)
+
+    def clear(self):
+        self.outbox.client().delete(self.outbox.key, self.outbox.lock_key, self.outbox.dead_letter_key)
+
+    def test_enqueue_and_drain(self):
+        enqueue(self.outbox)
+        self.assertEqual(self.outbox.pending(), 1)
+        self.assertFalse(Trade.objects.exists())
+
+        self.assertEqual(self.outbox.drain(), 1)
+        self.assertEqual(self.outbox.pending(), 0)
+        self.assertEqual(self.outbox.dead_letters(), 0)
+
+        trade = Trade.objects.get(transaction_broker_id='123456')
+        self.assertEqual(trade.timeframe, str(MT5Timeframe.H1))
+        self.assertEqual(trade.close_prices_mutations.get().new_sl_price, 1.09)
+
+    def test_drain_stores_a_ticket_once(self):
+        enqueue(self.outbox)
+        enqueue(self.outbox)
+        self.assertEqual(self.outbox.drain(), 1)
+        self.assertEqual(Trade.objects.filter(transaction_broker_id='123456').count(), 1)
+
+    def test_bad_entry_moves_to_dead_letters(self):
+        self.outbox.client().rpush(self.outbox.key, b'not json')
+        enqueue(self.outbox)
+        self.assertEqual(self.outbox.drain(), 1)
+        self.assertEqual(self.outbox.pending(), 0)
+        self.assertEqual(self.outbox.dead_letters(), 1)
+
+
+class TradeOutboxFallbackTests(TestCase):
+    def test_enqueue_without_redis_creates_the_trade(self):
+        enqueue(TradeOutbox(None))
+        trade = Trade.objects.get(transaction_broker_id='123456')
+        self.assertEqual(trade.timeframe, str(MT5Timeframe.H1))
+
+    def test_enqueue_falls_back_when_redis_is_down(self):
+        enqueue(TradeOutbox('redis://127.0.0.1:1/0', key='outbox:trades:test'))
+        self.assertTrue(Trade.objects.filter(transaction_broker_id='123456').exists())
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TradeViewSet, SendMarketOrderView, ModifySLTPView
+from .views import TradeViewSet, SendMarketOrderView, ModifySLTPView, AccountEquityView
 
 router = DefaultRouter()
 router.register(r'trades', TradeViewSet)
@@ -9,4 +9,5 @@ urlpatterns = [
     path('', include(router.urls)),
     path('send_market_order/', SendMarketOrderView.as_view(), name='send_market_order'),
     path('modify_sl_tp/', ModifySLTPView.as_view(), name='modify_sl_tp'),
+    path('account/equity/', AccountEquityView.as_view(), name='account_equity'),
 ]
\ No newline at end of file
@@ -1,15 +1,26 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from .models import Trade
 from .serializers import TradeSerializer
 from .filters import TradeFilter
+from .pagination import TradeCursorPagination
 from rest_framework import status, views
 from .models import Trade, TradeClosePricesMutation
-from .serializers import TradeSerializer, TradeClosePricesMutationSerializer
+from .serializers import TradeSerializer, TradeClosePricesMutationSerializer, query_list
+
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from datetime import timedelta, timezone as dt_timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from app.utils.api.order import send_market_order, modify_sl_tp
+from app.utils.db.stats import GROUP_FIELDS, trade_stats, drawdown, exposure
+from app.utils.db.export import CONTENT_TYPES, export_stream
+from app.utils.db.equity import RESOLUTIONS, equity_curve, pick_resolution
 
 class TradeViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Trade.objects.all()
@@ -18,9 +29,113 @@ class TradeViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['entry_time', 'close_time', 'pnl', 'symbol']
     ordering = ['-entry_time']  # default ordering
 
+    @property
+    def paginator(self):
+        """
+        Cursor pagination for the default and entry_time orderings. ?page= and
+        the other orderings (nullable or full of ties) keep page numbers.
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            ordering = params.get('ordering', '').lstrip('-')
+            keyset = 'page' not in params and ordering in ('',) + TradeCursorPagination.KEYSET_FIELDS
+            self._paginator = TradeCursorPagination() if keyset else PageNumberPagination()
+        return self._paginator
+
     def get_queryset(self):
-        # Ensure we prefetch the related mutations to avoid N+1 queries
-        return Trade.objects.prefetch_related('close_prices_mutations').all()
+        queryset = Trade.objects.all()
+        fields = query_list(self.request, 'fields')
+        if 'mutations' in query_list(self.request, 'include'):
+            if not fields or 'close_prices_mutations' in fields:
+                # Ensure we prefetch the related mutations to avoid N+1 queries
+                queryset = queryset.prefetch_related(Prefetch(
+                    'close_prices_mutations',
+                    queryset=TradeClosePricesMutation.objects.order_by('trade_id', 'mutation_time', 'id'),
+                ))
+        elif not fields or 'latest_mutation' in fields:
+            latest = (TradeClosePricesMutation.objects
+                      .filter(trade=OuterRef('trade'))
+                      .order_by('-mutation_time', '-id')
+                      .values('id')[:1])
+            queryset = queryset.prefetch_related(Prefetch(
+                'close_prices_mutations',
+                queryset=TradeClosePricesMutation.objects.filter(id=Subquery(latest)),
+                to_attr='latest_mutations',
+            ))
+
+        if fields:
+            # Only load the requested columns, plus those the cursor is built from
+            columns = {field.name for field in Trade._meta.concrete_fields} & fields
+            ordering = self.request.query_params.get('ordering', '').lstrip('-')
+            if ordering in self.ordering_fields:
+                columns.add(ordering)
+            queryset = queryset.only('id', 'entry_time', *columns)
+        return queryset
+
+    def _stats_filters(self, request):
+        filters = {
+            'strategy': request.query_params.get('strategy'),
+            'symbol': request.query_params.get('symbol'),
+        }
+        for param in ('date_from', 'date_to'):
+            value = request.query_params.get(param)
+            if value:
+                parsed = parse_date(value)
+                if parsed is None:
+                    raise ValueError(f'Invalid {param}: {value}, expected YYYY-MM-DD')
+                filters[param] = parsed
+        return filters
+
+    @action(detail=False, methods=['get'], url_path='stats')
+    def stats(self, request):
+        """PnL, win rate, profit factor and average R from the daily summary table.
+
+        group_by is a comma-separated subset of strategy, symbol and day.
+        """
+        try:
+            filters = self._stats_filters(request)
+            group_by = [field for field in request.query_params.get('group_by', '').split(',') if field]
+            invalid = [field for field in group_by if field not in GROUP_FIELDS]
+            if invalid:
+                raise ValueError(f"Invalid group_by: {', '.join(invalid)}. Valid options are: {', '.join(GROUP_FIELDS)}")
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(trade_stats(group_by, **filters))
+
+    @action(detail=False, methods=['get'], url_path='stats/drawdown')
+    def stats_drawdown(self, request):
+        """Maximum and current drawdown of cumulative realized PnL."""
+        try:
+            filters = self._stats_filters(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(drawdown(**filters))
+
+    @action(detail=False, methods=['get'], url_path='stats/exposure')
+    def stats_exposure(self, request):
+        """Open position size per strategy and symbol."""
+        return Response(exposure(request.query_params.get('strategy'), request.query_params.get('symbol')))
+
+    @action(detail=False, methods=['get'], url_path=r'export/(?P<file_format>csv|parquet|arrow)')
+    def export(self, request, file_format=None):
+        """Stream every matching trade (table=trades) or their mutations (table=mutations).
+
+        Accepts the TradeFilter parameters and is not paginated. Rows go
+        straight from a database cursor to the response in chunks.
+        """
+        trade_filter = TradeFilter(request.query_params, queryset=Trade.objects.all())
+        if not trade_filter.is_valid():
+            return Response(trade_filter.errors, status=status.HTTP_400_BAD_REQUEST)
+        table = request.query_params.get('table', 'trades')
+        try:
+            stream = export_stream(file_format, table, trade_filter.qs)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[file_format])
+        filename = f"{table}-{timezone.now():%Y%m%d-%H%M%S}.{file_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
 class SendMarketOrderView(views.APIView):
     permission_classes = [IsAuthenticated]
@@ -61,7 +176,7 @@ class SendMarketOrderView(views.APIView):
             trade = Trade.objects.get(symbol=symbol, entry_price=order_response['price'])
             trade_serializer = TradeSerializer(trade)
             
-            mutations = trade.close_prices_mutations.all()
+            mutations = trade.close_prices_mutations.order_by('mutation_time', 'id')
             mutations_serializer = TradeClosePricesMutationSerializer(mutations, many=True)
 
             return Response({
@@ -103,4 +218,41 @@ class ModifySLTPView(views.APIView):
 
             return Response({'mutation': mutation_serializer.data}, status=status.HTTP_201_CREATED)
         except TradeClosePricesMutation.DoesNotExist:
-            return Response({'error': 'Mutation created but not found in database.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({'error': 'Mutation created but not found in database.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AccountEquityView(views.APIView):
+
+    def get(self, request):
+        """Recorded balance, equity and margin between start and end (ISO datetimes).
+
+        end defaults to now and start to a day before it. resolution is 1m, 1h
+        or 1d; by default the finest one that keeps the response under 2000
+        points.
+        """
+        params = request.query_params
+        try:
+            end = self._datetime(params, 'end', timezone.now())
+            start = self._datetime(params, 'start', end - timedelta(days=1))
+            resolution = params.get('resolution') or pick_resolution(start, end)
+            if resolution not in RESOLUTIONS:
+                raise ValueError(f"Invalid resolution: {resolution}. Valid options are: {', '.join(RESOLUTIONS)}")
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'resolution': resolution,
+            'start': start,
+            'end': end,
+            'points': equity_curve(start, end, resolution),
+        })
+
+    @staticmethod
+    def _datetime(params, name, default):
+        value = params.get(name)
+        if not value:
+            return default
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f'Invalid {name}: {value}, expected an ISO 8601 datetime')
+        return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed, dt_timezone.utc)
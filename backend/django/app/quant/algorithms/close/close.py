@@ -9,12 +9,16 @@ from app.utils.api.positions import get_positions
 from app.utils.api.ticket import get_order_from_ticket, get_deal_from_ticket
 from app.utils.constants import TIMEZONE
 from app.utils.db.close import close_trade
+from app.utils.db.excursion import excursions
+from app.utils.db.outbox import trade_outbox
+from app.utils.instrumentation import cycle, phase, PHASE_FETCH, PHASE_DB_WRITE, record_failure
 
 logger = logging.getLogger(__name__)
 
 # Dictionary to cache open positions between runs
 cached_positions = {}
 
+@cycle('close')
 def close_algorithm():
     """
     Continuously monitors open trades, detects closed trades, and updates their
@@ -26,7 +30,8 @@ def close_algorithm():
         current_time = datetime.now(TIMEZONE).replace(microsecond=0)
 
         # Fetch current open positions
-        positions = get_positions()
+        with phase(PHASE_FETCH):
+            positions = get_positions()
         if positions.empty:
             positions = pd.DataFrame(columns=[
                 'ticket', 'time', 'time_msc', 'time_update', 'time_update_msc', 'type',
@@ -45,14 +50,20 @@ def close_algorithm():
         # Identify closed tickets
         closed_tickets = cached_tickets - current_tickets
 
+        # A position may close before the beat task stored its trade
+        if closed_tickets:
+            with phase(PHASE_DB_WRITE):
+                trade_outbox.drain()
+
         for ticket in closed_tickets:
             position = cached_positions.pop(ticket)
             sleep(2)  # Optional: delay to ensure the trade is fully processed
 
             try:
                 # Retrieve the closed order and deal details
-                closed_order = get_order_from_ticket(ticket)
-                closed_deal = get_deal_from_ticket(ticket)
+                with phase(PHASE_FETCH, symbol=position.symbol):
+                    closed_order = get_order_from_ticket(ticket)
+                    closed_deal = get_deal_from_ticket(ticket)
 
                 if closed_deal is None:
                     error_msg = f"Failed to retrieve deal for closed ticket {ticket}."
@@ -70,8 +81,14 @@ def close_algorithm():
                 pnl_excluding_commission = pnl - closed_deal.get('commission', 0)
                 closing_reason = closed_deal.get('reason', 'CLOSED')
 
+                # Final max drawdown and max profit, including the realized PnL
+                extremes = excursions.finalize(ticket, pnl)
+                if extremes is not None:
+                    closed_deal = dict(closed_deal, max_drawdown=extremes[0], max_profit=extremes[1])
+
                 # Update the Trade record in the database
-                closed_trade = close_trade(position.ticket, close_time, close_price, pnl, pnl_excluding_commission, closing_reason, closed_deal)
+                with phase(PHASE_DB_WRITE, symbol=position.symbol):
+                    closed_trade = close_trade(position.ticket, close_time, close_price, pnl, pnl_excluding_commission, closing_reason, closed_deal)
 
                 if closed_trade is not None:
                     logger.info({
@@ -82,15 +99,24 @@ def close_algorithm():
                 else:
                     error_msg = f"Failed to close trade {ticket}."
                     logger.error({"error": error_msg, "ticket": ticket})
+                    record_failure()
 
             except Exception as e:
                 error_msg = f"Error processing closed ticket {ticket}: {e}\n{traceback.format_exc()}"
                 logger.error({"error": error_msg, "ticket": ticket})
+                record_failure()
 
         # Update cached_positions with current open positions
         for index, position in positions.iterrows():
             cached_positions[position.ticket] = position
 
+        # Track floating PnL extremes of the open positions
+        excursions.observe(positions)
+        excursions.forget(current_tickets)
+        with phase(PHASE_DB_WRITE):
+            excursions.flush()
+
     except Exception as e:
         error_msg = f"Exception in close_algorithm: {e}\n{traceback.format_exc()}"
-        logger.error({"error": error_msg})
\ No newline at end of file
+        logger.error({"error": error_msg})
+        record_failure()
\ No newline at end of file
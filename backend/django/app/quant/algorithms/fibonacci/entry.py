@@ -7,35 +7,48 @@ from dotenv import load_dotenv
 import traceback
 
 from app.utils.arithmetics import calculate_order_capital, calculate_order_size_usd, calculate_commission, get_price_at_pnl, get_pnl_at_price, convert_usd_to_lots
-from app.utils.api.data import fetch_data_pos, symbol_info_tick, account_info
+from app.utils.api.data import symbol_info_tick, account_info
+from app.utils.resample import ResampledBarFeed
+from app.utils.indicator_cache import swing_points
 from app.utils.api.order import send_market_order
 from app.utils.account import have_open_positions_in_symbol
 from app.utils.market import is_market_open
-from app.quant.indicators.trend import detect_trend, get_enhanced_swing_points
+from app.quant.indicators.trend import detect_trend
 from app.quant.indicators.candlestick import detect_candlestick_pattern
 from app.quant.indicators.fibonacci import calculate_fib_levels
 from app.quant.algorithms.fibonacci.config import PAIRS, PRIMARY_TIMEFRAME, ENTRY_TIMEFRAME, LOOKBACK_PERIOD, FIB_LEVELS, RISK_PER_TRADE, LEVERAGE, DEVIATION, MAGIC_NUMBER, CANDLESTICK_PATTERNS_BULLISH, CANDLESTICK_PATTERNS_BEARISH, TP_LEVEL_MULTIPLIER, SL_LEVEL_MULTIPLIER
 from app.utils.risk_management.position_sizing import calculate_position_size
-from app.utils.db.create import create_trade
+from app.utils.db.outbox import trade_outbox
+from app.utils.instrumentation import cycle, phase, PHASE_FETCH, PHASE_INDICATORS, PHASE_SIZING, PHASE_ORDER_SEND, PHASE_DB_WRITE, record_failure
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Both timeframes are derived from one M1 stream per pair once seeded
+bar_feed = ResampledBarFeed([PRIMARY_TIMEFRAME, ENTRY_TIMEFRAME], max_bars=LOOKBACK_PERIOD + 2)
+
+@cycle('fibonacci')
 def entry_algorithm():
     try:
         for pair in PAIRS:
             logger.info(f"Checking {pair} for Fibonacci strategy entry.")
-            if have_open_positions_in_symbol(pair):
+            with phase(PHASE_FETCH, symbol=pair):
+                has_open_positions = have_open_positions_in_symbol(pair)
+            if has_open_positions:
                 logger.info(f"Skipping {pair} due to existing open positions.")
                 continue
 
-            if not is_market_open(pair):
+            with phase(PHASE_FETCH, symbol=pair):
+                market_open = is_market_open(pair)
+            if not market_open:
                 logger.info(f"Skipping {pair} market is closed.")
                 continue
 
             # Fetch data for primary and entry timeframes
-            primary_rates = fetch_data_pos(pair, PRIMARY_TIMEFRAME, LOOKBACK_PERIOD + 2) # +2 for swing point detection
-            entry_rates = fetch_data_pos(pair, ENTRY_TIMEFRAME, LOOKBACK_PERIOD)
+            with phase(PHASE_FETCH, symbol=pair):
+                bar_feed.refresh(pair)
+                primary_rates = bar_feed.bars(pair, PRIMARY_TIMEFRAME, LOOKBACK_PERIOD + 2) # +2 for swing point detection
+                entry_rates = bar_feed.bars(pair, ENTRY_TIMEFRAME, LOOKBACK_PERIOD)
 
             if primary_rates is None or primary_rates.empty:
                 logger.info(f"Skipping {pair} due to insufficient primary timeframe data.")
@@ -46,8 +59,9 @@ def entry_algorithm():
                 continue
 
             # Trend analysis on primary timeframe
-            p_highs, p_lows = get_enhanced_swing_points(primary_rates)
-            trend = detect_trend(p_highs, p_lows)
+            with phase(PHASE_INDICATORS, symbol=pair):
+                p_highs, p_lows = swing_points(pair, PRIMARY_TIMEFRAME, primary_rates)
+                trend = detect_trend(p_highs, p_lows)
 
             # Fibonacci levels calculation
             fib_levels_prices = []
@@ -62,8 +76,10 @@ def entry_algorithm():
                 continue
 
             # Candlestick pattern detection on entry timeframe
-            pattern = detect_candlestick_pattern(entry_rates)
-            tick_info = symbol_info_tick(pair)
+            with phase(PHASE_INDICATORS, symbol=pair):
+                pattern = detect_candlestick_pattern(entry_rates)
+            with phase(PHASE_FETCH, symbol=pair):
+                tick_info = symbol_info_tick(pair)
             if tick_info is None or tick_info.empty:
                 logger.info(f"Skipping {pair} - no tick info available.")
                 continue
@@ -96,7 +112,8 @@ def entry_algorithm():
                 last_tick_price = tick_info['ask'].iloc[0] if order_type == 'BUY' else tick_info['bid'].iloc[0]
                 price_decimals = len(str(last_tick_price).split('.')[-1])
 
-                account_balance_data = account_info()  # Fetch account balance
+                with phase(PHASE_FETCH, symbol=pair):
+                    account_balance_data = account_info()  # Fetch account balance
                 if account_balance_data is None or account_balance_data.empty:
                     logger.error(f"Could not fetch account balance for position sizing. Skipping {pair}")
                     continue
@@ -110,7 +127,8 @@ def entry_algorithm():
                     continue
 
                 tick_value = tick_info['tick_value'].iloc[0]
-                order_volume_lots = calculate_position_size(RISK_PER_TRADE, account_balance_usd, stop_loss_pips, tick_value)
+                with phase(PHASE_SIZING, symbol=pair):
+                    order_volume_lots = calculate_position_size(RISK_PER_TRADE, account_balance_usd, stop_loss_pips, tick_value)
 
 
                 if isinstance(order_volume_lots, (pd.Series, pd.DataFrame)):
@@ -121,44 +139,46 @@ def entry_algorithm():
                     logger.error({'error_msg': error_msg, 'order_volume_lots': order_volume_lots})
                     continue
 
-                order_size_usd = calculate_order_size_usd(order_capital, LEVERAGE) # Recalculate order_size_usd based on order_capital - might need review if position sizing logic changes drastically.
-
-                desired_sl_pnl = order_capital * RISK_PER_TRADE * SL_LEVEL_MULTIPLIER * -1
-                commission = calculate_commission(order_size_usd, pair)
-
-                sl_including_commission, sl_excluding_commission = get_price_at_pnl(
-                    desired_pnl=desired_sl_pnl,
-                    commission=commission,
-                    order_size_usd=order_size_usd,
-                    leverage=LEVERAGE,
-                    entry_price=last_tick_price,
-                    type=order_type
-                )
-
-                tp_including_commission, tp_excluding_commission = get_price_at_pnl(
-                    desired_pnl=order_capital * RISK_PER_TRADE * TP_LEVEL_MULTIPLIER,
-                    commission=commission,
-                    order_size_usd=order_size_usd,
-                    leverage=LEVERAGE,
-                    entry_price=last_tick_price,
-                    type=order_type
-                )
-
-
-                order = send_market_order(
-                    symbol=pair,
-                    volume=order_volume_lots,
-                    order_type=order_type,
-                    sl=round(stop_loss_price, price_decimals),
-                    tp=round(take_profit_price, price_decimals),
-                    deviation=DEVIATION,
-                    type_filling="ORDER_FILLING_FOK",
-                    magic=MAGIC_NUMBER,
-                    position_size_usd=order_size_usd,
-                    commission=commission,
-                    capital=order_capital,
-                    leverage=LEVERAGE
-                )
+                with phase(PHASE_SIZING, symbol=pair):
+                    order_size_usd = calculate_order_size_usd(order_capital, LEVERAGE) # Recalculate order_size_usd based on order_capital - might need review if position sizing logic changes drastically.
+
+                    desired_sl_pnl = order_capital * RISK_PER_TRADE * SL_LEVEL_MULTIPLIER * -1
+                    commission = calculate_commission(order_size_usd, pair)
+
+                    sl_including_commission, sl_excluding_commission = get_price_at_pnl(
+                        desired_pnl=desired_sl_pnl,
+                        commission=commission,
+                        order_size_usd=order_size_usd,
+                        leverage=LEVERAGE,
+                        entry_price=last_tick_price,
+                        type=order_type
+                    )
+
+                    tp_including_commission, tp_excluding_commission = get_price_at_pnl(
+                        desired_pnl=order_capital * RISK_PER_TRADE * TP_LEVEL_MULTIPLIER,
+                        commission=commission,
+                        order_size_usd=order_size_usd,
+                        leverage=LEVERAGE,
+                        entry_price=last_tick_price,
+                        type=order_type
+                    )
+
+
+                with phase(PHASE_ORDER_SEND, symbol=pair):
+                    order = send_market_order(
+                        symbol=pair,
+                        volume=order_volume_lots,
+                        order_type=order_type,
+                        sl=round(stop_loss_price, price_decimals),
+                        tp=round(take_profit_price, price_decimals),
+                        deviation=DEVIATION,
+                        type_filling="ORDER_FILLING_FOK",
+                        magic=MAGIC_NUMBER,
+                        position_size_usd=order_size_usd,
+                        commission=commission,
+                        capital=order_capital,
+                        leverage=LEVERAGE
+                    )
 
                 if order is not None:
                     trade_info = {
@@ -209,13 +229,15 @@ def entry_algorithm():
                     }
 
                     try:
-                        create_trade(order, pair, order_capital, order_size_usd,
-                                     LEVERAGE, commission, order_type, 'Alpari',
-                                     'FOREX', 'FIBONACCI', PRIMARY_TIMEFRAME, order_volume_lots,
-                                     stop_loss_price, take_profit_price) # Using calculated SL/TP prices
+                        with phase(PHASE_DB_WRITE, symbol=pair):
+                            trade_outbox.enqueue(order, pair, order_capital, order_size_usd,
+                                                 LEVERAGE, commission, order_type, 'Alpari',
+                                                 'FOREX', 'FIBONACCI', PRIMARY_TIMEFRAME, order_volume_lots,
+                                                 stop_loss_price, take_profit_price) # Using calculated SL/TP prices
                     except Exception as e:
                         error_msg = f"DB Error creating trade record: {e}\n{traceback.format_exc()}"
                         logger.error(error_msg)
+                        record_failure()
 
                     info_msg = f"FIBONACCI: Order placed for {pair}, signal: {signal}, pattern: {pattern}, Fib level near price: {current_price:.5f}"
                     logger.info(info_msg, trade_info, order)
@@ -265,6 +287,7 @@ def entry_algorithm():
                     }
                     error_msg = f"FIBONACCI: Order failed to open for {pair}, signal: {signal}, pattern: {pattern}, Fib level near price: {current_price:.5f}"
                     logger.error(error_msg, trade_info, order)
+                    record_failure()
             else:
                 message = f"FIBONACCI: No signal detected for {pair}. Trend: {trend}, Current price: {current_price:.5f}, Swing High: {swing_high}, Swing Low: {swing_low}"
                 logger.info(message)
@@ -273,6 +296,8 @@ def entry_algorithm():
     except requests.RequestException as e:
         error_msg = f"Error fetching MT5 data: {str(e)}"
         logger.error(error_msg)
+        record_failure()
     except Exception as e:
         error_msg = f"Exception in fibonacci entry_algorithm: {e}\n{traceback.format_exc()}"
-        logger.error(error_msg)
\ No newline at end of file
+        logger.error(error_msg)
+        record_failure()
\ No newline at end of file
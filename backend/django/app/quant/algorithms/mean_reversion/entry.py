@@ -16,34 +16,43 @@ from app.utils.api.order import send_market_order
 from app.utils.constants import TIMEZONE
 from app.utils.account import have_open_positions_in_symbol
 from app.utils.market import is_market_open
-from app.quant.indicators.mean_reversion import mean_reversion
+from app.utils.indicator_cache import mean_reversion_signals
 from app.quant.algorithms.mean_reversion.config import PAIRS, MAIN_TIMEFRAME, TP_PNL_MULTIPLIER, SL_PNL_MULTIPLIER, LEVERAGE, DEVIATION, CAPITAL_PER_TRADE, TRAILING_STOP_STEPS
-from app.utils.db.create import create_trade
+from app.utils.db.outbox import trade_outbox
+from app.utils.instrumentation import cycle, phase, PHASE_FETCH, PHASE_INDICATORS, PHASE_SIZING, PHASE_ORDER_SEND, PHASE_DB_WRITE, record_failure
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+@cycle('mean_reversion')
 def entry_algorithm():
     try:
         for pair in PAIRS:            
             logger.info(f"Checking {pair} for open positions.")
-            if have_open_positions_in_symbol(pair):
+            with phase(PHASE_FETCH, symbol=pair):
+                has_open_positions = have_open_positions_in_symbol(pair)
+            if has_open_positions:
                 logger.info(f"Skipping {pair} because it has open positions.")
                 continue
 
-            if not is_market_open(pair):
+            with phase(PHASE_FETCH, symbol=pair):
+                market_open = is_market_open(pair)
+            if not market_open:
                 logger.info(f"Skipping {pair} because the market is not open.")
                 continue
-                
-            df = fetch_data_pos(pair, MAIN_TIMEFRAME, 10)
+
+            with phase(PHASE_FETCH, symbol=pair):
+                df = fetch_data_pos(pair, MAIN_TIMEFRAME, 10)
             if df is None or df.empty:
                 logger.info(f"Skipping {pair} because there is no data.")
                 continue
             
-            df['mean_reversion'] = mean_reversion(df)
+            with phase(PHASE_INDICATORS, symbol=pair):
+                df['mean_reversion'] = mean_reversion_signals(pair, MAIN_TIMEFRAME, df)
             last_row = df.iloc[-2]
 
-            tick_info = symbol_info_tick(pair)
+            with phase(PHASE_FETCH, symbol=pair):
+                tick_info = symbol_info_tick(pair)
             if tick_info is None or tick_info.empty:
                 logger.info(f"Skipping {pair} because there is no tick info.")
                 continue
@@ -52,8 +61,9 @@ def entry_algorithm():
             order_type = 'BUY' if last_row['mean_reversion'] == 'bottom' else 'SELL'
             last_tick_price = tick_info['ask'].iloc[0] if order_type == 'BUY' else tick_info['bid'].iloc[0]
             price_decimals = len(str(last_tick_price).split('.')[-1])
-            order_size_usd = calculate_order_size_usd(order_capital, LEVERAGE)
-            order_volume_lots = convert_usd_to_lots(pair, order_size_usd, order_type)
+            with phase(PHASE_SIZING, symbol=pair):
+                order_size_usd = calculate_order_size_usd(order_capital, LEVERAGE)
+                order_volume_lots = convert_usd_to_lots(pair, order_size_usd, order_type)
 
             # Validate that 'order_volume_lots' is a float
             if isinstance(order_volume_lots, (pd.Series, pd.DataFrame)):
@@ -65,17 +75,19 @@ def entry_algorithm():
                 continue
 
             desired_sl_pnl = order_capital * SL_PNL_MULTIPLIER
-            commission = calculate_commission(order_size_usd, pair)
+            with phase(PHASE_SIZING, symbol=pair):
+                commission = calculate_commission(order_size_usd, pair)
 
             if last_row['mean_reversion'] in ['top', 'bottom']:
-                sl_including_commission, sl_excluding_commission = get_price_at_pnl(
-                    desired_pnl=desired_sl_pnl,
-                    commission=commission,
-                    order_size_usd=order_size_usd,
-                    leverage=LEVERAGE,
-                    entry_price=last_tick_price,
-                    type=order_type
-                )
+                with phase(PHASE_SIZING, symbol=pair):
+                    sl_including_commission, sl_excluding_commission = get_price_at_pnl(
+                        desired_pnl=desired_sl_pnl,
+                        commission=commission,
+                        order_size_usd=order_size_usd,
+                        leverage=LEVERAGE,
+                        entry_price=last_tick_price,
+                        type=order_type
+                    )
 
                 if order_type == 'BUY':
                     if sl_including_commission > tick_info['bid'].iloc[0]:
@@ -88,18 +100,19 @@ def entry_algorithm():
                         logger.error({'error_msg': error_msg, 'sl_including_commission': sl_including_commission, 'tick_info': tick_info})
                         continue
                 
-                order = send_market_order(
-                    symbol=pair,
-                    volume=order_volume_lots,
-                    order_type=order_type,
-                    sl=round(sl_including_commission, price_decimals),
-                    deviation=DEVIATION,
-                    type_filling="ORDER_FILLING_FOK",
-                    position_size_usd=order_size_usd,
-                    commission=commission,
-                    capital=order_capital,
-                    leverage=LEVERAGE
-                )
+                with phase(PHASE_ORDER_SEND, symbol=pair):
+                    order = send_market_order(
+                        symbol=pair,
+                        volume=order_volume_lots,
+                        order_type=order_type,
+                        sl=round(sl_including_commission, price_decimals),
+                        deviation=DEVIATION,
+                        type_filling="ORDER_FILLING_FOK",
+                        position_size_usd=order_size_usd,
+                        commission=commission,
+                        capital=order_capital,
+                        leverage=LEVERAGE
+                    )
 
                 if order is not None:
                     trade_info = {
@@ -132,13 +145,15 @@ def entry_algorithm():
                     }
 
                     try:
-                        create_trade(order, pair, order_capital, order_size_usd, 
-                                     LEVERAGE, commission, order_type, 'Alpari',
-                                     'FOREX', 'MEAN REVERSION', MAIN_TIMEFRAME, order_volume_lots,
-                                     sl_including_commission, None)
+                        with phase(PHASE_DB_WRITE, symbol=pair):
+                            trade_outbox.enqueue(order, pair, order_capital, order_size_usd,
+                                                 LEVERAGE, commission, order_type, 'Alpari',
+                                                 'FOREX', 'MEAN REVERSION', MAIN_TIMEFRAME, order_volume_lots,
+                                                 sl_including_commission, None)
                     except Exception as e:
                         error_msg = f"Error creating trade record in DB: {e}\n{traceback.format_exc()}"
                         logger.error(error_msg)
+                        record_failure()
 
                     info_msg = f"Order placed successfully for {pair}"
                     logger.info(info_msg, order, trade_info)
@@ -170,6 +185,7 @@ def entry_algorithm():
                     }
                     error_msg = f"Order failed to open for {pair}"
                     logger.error(error_msg, order, trade_info)
+                    record_failure()
             else:
                 message = f"No mean reversion detected for {pair}."
                 logger.info(message)
@@ -177,7 +193,9 @@ def entry_algorithm():
     except requests.RequestException as e:
         error_msg = f"Error fetching MT5 data: {str(e)}"
         logger.error(error_msg)
+        record_failure()
     except Exception as e:
         error_msg = f"Exception in entry_algorithm: {e}\n{traceback.format_exc()}"
         logger.error(error_msg)
+        record_failure()
 
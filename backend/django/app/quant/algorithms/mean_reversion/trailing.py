@@ -5,9 +5,10 @@ import logging
 from dotenv import load_dotenv
 import os
 from datetime import datetime, timedelta
-from time import sleep, perf_counter
+from time import sleep
 
 import requests
+import numpy as np
 import pandas as pd
 
 from app.utils.arithmetics import (
@@ -17,8 +18,10 @@ from app.utils.arithmetics import (
     convert_lots_to_usd,
     convert_usd_to_lots,
     calculate_trade_volume,
-    get_price_at_pnl,
-    get_pnl_at_price
+    get_pnl_at_price,
+    direction,
+    prices_at_pnl,
+    pnls_at_price
 )
 from app.utils.constants import MT5Timeframe, TIMEZONE
 from app.utils.api.data import fetch_data_pos, symbol_info_tick
@@ -27,6 +30,8 @@ from app.utils.api.order import modify_sl_tp
 from app.utils.api.ticket import get_order_from_ticket, get_deal_from_ticket
 from app.utils.db.mutation import mutate_trade
 from app.utils.db.get import get_trade_with_mutations
+from app.utils.db.excursion import excursions
+from app.utils.instrumentation import cycle, phase, PHASE_FETCH, PHASE_DB_READ, PHASE_SIZING, PHASE_ORDER_SEND, PHASE_DB_WRITE, record_failure
 from app.quant.algorithms.mean_reversion.config import (
     PAIRS,
     MAIN_TIMEFRAME,
@@ -43,7 +48,11 @@ logger = logging.getLogger(__name__)
 
 EPSILON = 1e-4  # Define an appropriate epsilon value
 
+TRIGGER_PNL_MULTIPLIERS = np.array([step['trigger_pnl_multiplier'] for step in TRAILING_STOP_STEPS], dtype=np.float64)
+NEW_SL_PNL_MULTIPLIERS = np.array([step['new_sl_pnl_multiplier'] for step in TRAILING_STOP_STEPS], dtype=np.float64)
 
+
+@cycle('trailing_stop')
 def trailing_stop_algorithm():
     """
     Continuously monitors open trades, detects closed trades, manages trailing stops,
@@ -53,19 +62,23 @@ def trailing_stop_algorithm():
 
     try:
         current_time = datetime.now(TIMEZONE).replace(microsecond=0)
-        positions = get_positions()
+        with phase(PHASE_FETCH):
+            positions = get_positions()
 
         if positions.empty:
             logger.info('No positions found')
             return
 
-        for index, position in positions.iterrows():
-            logger.info('Starting position timer')
-            position_start_time = perf_counter()  # Start timing for the position
+        # Track floating PnL extremes of the open positions
+        excursions.observe(positions)
+        excursions.forget(positions['ticket'])
+        with phase(PHASE_DB_WRITE):
+            excursions.flush()
 
-            # Time calculation of each position
+        for index, position in positions.iterrows():
             # Check if the position ticket exists in trades dict
-            trade_with_mutations = get_trade_with_mutations(position.ticket)
+            with phase(PHASE_DB_READ, symbol=position.symbol):
+                trade_with_mutations = get_trade_with_mutations(position.ticket)
 
             if trade_with_mutations is None:
                 error_msg = f"No trade found with ticket {position.ticket}"
@@ -80,49 +93,26 @@ def trailing_stop_algorithm():
                 trade.type, trade.order_commission
             )
 
-            for trailing_step in TRAILING_STOP_STEPS:
-                logger.info('Starting trailing step timer')
-                trailing_start_time = perf_counter()  # Start timing for the trailing step
-
-                # Time calculation of each trailing stop
-                trigger_pnl = trade.capital * trailing_step['trigger_pnl_multiplier']
-                new_sl_pnl = trade.capital * trailing_step['new_sl_pnl_multiplier']
-
-                trigger_price, trigger_price_excluding_commission = get_price_at_pnl(
-                    desired_pnl=trigger_pnl,
-                    entry_price=position.price_open,
-                    commission=trade.order_commission,
-                    order_size_usd=trade.position_size_usd,
-                    leverage=trade.leverage,
-                    type=trade.type
-                )
-        
-                new_sl_price, new_sl_price_excluding_commission = get_price_at_pnl(
-                    desired_pnl=new_sl_pnl,
-                    commission=trade.order_commission,
-                    order_size_usd=trade.position_size_usd,
-                    leverage=trade.leverage,
-                    entry_price=position.price_open,
-                    type=trade.type
-                )          
-
-                trigger_pnl, trigger_pnl_excluding_commission = get_pnl_at_price(
-                    current_price=trigger_price,
-                    entry_price=position.price_open,
-                    order_size_usd=trade.position_size_usd,
-                    leverage=trade.leverage,
-                    type=trade.type,
-                    commission=trade.order_commission
-                )
-    
-                pnl_at_new_sl, pnl_at_new_sl_excluding_commission = get_pnl_at_price(
-                    current_price=new_sl_price,
-                    entry_price=position.price_open,
-                    order_size_usd=trade.position_size_usd,
-                    leverage=trade.leverage,
-                    type=trade.type,
-                    commission=trade.order_commission
-                )
+            # Every trailing step at once, as arrays over TRAILING_STOP_STEPS
+            with phase(PHASE_SIZING, symbol=position.symbol):
+                sizing = (position.price_open, trade.position_size_usd, direction(trade.type), trade.order_commission)
+                trigger_pnls = trade.capital * TRIGGER_PNL_MULTIPLIERS
+                new_sl_pnls = trade.capital * NEW_SL_PNL_MULTIPLIERS
+
+                trigger_prices, trigger_prices_excluding_commission = prices_at_pnl(trigger_pnls, *sizing)
+                new_sl_prices, new_sl_prices_excluding_commission = prices_at_pnl(new_sl_pnls, *sizing)
+                trigger_pnls, trigger_pnls_excluding_commission = pnls_at_price(trigger_prices, *sizing)
+                pnls_at_new_sl, pnls_at_new_sl_excluding_commission = pnls_at_price(new_sl_prices, *sizing)
+
+            for step in range(len(TRAILING_STOP_STEPS)):
+                trigger_pnl = float(trigger_pnls[step])
+                trigger_price = float(trigger_prices[step])
+                trigger_price_excluding_commission = float(trigger_prices_excluding_commission[step])
+                trigger_pnl_excluding_commission = float(trigger_pnls_excluding_commission[step])
+                new_sl_price = float(new_sl_prices[step])
+                new_sl_price_excluding_commission = float(new_sl_prices_excluding_commission[step])
+                pnl_at_new_sl = float(pnls_at_new_sl[step])
+                pnl_at_new_sl_excluding_commission = float(pnls_at_new_sl_excluding_commission[step])
 
                 nothing_is_none = position.profit is not None and trigger_pnl is not None and position.sl is not None and new_sl_price is not None
                 
@@ -171,36 +161,29 @@ def trailing_stop_algorithm():
                         }
 
                         # Modify the Stop Loss and Take Profit
-                        modify_request = modify_sl_tp(position, new_sl_price)
+                        with phase(PHASE_ORDER_SEND, symbol=position.symbol):
+                            modify_request = modify_sl_tp(position, new_sl_price)
                         if modify_request is not None:
                             logger.info({'message': 'successfully modified sl from mt5 api', 'modify_request': modify_request, 'sl_info': sl_info})
 
                             # Create a mutation record in the database
-                            mutation = mutate_trade(position, current_time, new_sl_price, pnl_at_new_sl)
+                            with phase(PHASE_DB_WRITE, symbol=position.symbol):
+                                mutation = mutate_trade(position, current_time, new_sl_price, pnl_at_new_sl)
                             if mutation is not None:
                                 logger.info({'message': 'mutation created', 'mutation': mutation})
                             else:
                                 logger.info({'message': 'mutation creation failed', 'sl_info': sl_info})
                         else:
                             logger.info({'message': 'failed to modify sl from mt5 api', 'sl_info': sl_info})
-                        
-                        # End timing for the trailing step
-                        trailing_end_time = perf_counter()
-                        trailing_duration = trailing_end_time - trailing_start_time
-                        logger.info(f"Processed trailing_step for position {position.ticket} in {trailing_duration:.4f} seconds.")
-                        
+
                         break  # Exit the trailing steps loop after modification
                     # else:
                         # print(f"Warning: Stop Loss is None for position {position.ticket}")
                 # else:
                     # print(f"Warning: Profit or trigger PNL is None for position {position.ticket}")
 
-            # End timing for the position
-            position_end_time = perf_counter()
-            position_duration = position_end_time - position_start_time
-            logger.info(f"Processed position {position.ticket} in {position_duration:.4f} seconds.")
-
     except Exception as e:
         error_msg = f"Exception in trailing_stop_algorithm: {e}\n{traceback.format_exc()}"
         logger.error(error_msg)
+        record_failure()
 
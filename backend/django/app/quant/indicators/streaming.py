@@ -0,0 +1,312 @@
+# backend/django/app/quant/indicators/streaming.py
+
+import math
+from collections import deque
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class StreamingIndicator:
+    """Base class for indicators that keep compact state between bars.
+
+    update(bar) consumes one bar in constant time and returns the value as of
+    that bar. batch(bars) computes the values for a whole array at once, gives
+    bit-identical results to calling update() bar by bar from a fresh state,
+    and leaves the indicator in the same state, so a history can be loaded
+    with batch() and followed live with update().
+
+    A bar is anything indexable by field name (dict, DataFrame row, numpy
+    record); bars is a DataFrame or a structured array.
+    """
+
+    def __init__(self):
+        self.last_time = None
+
+    def reset(self):
+        self.last_time = None
+
+    def update(self, bar):
+        raise NotImplementedError
+
+    def batch(self, bars):
+        raise NotImplementedError
+
+    def feed(self, bars: pd.DataFrame, closed_only: bool = True):
+        """Consume the bars newer than the last one seen and return the last value.
+
+        The first call runs batch() over everything. With closed_only the last
+        row is treated as still forming and left out.
+        """
+        if closed_only:
+            bars = bars.iloc[:-1]
+        if bars.empty:
+            return None
+        if self.last_time is None:
+            values = self.batch(bars)
+            self.last_time = bars['time'].iloc[-1]
+            return self._last_value(values, len(bars))
+
+        value = None
+        for _, bar in bars[bars['time'] > self.last_time].iterrows():
+            value = self.update(bar)
+            self.last_time = bar['time']
+        return value
+
+    def _last_value(self, values, count):
+        """What update() would have returned for the last bar of a batch()."""
+        return values[-1]
+
+
+class RollingStats(StreamingIndicator):
+    """Rolling mean and sample standard deviation (ddof=1) of one field.
+
+    Running sums are kept on deviations from the first value seen, which keeps
+    them small over long series, and the window is removed by subtracting the
+    cumulative sums from window bars ago.
+    """
+
+    def __init__(self, window: int = 20, field: str = 'close'):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.window = window
+        self.field = field
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self._anchor = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._count = 0
+        self._history = deque(maxlen=self.window)
+
+    def _finish(self, total, total_sq):
+        mean = self._anchor + total / self.window
+        var = (total_sq - total * total / self.window) / (self.window - 1)
+        return mean, math.sqrt(var) if var > 0.0 else 0.0
+
+    def update(self, bar):
+        value = float(bar[self.field])
+        if self._anchor is None:
+            self._anchor = value
+        deviation = value - self._anchor
+        old_sum, old_sumsq = self._history[0] if len(self._history) == self.window else (0.0, 0.0)
+        self._sum += deviation
+        self._sumsq += deviation * deviation
+        self._history.append((self._sum, self._sumsq))
+        self._count += 1
+
+        if self._count < self.window:
+            return math.nan, math.nan
+        return self._finish(self._sum - old_sum, self._sumsq - old_sumsq)
+
+    def batch(self, bars):
+        """Arrays of (mean, std), NaN until the window fills."""
+        self.reset()
+        values = np.asarray(bars[self.field], dtype=np.float64)
+        mean = np.full(len(values), np.nan)
+        std = np.full(len(values), np.nan)
+        if not len(values):
+            return mean, std
+
+        self._anchor = float(values[0])
+        deviations = values - self._anchor
+        # np.cumsum accumulates sequentially, exactly like update()
+        sums = np.cumsum(deviations)
+        sumsqs = np.cumsum(deviations * deviations)
+
+        if len(values) >= self.window:
+            old_sums = np.concatenate(([0.0], sums[:-self.window]))
+            old_sumsqs = np.concatenate(([0.0], sumsqs[:-self.window]))
+            total = sums[self.window - 1:] - old_sums
+            total_sq = sumsqs[self.window - 1:] - old_sumsqs
+            mean[self.window - 1:] = self._anchor + total / self.window
+            var = (total_sq - total * total / self.window) / (self.window - 1)
+            std[self.window - 1:] = np.sqrt(np.where(var > 0.0, var, 0.0))
+
+        self._sum = float(sums[-1])
+        self._sumsq = float(sumsqs[-1])
+        self._count = len(values)
+        self._history.extend(zip(sums[-self.window:].tolist(), sumsqs[-self.window:].tolist()))
+        return mean, std
+
+    def _last_value(self, values, count):
+        return tuple(float(column[-1]) for column in values)
+
+
+class BollingerBands(StreamingIndicator):
+    """Rolling mean with bands num_std_dev standard deviations above and below."""
+
+    def __init__(self, window: int = 20, num_std_dev: float = 2, field: str = 'close'):
+        self.num_std_dev = num_std_dev
+        self.stats = RollingStats(window, field)
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self.stats.reset()
+
+    def update(self, bar):
+        mean, std = self.stats.update(bar)
+        return mean, mean + std * self.num_std_dev, mean - std * self.num_std_dev
+
+    def batch(self, bars):
+        """Arrays of (middle, upper, lower)."""
+        mean, std = self.stats.batch(bars)
+        return mean, mean + std * self.num_std_dev, mean - std * self.num_std_dev
+
+    def _last_value(self, values, count):
+        return tuple(float(column[-1]) for column in values)
+
+
+class MeanReversionSignal(StreamingIndicator):
+    """'top' when the close crosses above the upper band, 'bottom' when it
+    crosses below the lower band, 0 otherwise (see mean_reversion.py)."""
+
+    def __init__(self, window: int = 20, num_std_dev: float = 2, field: str = 'close'):
+        self.field = field
+        self.bands = BollingerBands(window, num_std_dev, field)
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self.bands.reset()
+        self._previous = None
+
+    def update(self, bar):
+        close = float(bar[self.field])
+        _, upper, lower = self.bands.update(bar)
+        signal = 0
+        if self._previous is not None:
+            previous_close, previous_upper, previous_lower = self._previous
+            if previous_close <= previous_upper and close > upper:
+                signal = 'top'
+            elif previous_close >= previous_lower and close < lower:
+                signal = 'bottom'
+        self._previous = (close, upper, lower)
+        return signal
+
+    def batch(self, bars):
+        """Object array of 'top', 'bottom' or 0 per bar."""
+        self.reset()
+        close = np.asarray(bars[self.field], dtype=np.float64)
+        _, upper, lower = self.bands.batch(bars)
+
+        signals = np.zeros(len(close), dtype=object)
+        if len(close) > 1:
+            top = (close[:-1] <= upper[:-1]) & (close[1:] > upper[1:])
+            bottom = ~top & (close[:-1] >= lower[:-1]) & (close[1:] < lower[1:])
+            signals[1:][top] = 'top'
+            signals[1:][bottom] = 'bottom'
+        if len(close):
+            self._previous = (float(close[-1]), float(upper[-1]), float(lower[-1]))
+        return signals
+
+
+class SwingPoints(StreamingIndicator):
+    """Swing highs and lows over a five-bar window (see trend.py).
+
+    A bar is a swing high when the two bars on either side have a strictly
+    lower high_field, and a swing low when they have a strictly higher
+    low_field. A swing is confirmed two bars after it happens. Confirmed
+    points are kept in highs and lows, the oldest dropped beyond max_points.
+    """
+
+    SPAN = 2
+
+    def __init__(self, high_field: str = 'high', low_field: str = 'low', max_points: Optional[int] = None):
+        self.high_field = high_field
+        self.low_field = low_field
+        self.max_points = max_points
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        size = 2 * self.SPAN + 1
+        self._highs_window = deque(maxlen=size)
+        self._lows_window = deque(maxlen=size)
+        self._count = 0
+        self.highs = deque(maxlen=self.max_points)
+        self.lows = deque(maxlen=self.max_points)
+
+    @staticmethod
+    def _is_extreme(window, compare):
+        center = window[SwingPoints.SPAN]
+        return all(compare(window[i], center) for i in range(len(window)) if i != SwingPoints.SPAN)
+
+    def update(self, bar):
+        """The (swing high, swing low) confirmed by this bar, each a dict or None."""
+        self._highs_window.append(bar[self.high_field])
+        self._lows_window.append(bar[self.low_field])
+        self._count += 1
+
+        high = low = None
+        if len(self._highs_window) == self._highs_window.maxlen:
+            index = self._count - 1 - self.SPAN
+            if self._is_extreme(self._highs_window, lambda other, center: other < center):
+                high = {'index': index, 'price': self._highs_window[self.SPAN]}
+                self.highs.append(high)
+            if self._is_extreme(self._lows_window, lambda other, center: other > center):
+                low = {'index': index, 'price': self._lows_window[self.SPAN]}
+                self.lows.append(low)
+        return high, low
+
+    def batch(self, bars):
+        """Lists of every swing high and swing low in bars."""
+        self.reset()
+        highs_values = np.asarray(bars[self.high_field])
+        lows_values = np.asarray(bars[self.low_field])
+        n = len(highs_values)
+        span = self.SPAN
+
+        highs, lows = [], []
+        if n >= 2 * span + 1:
+            def extremes(values, compare):
+                center = values[span:n - span]
+                mask = np.ones(len(center), dtype=bool)
+                for offset in range(-span, span + 1):
+                    if offset:
+                        mask &= compare(values[span + offset:n - span + offset], center)
+                return np.flatnonzero(mask) + span
+
+            highs = [{'index': int(i), 'price': highs_values[i]} for i in extremes(highs_values, np.less)]
+            lows = [{'index': int(i), 'price': lows_values[i]} for i in extremes(lows_values, np.greater)]
+
+        self._count = n
+        self._highs_window.extend(highs_values[-self._highs_window.maxlen:])
+        self._lows_window.extend(lows_values[-self._lows_window.maxlen:])
+        self.highs.extend(highs)
+        self.lows.extend(lows)
+        return highs, lows
+
+    def _last_value(self, values, count):
+        index = count - 1 - self.SPAN
+        highs, lows = values
+        return (highs[-1] if highs and highs[-1]['index'] == index else None,
+                lows[-1] if lows and lows[-1]['index'] == index else None)
+
+
+# --- Drop-in replacements for the full-window functions ---
+
+def mean_reversion(data, window=20, num_std_dev=2):
+    """Same signals and side effect as mean_reversion.mean_reversion, via MeanReversionSignal.batch."""
+    if 'close' not in data.columns:
+        raise ValueError("DataFrame must contain a 'close' column.")
+
+    signals = MeanReversionSignal(window, num_std_dev).batch(data)
+    column = pd.Series(signals, index=data.index, name='mean_reversion')
+    if not (signals != 0).any():
+        column = column.astype(np.int64)
+    data['mean_reversion'] = column
+    return data['mean_reversion']
+
+
+def get_enhanced_swing_points(rates: pd.DataFrame):
+    """Same swing points as trend.get_enhanced_swing_points, via SwingPoints.batch."""
+    # The reference reads columns by position, not by name
+    return SwingPoints(high_field=rates.columns[3], low_field=rates.columns[4]).batch(rates)
@@ -0,0 +1,68 @@
+# backend/django/app/quant/management/commands/archive_ticks.py
+
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from app.utils.api.data import symbol_info
+from app.utils.api.ticks import iter_ticks_range
+from app.utils.tick_archive import write_ticks
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_date(value):
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+class Command(BaseCommand):
+    help = 'Downloads tick history from the MT5 API into the local tick archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('symbols', nargs='+', help='Symbols to archive.')
+        parser.add_argument('--from', dest='from_date', type=_parse_date, required=True,
+                            help='First day to archive (YYYY-MM-DD, UTC).')
+        parser.add_argument('--to', dest='to_date', type=_parse_date,
+                            help='Last day to archive (YYYY-MM-DD, UTC). Defaults to today.')
+        parser.add_argument('--chunk-seconds', type=int, default=3600,
+                            help='Seconds of ticks per streamed chunk.')
+
+    def handle(self, *args, **options):
+        from_date = options['from_date']
+        to_date = (options['to_date'] or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0))
+        to_date = to_date + timedelta(days=1) - timedelta(seconds=1)
+        if to_date < from_date:
+            raise CommandError('--to must not be before --from')
+
+        for symbol in options['symbols']:
+            info = symbol_info(symbol)
+            digits = int(info['digits'].iloc[0]) if info is not None and not info.empty else None
+            archived = self._archive_symbol(symbol, from_date, to_date, digits, options['chunk_seconds'])
+            self.stdout.write(f"{symbol}: archived {archived} ticks")
+
+    def _archive_symbol(self, symbol, from_date, to_date, digits, chunk_seconds):
+        """Stream ticks and write each UTC day once it is complete."""
+        pending = []
+        pending_day = None
+        archived = 0
+
+        for chunk in iter_ticks_range(symbol, from_date, to_date, chunk_seconds=chunk_seconds):
+            days = pd.to_datetime(chunk['time_msc'], unit='ms').dt.date
+            for day, day_ticks in chunk.groupby(days, sort=True):
+                if pending_day is not None and day != pending_day:
+                    archived += self._flush(symbol, pending, digits)
+                    pending = []
+                pending_day = day
+                pending.append(day_ticks)
+
+        if pending:
+            archived += self._flush(symbol, pending, digits)
+        return archived
+
+    def _flush(self, symbol, frames, digits):
+        ticks = pd.concat(frames, ignore_index=True)
+        write_ticks(symbol, ticks, digits=digits)
+        logger.info(f"Archived {len(ticks)} {symbol} ticks for {ticks['time'].iloc[0].date()}")
+        return len(ticks)
@@ -1,3 +1,92 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from app.utils.constants import MT5Timeframe
+from app.utils.resample import ResampledBarFeed, TIMEFRAME_SECONDS, bucket_starts
+
+# Wednesday 2024-06-12 12:00 UTC, on a server three hours ahead of UTC
+UTC_NOW = 1718193600
+SERVER_OFFSET = 3 * 60 * 60
+
+
+class FakeTerminal:
+    """fetch_data_pos over synthetic bars stamped in server time."""
+
+    def __init__(self):
+        self.utc_now = UTC_NOW
+        self.down = False
+        self.requests = []
+
+    @property
+    def server_now(self):
+        return self.utc_now + SERVER_OFFSET
+
+    def fetch_data_pos(self, symbol, timeframe, count):
+        self.requests.append((timeframe, count))
+        if self.down or count < 1:
+            return None
+        last = int(bucket_starts(np.array([self.server_now]), timeframe)[0])
+        times = last - TIMEFRAME_SECONDS[timeframe] * np.arange(count)[::-1]
+        prices = np.linspace(1.0, 1.1, count)
+        return pd.DataFrame({
+            'time': pd.to_datetime(times, unit='s'),
+            'open': prices, 'high': prices + 0.001, 'low': prices - 0.001, 'close': prices,
+            'tick_volume': 1, 'spread': 1, 'real_volume': 0,
+        })
+
+
+class ResampledBarFeedTests(SimpleTestCase):
+    def setUp(self):
+        self.terminal = FakeTerminal()
+        for patch in (
+            mock.patch('app.utils.resample.fetch_data_pos', self.terminal.fetch_data_pos),
+            mock.patch('app.utils.resample.time', mock.Mock(time=lambda: self.terminal.utc_now)),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.feed = ResampledBarFeed([MT5Timeframe.H4, MT5Timeframe.W1], max_bars=10)
+
+    def m1_counts(self):
+        return [count for timeframe, count in self.terminal.requests if timeframe == MT5Timeframe.M1]
+
+    def test_refresh_with_server_ahead_of_utc(self):
+        self.assertTrue(self.feed.refresh('EURUSD'))
+        self.assertEqual(self.feed.server_offset, SERVER_OFFSET)
+        self.assertTrue(all(count >= 2 for count in self.m1_counts()))
+
+        # The buffer reaches back to the open W1 bucket on the server clock
+        resampler = self.feed._resamplers['EURUSD']
+        server_now = self.terminal.server_now
+        self.assertEqual(resampler.last_m1_time, server_now - server_now % 60)
+        self.assertEqual(int(resampler._m1_times[0]), resampler.open_bucket_start(server_now))
+
+        self.terminal.utc_now += 5 * 60
+        self.terminal.requests.clear()
+        self.assertTrue(self.feed.refresh('EURUSD'))
+        self.assertEqual(self.m1_counts(), [7])
+        self.assertEqual(resampler.last_m1_time, self.terminal.server_now - self.terminal.server_now % 60)
+
+        bars = self.feed.bars('EURUSD', MT5Timeframe.H4, 5)
+        h4_start = int(bucket_starts(np.array([self.terminal.server_now]), MT5Timeframe.H4)[0])
+        self.assertEqual(bars['time'].iloc[-1], pd.Timestamp(h4_start, unit='s'))
+
+    def test_failed_refresh_fetches_directly(self):
+        self.assertTrue(self.feed.refresh('EURUSD'))
+        self.terminal.down = True
+        self.assertFalse(self.feed.refresh('EURUSD'))
+
+        self.terminal.down = False
+        self.terminal.requests.clear()
+        bars = self.feed.bars('EURUSD', MT5Timeframe.H4, 5)
+        self.assertEqual(self.terminal.requests, [(MT5Timeframe.H4, 5)])
+        self.assertEqual(len(bars), 5)
+
+    def test_falling_behind_reseeds(self):
+        self.assertTrue(self.feed.refresh('EURUSD'))
+        self.terminal.utc_now += 2 * 24 * 60 * 60
+        self.assertTrue(self.feed.refresh('EURUSD'))
+        resampler = self.feed._resamplers['EURUSD']
+        self.assertEqual(int(resampler._m1_times[0]), resampler.open_bucket_start(self.terminal.server_now))
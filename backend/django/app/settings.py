@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os  # Added for environment variables
 from dotenv import load_dotenv  # Optional: If using a .env file
 
@@ -204,9 +205,59 @@ CELERY_BROKER_CONNECTION_RETRY = True
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True  # To retain existing behavior
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://redis:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://redis:6379/0')
+
+# Strategy cycle instrumentation
+QUANT_METRICS_PORT = os.getenv('QUANT_METRICS_PORT')
+QUANT_CYCLE_TRACE_FILE = os.getenv('QUANT_CYCLE_TRACE_FILE')  # Rolling JSON-lines file of per-cycle spans
+QUANT_CYCLE_TRACE_MAX_BYTES = int(os.getenv('QUANT_CYCLE_TRACE_MAX_BYTES', 10 * 1024 * 1024))
+QUANT_CYCLE_TRACE_BACKUP_COUNT = int(os.getenv('QUANT_CYCLE_TRACE_BACKUP_COUNT', 5))
+
+# Local tick archive, one file per symbol per day (see app.utils.tick_archive)
+TICK_ARCHIVE_DIR = os.getenv('TICK_ARCHIVE_DIR', os.path.join(BASE_DIR, 'data/ticks'))
+
+# Indicator results shared across worker processes; empty disables the cache
+INDICATOR_CACHE_URL = os.getenv('INDICATOR_CACHE_URL', 'redis://redis:6379/1')
+INDICATOR_CACHE_MAX_ENTRIES = int(os.getenv('INDICATOR_CACHE_MAX_ENTRIES', 5000))
+
+# Open trade max drawdown / max profit are saved once they move this many USD
+EXCURSION_PERSIST_THRESHOLD = float(os.getenv('EXCURSION_PERSIST_THRESHOLD', 1.0))
+
+# Equity recorder: sampling cadence and days kept per resolution (1d is kept forever)
+EQUITY_SAMPLE_SECONDS = float(os.getenv('EQUITY_SAMPLE_SECONDS', 60))
+EQUITY_RETENTION_DAYS = {
+    '1m': int(os.getenv('EQUITY_RETENTION_DAYS_1M', 7)),
+    '1h': int(os.getenv('EQUITY_RETENTION_DAYS_1H', 365)),
+}
+
+# Closed trades keep only their first and last mutation after this many days
+MUTATION_RETENTION_DAYS = int(os.getenv('MUTATION_RETENTION_DAYS', 30))
+
+# Executed orders queue here until a beat task persists them; empty writes them inline
+TRADE_OUTBOX_URL = os.getenv('TRADE_OUTBOX_URL', 'redis://redis:6379/2')
+TRADE_OUTBOX_BATCH_SIZE = int(os.getenv('TRADE_OUTBOX_BATCH_SIZE', 100))
+
+# Asset class of symbols missing from the lists in utils/constants, e.g. '{"SOLUSD": "crypto"}'
+SYMBOL_CLASSES = json.loads(os.getenv('SYMBOL_CLASSES', '{}'))
+
 CELERY_BEAT_SCHEDULE = {
     'run-quant-entry-algorithm': {
         'task': 'quant.tasks.run_quant_entry_algorithm',  # This should match the @shared_task name
         'schedule': 60.0 * 1,
     },
+    'drain-trade-outbox': {
+        'task': 'nexus.tasks.drain_trade_outbox',
+        'schedule': 5.0,
+    },
+    'record-account-snapshot': {
+        'task': 'nexus.tasks.record_account_snapshot',
+        'schedule': EQUITY_SAMPLE_SECONDS,
+    },
+    'rollup-account-snapshots': {
+        'task': 'nexus.tasks.rollup_account_snapshots',
+        'schedule': 60.0 * 5,
+    },
+    'compact-trade-mutations': {
+        'task': 'nexus.tasks.compact_trade_mutations',
+        'schedule': 60.0 * 60 * 24,
+    },
 }
\ No newline at end of file
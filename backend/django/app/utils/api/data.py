@@ -6,6 +6,8 @@ import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 import logging
+import threading
+from collections import OrderedDict
 
 from app.utils.constants import MT5Timeframe
 
@@ -14,6 +16,39 @@ logger = logging.getLogger(__name__)
 
 BASE_URL = os.getenv('MT5_API_URL')
 
+# Last bar payload per URL with its ETag, revalidated with If-None-Match so the
+# MT5 API answers 304 instead of resending bars that have not changed.
+BAR_CACHE_SIZE = 512
+_bar_cache = OrderedDict()
+_bar_cache_lock = threading.Lock()
+
+
+def _get_bars(url, params=None, method='GET'):
+    key = (method, url, tuple(sorted((params or {}).items())))
+    with _bar_cache_lock:
+        cached = _bar_cache.get(key)
+
+    headers = {}
+    if cached is not None:
+        headers['If-None-Match'] = cached[0]
+
+    response = requests.request(method, url, params=params, headers=headers, timeout=10)
+    if response.status_code == 304 and cached is not None:
+        with _bar_cache_lock:
+            _bar_cache.move_to_end(key)
+        return cached[1]
+    response.raise_for_status()
+
+    data = response.json()
+    etag = response.headers.get('ETag')
+    if etag:
+        with _bar_cache_lock:
+            _bar_cache[key] = (etag, data)
+            _bar_cache.move_to_end(key)
+            while len(_bar_cache) > BAR_CACHE_SIZE:
+                _bar_cache.popitem(last=False)
+    return data
+
 def symbol_info_tick(symbol) -> pd.DataFrame:
     try:
         url = f"{BASE_URL}/symbol_info_tick/{symbol}"
@@ -43,11 +78,8 @@ def symbol_info(symbol) -> pd.DataFrame:
 
 def fetch_data_pos(symbol: str, timeframe: MT5Timeframe, bars: int) -> pd.DataFrame:
     try:
-        url = f"{BASE_URL}/fetch_data_pos?symbol={symbol}&timeframe={timeframe.value}&bars={bars}"
-        response = requests.get(url)
-        response.raise_for_status()
-
-        data = response.json()
+        url = f"{BASE_URL}/fetch_data_pos?symbol={symbol}&timeframe={timeframe.value}&num_bars={bars}&orient=columns"
+        data = _get_bars(url)
         df = pd.DataFrame(data)
         return df
     except Exception as e:
@@ -61,12 +93,10 @@ def fetch_data_range(symbol: str, timeframe: MT5Timeframe, from_date: datetime,
             'symbol': symbol,
             'timeframe': timeframe.value,
             'from_date': from_date,
-            'to_date': to_date
+            'to_date': to_date,
+            'orient': 'columns'
         }
-        response = requests.post(url, params=params)
-        response.raise_for_status()
-
-        data = response.json()
+        data = _get_bars(url, params=params, method='POST')
         df = pd.DataFrame(data)
         return df
     except Exception as e:
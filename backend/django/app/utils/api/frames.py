@@ -0,0 +1,68 @@
+import json
+import struct
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Mirrors backend/mt5/app/frames.py: u32 payload_length | u32 header_length | header | columns
+MIMETYPE = 'application/vnd.mt5.columnar'
+
+_U32 = struct.Struct('<I')
+
+
+def decode_payload(payload: bytes) -> Tuple[Dict, pd.DataFrame]:
+    """Split one frame payload into its header and a DataFrame over the column buffers."""
+    (header_length,) = _U32.unpack_from(payload, 0)
+    offset = _U32.size + header_length
+    header = json.loads(payload[_U32.size:offset])
+
+    count = header['count']
+    columns = {}
+    for name, dtype_str in header['columns']:
+        dtype = np.dtype(dtype_str)
+        columns[name] = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+        offset += count * dtype.itemsize
+    return header, pd.DataFrame(columns)
+
+
+def _read_exact(stream: BinaryIO, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            if remaining == size:
+                return None
+            raise EOFError("Stream ended inside a frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+def iter_frames(stream: BinaryIO) -> Iterator[Tuple[Dict, pd.DataFrame]]:
+    """Read frames from a file-like object until it is exhausted."""
+    while True:
+        prefix = _read_exact(stream, _U32.size)
+        if prefix is None:
+            return
+        (length,) = _U32.unpack(prefix)
+        yield decode_payload(_read_exact(stream, length))
+
+
+def decode_frames(body: bytes) -> pd.DataFrame:
+    """Concatenate every data frame of a buffered response body."""
+    frames = []
+    offset = 0
+    while offset < len(body):
+        (length,) = _U32.unpack_from(body, offset)
+        offset += _U32.size
+        header, frame = decode_payload(body[offset:offset + length])
+        offset += length
+        if 'error' in header:
+            raise RuntimeError(header['error'])
+        if header['count']:
+            frames.append(frame)
+    if not frames:
+        return pd.DataFrame()
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
@@ -49,14 +49,14 @@ def send_market_order(symbol: str, volume: float, order_type: str, sl: float, tp
         response.raise_for_status()
 
         response_data = response.json()
-        
-        if not response_data.get('success'):
-            error_msg = response_data.get('error', 'Unknown error')
-            details = response_data.get('details', '')
-            print(f"Order failed: {error_msg} {details}")
+
+        # The API answers {"message": ..., "result": {...}}, rejected orders come back as HTTP 400 with an "error"
+        order = response_data.get('result')
+        if 'error' in response_data or not order:
+            error_msg = response_data.get('error', 'No result returned')
+            details = response_data.get('mt5_error', '')
+            logger.error(f"Order failed: {error_msg} {details}")
             return None
-            
-        order = response_data['order_result']
 
         return order
         
@@ -92,10 +92,8 @@ def modify_sl_tp(position, sl: float, tp: float = None) -> Dict:
 
         response_data = response.json()
 
-        if not response_data.get('success'):
-            error_msg = response_data.get('error', 'Unknown error')
-            details = response_data.get('details', '')
-            logger.error(f"Modify SL/TP failed: {error_msg} {details}")
+        if 'error' in response_data:
+            logger.error(f"Modify SL/TP failed: {response_data['error']}")
             return None
 
         result = response_data.get('result')
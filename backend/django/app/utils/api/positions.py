@@ -3,7 +3,6 @@ import traceback
 from typing import List, Dict
 from datetime import datetime
 import logging
-import time
 
 import requests
 import pandas as pd
@@ -25,12 +24,7 @@ empty_df = pd.DataFrame(columns=[
 def get_positions() -> pd.DataFrame:
     try:
         url = f"{BASE_URL}/get_positions"
-        start_time = time.time()  # Start timing
         response = requests.get(url, timeout=10)
-        end_time = time.time()    # End timing
-        duration = end_time - start_time
-        logger.info(f"Fetched positions in {duration:.2f} seconds")
-
         response.raise_for_status()
         
         data = response.json()
@@ -54,3 +48,78 @@ def get_positions() -> pd.DataFrame:
         error_msg = f"Exception fetching positions: {e}\n{traceback.format_exc()}"
         logger.error(error_msg)
         return empty_df
+
+
+def get_position_changes(since: int = None, epoch: str = None) -> Dict:
+    """
+    Fetch positions opened, modified or closed since a version of the server's
+    snapshot. Returns None on failure.
+
+    :param since: Version returned by the previous call; None for a full snapshot.
+    :param epoch: Epoch returned by the previous call.
+    """
+    try:
+        url = f"{BASE_URL}/positions/changes"
+        params = {}
+        if since is not None:
+            params['since'] = since
+        if epoch is not None:
+            params['epoch'] = epoch
+
+        response = requests.get(url, params=params, timeout=10)
+        response.raise_for_status()
+
+        return response.json()
+
+    except requests.exceptions.Timeout:
+        logger.error(f"Timeout fetching position changes from {url}")
+        return None
+
+    except Exception as e:
+        error_msg = f"Exception fetching position changes: {e}\n{traceback.format_exc()}"
+        logger.error(error_msg)
+        return None
+
+
+class PositionTracker:
+    """
+    Local mirror of the open positions, kept current through /positions/changes.
+
+    poll() applies the changes since the last call and returns them, so callers
+    can react to closes as soon as they happen without diffing full dumps.
+    """
+
+    def __init__(self):
+        self.epoch = None
+        self.version = None
+        self.positions = {}
+
+    def poll(self) -> Dict:
+        changes = get_position_changes(self.version, self.epoch)
+        if changes is None:
+            return None
+
+        if changes['full']:
+            previous = self.positions
+            self.positions = {p['ticket']: p for p in changes['opened']}
+            # Report tickets that disappeared while the client was out of sync as closed.
+            changes['closed'] = [ticket for ticket in previous if ticket not in self.positions]
+            changes['opened'] = [p for p in changes['opened'] if p['ticket'] not in previous]
+        else:
+            for position in changes['opened'] + changes['modified']:
+                self.positions[position['ticket']] = position
+            for ticket in changes['closed']:
+                self.positions.pop(ticket, None)
+
+        self.epoch = changes['epoch']
+        self.version = changes['version']
+        return changes
+
+    def to_dataframe(self) -> pd.DataFrame:
+        if not self.positions:
+            return empty_df
+
+        df = pd.DataFrame(list(self.positions.values()))
+        df['time'] = pd.to_datetime(df['time'], unit='s', utc=True)
+        df['time_update'] = pd.to_datetime(df['time_update'], unit='s', utc=True)
+        return df
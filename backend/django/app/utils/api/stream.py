@@ -0,0 +1,101 @@
+import os
+import json
+import traceback
+import logging
+from typing import Dict, Iterator
+from datetime import datetime
+
+import requests
+import pandas as pd
+from dotenv import load_dotenv
+
+from app.utils.constants import MT5Timeframe
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+BASE_URL = os.getenv('MT5_API_URL')
+
+MAX_RETRIES = 3
+
+
+def _iter_chunks(url: str, params: Dict, max_retries: int = MAX_RETRIES) -> Iterator[pd.DataFrame]:
+    """
+    Follow an NDJSON stream from the MT5 API, yielding one DataFrame per chunk.
+
+    A dropped connection or a failed slice is retried from the last cursor the
+    server sent, so chunks are never repeated or skipped.
+    """
+    cursor = None
+    retries = 0
+
+    while True:
+        request_params = dict(params)
+        if cursor is not None:
+            request_params['cursor'] = cursor
+
+        try:
+            with requests.get(url, params=request_params, stream=True, timeout=(10, 300)) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    message = json.loads(line)
+
+                    if message.get('done'):
+                        return
+                    if 'error' in message:
+                        raise RuntimeError(f"Stream failed at cursor {message.get('cursor')}: {message['error']}")
+
+                    yield pd.DataFrame(message['data'])
+                    retries = 0
+                    if message['cursor'] is None:
+                        return
+                    cursor = message['cursor']
+
+            # The server closed the stream without a final line
+            raise requests.exceptions.ChunkedEncodingError("Stream ended without a done marker")
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout, RuntimeError) as e:
+            retries += 1
+            if retries > max_retries:
+                logger.error(f"Giving up on stream {url} after {max_retries} retries: {e}")
+                return
+            logger.warning(f"Resuming stream {url} from cursor {cursor}: {e}")
+
+        except Exception as e:
+            error_msg = f"Exception streaming {url}: {e}\n{traceback.format_exc()}"
+            logger.error(error_msg)
+            return
+
+
+def iter_data_range(symbol: str, timeframe: MT5Timeframe, from_date: datetime, to_date: datetime,
+                    chunk_bars: int = 50000) -> Iterator[pd.DataFrame]:
+    """
+    Yield bars between from_date and to_date as DataFrames of at most chunk_bars
+    rows, so year-long M1 exports stay within bounded memory.
+    """
+    url = f"{BASE_URL}/fetch_data_range/stream"
+    params = {
+        'symbol': symbol,
+        'timeframe': timeframe.value,
+        'start': from_date.isoformat(),
+        'end': to_date.isoformat(),
+        'chunk_bars': chunk_bars,
+    }
+    yield from _iter_chunks(url, params)
+
+
+def iter_deals(from_date: datetime, to_date: datetime, group: str = None,
+               chunk_days: int = 7) -> Iterator[pd.DataFrame]:
+    """Yield deal history between from_date and to_date, chunk_days at a time."""
+    url = f"{BASE_URL}/history_deals_get/stream"
+    params = {
+        'from_date': from_date.isoformat(),
+        'to_date': to_date.isoformat(),
+        'chunk_days': chunk_days,
+    }
+    if group is not None:
+        params['group'] = group
+    yield from _iter_chunks(url, params)
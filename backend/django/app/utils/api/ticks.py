@@ -0,0 +1,119 @@
+import os
+import traceback
+import logging
+from typing import Iterator
+from datetime import datetime
+
+import requests
+import pandas as pd
+from dotenv import load_dotenv
+
+from app.utils.api.frames import decode_frames, iter_frames
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+BASE_URL = os.getenv('MT5_API_URL')
+
+MAX_RETRIES = 3
+
+
+def _to_frame(df: pd.DataFrame) -> pd.DataFrame:
+    if not df.empty:
+        df['time'] = pd.to_datetime(df['time_msc'], unit='ms')
+    return df
+
+
+def fetch_ticks_range(symbol: str, from_date: datetime, to_date: datetime, flags: str = 'ALL') -> pd.DataFrame:
+    """Ticks between from_date and to_date in one DataFrame, with time at millisecond precision."""
+    try:
+        url = f"{BASE_URL}/copy_ticks_range"
+        params = {
+            'symbol': symbol,
+            'start': from_date.isoformat(),
+            'end': to_date.isoformat(),
+            'flags': flags,
+        }
+        response = requests.get(url, params=params, timeout=(10, 300))
+        response.raise_for_status()
+        return _to_frame(decode_frames(response.content))
+
+    except Exception as e:
+        error_msg = f"Exception fetching ticks for {symbol}: {e}\n{traceback.format_exc()}"
+        logger.error(error_msg)
+        return pd.DataFrame()
+
+
+def fetch_ticks_from(symbol: str, from_date: datetime, count: int, flags: str = 'ALL') -> pd.DataFrame:
+    """The first count ticks at or after from_date."""
+    try:
+        url = f"{BASE_URL}/copy_ticks_from"
+        params = {
+            'symbol': symbol,
+            'start': from_date.isoformat(),
+            'count': count,
+            'flags': flags,
+        }
+        response = requests.get(url, params=params, timeout=(10, 300))
+        response.raise_for_status()
+        return _to_frame(decode_frames(response.content))
+
+    except Exception as e:
+        error_msg = f"Exception fetching ticks for {symbol}: {e}\n{traceback.format_exc()}"
+        logger.error(error_msg)
+        return pd.DataFrame()
+
+
+def iter_ticks_range(symbol: str, from_date: datetime, to_date: datetime, flags: str = 'ALL',
+                     chunk_seconds: int = 3600, max_retries: int = MAX_RETRIES) -> Iterator[pd.DataFrame]:
+    """
+    Yield ticks between from_date and to_date chunk_seconds at a time, decoded
+    straight from the binary stream. Interrupted downloads resume from the last
+    cursor the server sent.
+    """
+    url = f"{BASE_URL}/copy_ticks_range/stream"
+    params = {
+        'symbol': symbol,
+        'start': from_date.isoformat(),
+        'end': to_date.isoformat(),
+        'flags': flags,
+        'chunk_seconds': chunk_seconds,
+    }
+    cursor = None
+    retries = 0
+
+    while True:
+        request_params = dict(params)
+        if cursor is not None:
+            request_params['cursor'] = cursor
+
+        try:
+            with requests.get(url, params=request_params, stream=True, timeout=(10, 300)) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                for header, frame in iter_frames(response.raw):
+                    if header.get('done'):
+                        return
+                    if 'error' in header:
+                        raise RuntimeError(f"Stream failed at cursor {header.get('cursor')}: {header['error']}")
+
+                    yield _to_frame(frame)
+                    retries = 0
+                    if header['cursor'] is None:
+                        return
+                    cursor = header['cursor']
+
+            raise EOFError("Stream ended without a done frame")
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout, EOFError, RuntimeError) as e:
+            retries += 1
+            if retries > max_retries:
+                logger.error(f"Giving up on stream {url} after {max_retries} retries: {e}")
+                return
+            logger.warning(f"Resuming stream {url} from cursor {cursor}: {e}")
+
+        except Exception as e:
+            error_msg = f"Exception streaming {url}: {e}\n{traceback.format_exc()}"
+            logger.error(error_msg)
+            return
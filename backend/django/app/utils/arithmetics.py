@@ -1,12 +1,75 @@
 import traceback
 import logging
+import numpy as np
 import pandas as pd
 
-from app.utils.constants import MT5Timeframe, METALS, OILS, CURRENCY_PAIRS, CRYPTOCURRENCIES
+from app.utils.constants import MT5Timeframe
 from app.utils.api.data import symbol_info
+from app.utils.symbols import symbols
 
 logger = logging.getLogger(__name__)
 
+# Trade types as signed directions for the array functions
+DIRECTIONS = {'BUY': 1, 'SELL': -1}
+
+def direction(type: str) -> int:
+    """+1 for 'BUY', -1 for 'SELL'."""
+    try:
+        return DIRECTIONS[type]
+    except KeyError:
+        raise ValueError(f"Unknown trade type: {type}") from None
+
+def directions(types) -> np.ndarray:
+    """An int8 array of +1/-1 from an array of 'BUY'/'SELL' strings or of +1/-1 ints."""
+    types = np.asarray(types)
+    if types.dtype.kind in 'iuf':
+        result = types.astype(np.int8)
+    else:
+        result = np.zeros(types.shape, dtype=np.int8)
+        for name, sign in DIRECTIONS.items():
+            result[types == name] = sign
+    if not np.all((result == 1) | (result == -1)):
+        unknown = sorted(set(types[(result != 1) & (result != -1)].tolist()))
+        raise ValueError(f"Unknown trade types: {unknown}")
+    return result
+
+# --- Array functions ---
+#
+# Arguments are NumPy arrays or scalars that broadcast together, direction is
+# +1 (BUY) or -1 (SELL). Plain arithmetic only, so scalars in give scalars
+# out, and the scalar functions below are thin wrappers with identical
+# results. A whole portfolio is one call, e.g. the PnL at every open
+# position's stop loss: pnls_at_price(sl, price_open, size_usd, directions(type), commission).
+
+def prices_at_pnl(desired_pnl, entry_price, order_size_usd, direction, commission) -> tuple:
+    """Prices at which desired_pnl is reached: (with commission, without commission)."""
+    price_including_commission = entry_price * (1 + direction * (desired_pnl + commission) / order_size_usd)
+    price_excluding_commission = entry_price * (1 + direction * desired_pnl / order_size_usd)
+    return price_including_commission, price_excluding_commission
+
+def pnls_at_price(current_price, entry_price, order_size_usd, direction, commission) -> tuple:
+    """PnL at current_price: (before commission, after commission)."""
+    price_change = direction * (current_price - entry_price) / entry_price
+    pnl_including_commission = order_size_usd * price_change
+    return pnl_including_commission, pnl_including_commission - commission
+
+def liquidation_prices(entry_price, leverage, direction):
+    return entry_price * (1 - direction / leverage)
+
+def commission_rates(pairs) -> np.ndarray:
+    """Commission rate per pair, raising ValueError on unknown pairs."""
+    rates = symbols.commission_rates(pairs)
+    if np.isnan(rates).any():
+        unknown = sorted(set(np.asarray(pairs, dtype=object)[np.isnan(rates)].tolist()))
+        raise ValueError(f"Could not calculate commission for unknown pairs: {unknown}")
+    return rates
+
+def commissions(order_size_usd, pairs) -> np.ndarray:
+    """Total commission (open and close) per trade."""
+    return np.asarray(order_size_usd, dtype=np.float64) * commission_rates(pairs)
+
+# --- Scalar functions ---
+
 def get_price_at_pnl(desired_pnl: float, entry_price: float, order_size_usd: float, leverage: float, type: str, commission: float) -> tuple:
     """
     Calculate the price at which the desired PnL is achieved, with and without commission.
@@ -22,33 +85,13 @@ def get_price_at_pnl(desired_pnl: float, entry_price: float, order_size_usd: flo
              - Price without commission
     :raises ValueError: If an unknown trade type is provided.
     """
-    if type == 'BUY':
-        price_including_commission = entry_price * (1 + (desired_pnl + commission) / order_size_usd)
-        price_excluding_commission = entry_price * (1 + desired_pnl / order_size_usd)
-    elif type == 'SELL':
-        price_including_commission = entry_price * (1 - (desired_pnl + commission) / order_size_usd)
-        price_excluding_commission = entry_price * (1 - desired_pnl / order_size_usd)
-    else:
-        raise ValueError(f"Unknown trade type: {type}")
-
-    return price_including_commission, price_excluding_commission
+    return prices_at_pnl(desired_pnl, entry_price, order_size_usd, direction(type), commission)
 
 def get_pnl_at_price(current_price: float, entry_price: float, order_size_usd: float, leverage: float, type: str, commission: float) -> tuple:
-    if type == 'BUY':
-        price_change = (current_price - entry_price) / entry_price
-    elif type == 'SELL':
-        price_change = (entry_price - current_price) / entry_price
-    else:
-        raise ValueError(f"Unknown trade type: {type}")
-    
-    # Calculate gross PNL
-    pnl_including_commission = order_size_usd * price_change
-
-    # Subtract commissions
-    pnl_excluding_commission = pnl_including_commission - commission
-    return pnl_including_commission, pnl_excluding_commission
+    return pnls_at_price(current_price, entry_price, order_size_usd, direction(type), commission)
 
 def calculate_order_size_usd(capital: float, leverage: float) -> float:
+    # Works element-wise on arrays as well
     return capital * leverage
 
 def calculate_price_with_spread(price: float, spread_multiplier: float, increase: bool) -> float:
@@ -58,14 +101,9 @@ def calculate_price_with_spread(price: float, spread_multiplier: float, increase
         return price * (1 - spread_multiplier)
     
 def calculate_liquidation_price(entry_price: float, leverage: float, type: str) -> float:
-    if type == 'BUY':
-        liq_p = entry_price * (1 - (1 / leverage))
-    elif type == 'SELL':
-        liq_p = entry_price * (1 + (1 / leverage))
-    else:
+    if type not in DIRECTIONS:
         raise ValueError(f"Unknown position type: {type}")
-    
-    return liq_p
+    return liquidation_prices(entry_price, leverage, DIRECTIONS[type])
 
 
 def calculate_trade_volume(open_price: float, current_price: float, current_pnl: float, leverage: float) -> float:
@@ -169,19 +207,11 @@ def calculate_commission(order_size_usd: float, pair: str) -> float:
     :param order_size_usd: The notional value of the position in USD.
     :return: The total commission for opening and closing the trade.
     """
+    commission_rate = symbols.commission_rate(pair)
+    if np.isnan(commission_rate):
+        logger.error(f"Could not calculate commission for unknown pair: {pair}")
+        return None
     try:
-        if pair in CRYPTOCURRENCIES:
-            commission_rate = 0.0005 # 0.05%
-        elif pair in OILS:
-            commission_rate = 0.00025
-        elif pair in METALS:
-            commission_rate = 0.00025
-        elif pair in CURRENCY_PAIRS:
-            commission_rate = 0.00025
-        else:
-            # Throw exception
-            raise ValueError(f"Could not calculate commission for unknown pair: {pair}")
-
         commission = order_size_usd * commission_rate # Total commission for both open and close
         return commission
     except Exception as e:
@@ -1,6 +1,7 @@
 import logging
 
 from app.nexus.models import Trade
+from app.utils.db.stats import record_closed_trade
 from django.db import transaction
 
 logger = logging.getLogger(__name__)
@@ -14,19 +15,28 @@ def close_trade(ticket, close_time, close_price, pnl, pnl_excluding_commission,
             logger.error(error_msg)
             return None
 
+        was_open = trade.close_time is None
         trade.close_time = close_time
         trade.close_price = close_price
         trade.pnl = pnl
         trade.pnl_excluding_commission = pnl_excluding_commission
         trade.closing_reason = closing_reason
 
-        # Optionally, update max_drawdown and max_profit if available
-        trade.max_drawdown = closed_deal.get('max_drawdown', trade.max_drawdown)
-        trade.max_profit = closed_deal.get('max_profit', trade.max_profit)
+        # Final excursions from the tracker, merged with what other processes stored
+        max_drawdown = closed_deal.get('max_drawdown')
+        if max_drawdown is not None:
+            trade.max_drawdown = max_drawdown if trade.max_drawdown is None else min(trade.max_drawdown, max_drawdown)
+        max_profit = closed_deal.get('max_profit')
+        if max_profit is not None:
+            trade.max_profit = max_profit if trade.max_profit is None else max(trade.max_profit, max_profit)
 
         trade.save()
         logger.info(f"Updated Trade ID {trade.id} with closing details.")
 
+        # Closing the same ticket twice must not count it twice
+        if was_open:
+            record_closed_trade(trade)
+
         # Send a notification about the closed trade
         logger.info({
             "event": "trade_closed",
@@ -0,0 +1,73 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min
+
+from app.nexus.models import Trade, TradeClosePricesMutation, TradeMutationSummary
+
+logger = logging.getLogger(__name__)
+
+
+def _compact_batch(trade_ids) -> int:
+    """Summarize and compact the mutations of one batch of trades. Returns the number of rows deleted."""
+    mutations = TradeClosePricesMutation.objects.filter(trade_id__in=trade_ids)
+    summaries = list(mutations.values('trade_id').annotate(
+        mutation_count=Count('id'),
+        first_mutation_time=Min('mutation_time'),
+        last_mutation_time=Max('mutation_time'),
+        min_sl_price=Min('new_sl_price'),
+        max_sl_price=Max('new_sl_price'),
+        min_tp_price=Min('new_tp_price'),
+        max_tp_price=Max('new_tp_price'),
+    ).order_by())
+
+    # The first mutation holds the SL set at entry (R multiples), the last the final SL/TP
+    first, last = {}, {}
+    for mutation_id, trade_id in mutations.order_by('trade_id', 'mutation_time', 'id').values_list('id', 'trade_id'):
+        first.setdefault(trade_id, mutation_id)
+        last[trade_id] = mutation_id
+    kept = set(first.values()) | set(last.values())
+
+    with transaction.atomic():
+        TradeMutationSummary.objects.bulk_create(
+            [TradeMutationSummary(**row) for row in summaries],
+            ignore_conflicts=True,
+        )
+        deleted, _ = mutations.exclude(id__in=kept).delete()
+    return deleted
+
+
+def compact_mutations(older_than_days: Optional[int] = None, batch_size: int = 500,
+                      now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Compact the mutations of trades closed more than older_than_days ago
+    (MUTATION_RETENTION_DAYS by default).
+
+    Each trade keeps its first and last mutation; its SL/TP path goes into a
+    TradeMutationSummary, which also marks it as done for the next runs.
+    """
+    if older_than_days is None:
+        older_than_days = getattr(settings, 'MUTATION_RETENTION_DAYS', 30)
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=older_than_days)
+
+    pending = (Trade.objects
+               .filter(close_time__lt=cutoff, mutation_summary__isnull=True, close_prices_mutations__isnull=False)
+               .distinct()
+               .order_by('id')
+               .values_list('id', flat=True))
+
+    trades = deleted = 0
+    last_id = 0
+    while True:
+        batch = list(pending.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        deleted += _compact_batch(batch)
+        trades += len(batch)
+        last_id = batch[-1]
+
+    logger.info(f"Compacted mutations of {trades} trades closed before {cutoff}, {deleted} rows deleted")
+    return {'trades': trades, 'deleted': deleted}
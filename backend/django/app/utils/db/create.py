@@ -3,45 +3,57 @@ from datetime import datetime
 
 from app.nexus.models import Trade, TradeClosePricesMutation  # Import models
 from app.utils.arithmetics import get_price_at_pnl, get_pnl_at_price
+from app.utils.db.stats import record_opened_trade
 
 logger = logging.getLogger(__name__)
 
+def build_trade(order, symbol: str, capital: float, position_size_usd: float,
+                leverage: float, commission: float, type: str, broker: str,
+                market: str, strategy: str, timeframe: str, order_volume: float,
+                sl: float, tp: float = None, entry_time: datetime = None):
+    """The unsaved Trade and initial TradeClosePricesMutation for an executed order."""
+    entry_price = order.get('price')
+
+    trade = Trade(
+        transaction_broker_id=order.get('order'),
+        symbol=symbol,
+        entry_time=entry_time or datetime.now(),  # Modify as needed based on actual data
+        entry_price=entry_price,
+        type=type.upper(),  # Ensure matching choices
+        position_size_usd=position_size_usd,  # Example calculation
+        capital=capital,  # Set appropriately
+        leverage=leverage,  # Adjust based on your data
+        order_volume=order_volume,
+        order_commission=commission,
+        break_even_price=get_price_at_pnl(0, entry_price, position_size_usd, leverage, type, commission)[0],
+        liquidity_price=get_price_at_pnl(-capital, entry_price, position_size_usd, leverage, type, commission)[0],
+        broker=broker,
+        market_type=market,
+        strategy=strategy,
+        timeframe=timeframe,
+    )
+
+    mutation = TradeClosePricesMutation(
+        trade=trade,
+        mutation_price=entry_price,  # Example: using SL price
+        new_tp_price=tp if tp else None,
+        new_sl_price=sl,
+        pnl_at_new_tp_price=get_pnl_at_price(tp, entry_price, position_size_usd, leverage, type, commission)[0] if tp else None,
+        pnl_at_new_sl_price=get_pnl_at_price(sl, entry_price, position_size_usd, leverage, type, commission)[0],
+    )
+    return trade, mutation
+
 def create_trade(order, symbol: str, capital: float, position_size_usd: float, 
                  leverage: float, commission: float, type: str, broker: str, 
                  market: str, strategy: str, timeframe: str, order_volume: float,
-                 sl: float, tp: float = None):
+                 sl: float, tp: float = None, entry_time: datetime = None):
     try:
-        entry_price = order.get('price')
-
-        # Create Trade instance
-        trade = Trade.objects.create(
-            transaction_broker_id=order.get('order'),
-            symbol=symbol,
-            entry_time=datetime.now(),  # Modify as needed based on actual data
-            entry_price=entry_price,
-            type=type.upper(),  # Ensure matching choices
-            position_size_usd=position_size_usd,  # Example calculation
-            capital=capital,  # Set appropriately
-            leverage=leverage,  # Adjust based on your data
-            order_volume=order_volume,
-            order_commission=commission,
-            break_even_price=get_price_at_pnl(0, entry_price, position_size_usd, leverage, type, commission)[0],
-            liquidity_price=get_price_at_pnl(-capital, entry_price, position_size_usd, leverage, type, commission)[0],
-            broker=broker,
-            market_type=market,
-            strategy=strategy,
-            timeframe=timeframe,
-        )
-
-        # Create TradeClosePricesMutation instance
-        mutation = TradeClosePricesMutation.objects.create(
-            trade=trade,
-            mutation_price=entry_price,  # Example: using SL price
-            new_tp_price=tp if tp else None,
-            new_sl_price=sl,
-            pnl_at_new_tp_price=get_pnl_at_price(tp, entry_price, position_size_usd, leverage, type, commission)[0] if tp else None,
-            pnl_at_new_sl_price=get_pnl_at_price(sl, entry_price, position_size_usd, leverage, type, commission)[0],
-        )
+        trade, mutation = build_trade(order, symbol, capital, position_size_usd, leverage, commission, type,
+                                      broker, market, strategy, timeframe, order_volume, sl, tp, entry_time)
+        trade.save()
+        mutation.save()
+
+        record_opened_trade(trade)
 
         logger.info({'trade': trade, 'mutation': mutation})
 
@@ -0,0 +1,163 @@
+import logging
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest, Least
+from prometheus_client import Gauge
+
+from app.nexus.models import AccountSnapshot
+from app.utils.api.data import account_info
+from app.utils.api.positions import get_positions
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {'1m': 60, '1h': 3600, '1d': 86400}
+
+# (source, target) pairs, finest first
+ROLLUPS = [('1m', '1h'), ('1h', '1d')]
+
+ACCOUNT_USD = Gauge(
+    'quant_account_usd',
+    'Latest account sample of the equity recorder.',
+    ['field'],
+    multiprocess_mode='livemostrecent',
+)
+GAUGE_FIELDS = ['balance', 'equity', 'margin', 'margin_free', 'floating_pnl']
+
+SNAPSHOT_FIELDS = ['balance', 'equity', 'equity_low', 'equity_high', 'margin', 'margin_free',
+                   'margin_level', 'floating_pnl', 'open_positions', 'samples']
+
+
+def bucket_start(value: datetime, resolution: str) -> datetime:
+    seconds = RESOLUTIONS[resolution]
+    timestamp = int(value.timestamp()) // seconds * seconds
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def record_account_snapshot(now: Optional[datetime] = None) -> Optional[Dict]:
+    """
+    Sample account_info and the open positions into the current 1m row.
+
+    Several samples in the same minute keep the last values and widen the
+    equity range.
+    """
+    now = now or datetime.now(timezone.utc)
+    info = account_info()
+    if info is None or info.empty:
+        logger.error("Could not fetch account info for the equity recorder")
+        return None
+    info = info.iloc[0]
+    positions = get_positions()
+
+    equity = float(info['equity'])
+    sample = {
+        'balance': float(info['balance']),
+        'equity': equity,
+        'margin': float(info['margin']),
+        'margin_free': float(info['margin_free']),
+        # MT5 reports a margin level of 0 without open positions
+        'margin_level': float(info['margin_level']) if info.get('margin_level') else None,
+        'floating_pnl': float(positions['profit'].sum()) if not positions.empty else 0.0,
+        'open_positions': len(positions),
+    }
+    time = bucket_start(now, '1m')
+    for field in GAUGE_FIELDS:
+        ACCOUNT_USD.labels(field).set(sample[field])
+
+    try:
+        with transaction.atomic():
+            updated = AccountSnapshot.objects.filter(resolution='1m', time=time).update(
+                equity_low=Least(F('equity_low'), Value(equity)),
+                equity_high=Greatest(F('equity_high'), Value(equity)),
+                samples=F('samples') + 1,
+                **sample,
+            )
+            if not updated:
+                AccountSnapshot.objects.create(resolution='1m', time=time, equity_low=equity, equity_high=equity,
+                                               samples=1, **sample)
+    except IntegrityError:
+        # Another worker created the row first; the next sample lands in it
+        logger.warning(f"Account snapshot for {time} recorded concurrently, sample skipped")
+    except Exception as e:
+        logger.error(f"Error recording account snapshot: {e}\n{traceback.format_exc()}")
+        return None
+    return dict(sample, time=time)
+
+
+def _rollup_rows(rows: List[AccountSnapshot]) -> Dict:
+    last = rows[-1]
+    return {
+        'balance': last.balance,
+        'equity': last.equity,
+        'equity_low': min(row.equity_low for row in rows),
+        'equity_high': max(row.equity_high for row in rows),
+        'margin': last.margin,
+        'margin_free': last.margin_free,
+        'margin_level': last.margin_level,
+        'floating_pnl': last.floating_pnl,
+        'open_positions': last.open_positions,
+        'samples': sum(row.samples for row in rows),
+    }
+
+
+def rollup(source: str, target: str, now: Optional[datetime] = None) -> int:
+    """
+    Aggregate source rows into target rows for every bucket that has ended
+    since the last target row. Returns the number of target rows written.
+    """
+    now = now or datetime.now(timezone.utc)
+    end = bucket_start(now, target)
+    # The latest target bucket is recomputed, in case source rows arrived late
+    last = AccountSnapshot.objects.filter(resolution=target).order_by('-time').values_list('time', flat=True).first()
+
+    rows = AccountSnapshot.objects.filter(resolution=source, time__lt=end)
+    if last is not None:
+        rows = rows.filter(time__gte=last)
+
+    buckets: Dict[datetime, List[AccountSnapshot]] = {}
+    for row in rows.order_by('time'):
+        buckets.setdefault(bucket_start(row.time, target), []).append(row)
+
+    with transaction.atomic():
+        for time, bucket_rows in buckets.items():
+            AccountSnapshot.objects.update_or_create(resolution=target, time=time, defaults=_rollup_rows(bucket_rows))
+    return len(buckets)
+
+
+def prune(now: Optional[datetime] = None) -> int:
+    """Delete rows older than their resolution's retention (EQUITY_RETENTION_DAYS)."""
+    now = now or datetime.now(timezone.utc)
+    retention = getattr(settings, 'EQUITY_RETENTION_DAYS', {'1m': 7, '1h': 365})
+    deleted = 0
+    for resolution, days in retention.items():
+        count, _ = AccountSnapshot.objects.filter(resolution=resolution, time__lt=now - timedelta(days=days)).delete()
+        deleted += count
+    return deleted
+
+
+def rollup_account_snapshots(now: Optional[datetime] = None) -> Dict[str, int]:
+    written = {target: rollup(source, target, now) for source, target in ROLLUPS}
+    written['pruned'] = prune(now)
+    return written
+
+
+def pick_resolution(start: datetime, end: datetime, max_points: int = 2000) -> str:
+    """The finest resolution that covers start to end in at most max_points rows."""
+    span = (end - start).total_seconds()
+    for resolution, seconds in RESOLUTIONS.items():
+        if span / seconds <= max_points:
+            return resolution
+    return '1d'
+
+
+def equity_curve(start: datetime, end: datetime, resolution: Optional[str] = None) -> List[Dict]:
+    """Account rows between start and end (inclusive), oldest first."""
+    resolution = resolution or pick_resolution(start, end)
+    return list(AccountSnapshot.objects
+                .filter(resolution=resolution, time__gte=start, time__lte=end)
+                .order_by('time')
+                .values('time', *SNAPSHOT_FIELDS))
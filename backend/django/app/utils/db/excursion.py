@@ -0,0 +1,141 @@
+import time
+import logging
+import threading
+import traceback
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from app.nexus.models import Trade
+
+logger = logging.getLogger(__name__)
+
+# Positions without a Trade row yet (the outbox has not stored them) are looked up again after this
+MISSING_RETRY_SECONDS = 30.0
+
+
+class _Excursion:
+    __slots__ = ('trade_id', 'max_drawdown', 'max_profit', 'saved_drawdown', 'saved_profit')
+
+    def __init__(self, trade_id: int, max_drawdown: Optional[float], max_profit: Optional[float]):
+        self.trade_id = trade_id
+        # An open trade starts at zero floating PnL
+        self.max_drawdown = min(max_drawdown or 0.0, 0.0)
+        self.max_profit = max(max_profit or 0.0, 0.0)
+        self.saved_drawdown = max_drawdown
+        self.saved_profit = max_profit
+
+    def observe(self, pnl: float):
+        if pnl < self.max_drawdown:
+            self.max_drawdown = pnl
+        if pnl > self.max_profit:
+            self.max_profit = pnl
+
+    def dirty(self, threshold: float) -> bool:
+        def moved(saved, current):
+            return saved is None or abs(current - saved) > threshold
+        return moved(self.saved_drawdown, self.max_drawdown) or moved(self.saved_profit, self.max_profit)
+
+
+class ExcursionTracker:
+    """
+    Running max_drawdown (lowest floating PnL, MAE) and max_profit (highest
+    floating PnL, MFE) of every open trade, in USD.
+
+    The close and trailing cycles feed it their positions each run. Extremes
+    are kept in memory and written back in one bulk UPDATE per flush(), and
+    only for trades whose extremes moved more than threshold since they were
+    last written. The UPDATE keeps the more extreme of the stored and the new
+    value, so processes tracking the same trade never overwrite each other.
+    On close, finalize() folds in the realized PnL and hands the final values
+    to close_trade.
+    """
+
+    def __init__(self, threshold: float = 1.0):
+        self.threshold = threshold
+        self._trades: Dict[str, _Excursion] = {}
+        self._missing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, tickets):
+        """Start tracking trades from their stored extremes, so restarts lose nothing."""
+        rows = (Trade.objects
+                .filter(transaction_broker_id__in=list(tickets), close_time__isnull=True)
+                .values_list('transaction_broker_id', 'id', 'max_drawdown', 'max_profit'))
+        now = time.monotonic()
+        self._missing.update(dict.fromkeys(tickets, now))
+        for ticket, trade_id, max_drawdown, max_profit in rows:
+            self._trades[ticket] = _Excursion(trade_id, max_drawdown, max_profit)
+            del self._missing[ticket]
+
+    def observe(self, positions):
+        """Update the extremes from a positions DataFrame (ticket, profit)."""
+        if positions.empty:
+            return
+        observed = [(str(ticket), float(profit))
+                    for ticket, profit in zip(positions['ticket'], positions['profit']) if profit is not None]
+        with self._lock:
+            now = time.monotonic()
+            unknown = {ticket for ticket, _ in observed if ticket not in self._trades
+                       and now - self._missing.get(ticket, float('-inf')) >= MISSING_RETRY_SECONDS}
+            if unknown:
+                self._load(unknown)
+            for ticket, pnl in observed:
+                excursion = self._trades.get(ticket)
+                if excursion is not None:
+                    excursion.observe(pnl)
+
+    def _write(self, dirty) -> int:
+        trades = [
+            Trade(
+                id=excursion.trade_id,
+                max_drawdown=Least(Coalesce(F('max_drawdown'), Value(excursion.max_drawdown)),
+                                   Value(excursion.max_drawdown)),
+                max_profit=Greatest(Coalesce(F('max_profit'), Value(excursion.max_profit)),
+                                    Value(excursion.max_profit)),
+            )
+            for excursion in dirty
+        ]
+        try:
+            Trade.objects.bulk_update(trades, ['max_drawdown', 'max_profit'])
+        except Exception as e:
+            logger.error(f"Error saving trade excursions: {e}\n{traceback.format_exc()}")
+            return 0
+        for excursion in dirty:
+            excursion.saved_drawdown = excursion.max_drawdown
+            excursion.saved_profit = excursion.max_profit
+        return len(dirty)
+
+    def flush(self) -> int:
+        """Persist the extremes that moved beyond the threshold. Returns the number of trades written."""
+        with self._lock:
+            dirty = [excursion for excursion in self._trades.values() if excursion.dirty(self.threshold)]
+            return self._write(dirty) if dirty else 0
+
+    def finalize(self, ticket, pnl: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """Stop tracking a closed trade and return its (max_drawdown, max_profit), None if untracked."""
+        with self._lock:
+            excursion = self._trades.pop(str(ticket), None)
+        if excursion is None:
+            return None
+        if pnl is not None:
+            excursion.observe(pnl)
+        return excursion.max_drawdown, excursion.max_profit
+
+    def forget(self, open_tickets: Iterable):
+        """Stop tracking trades that are no longer open, saving whatever moved since the last flush."""
+        open_tickets = {str(ticket) for ticket in open_tickets}
+        with self._lock:
+            gone = [ticket for ticket in self._trades if ticket not in open_tickets]
+            dirty = [self._trades[ticket] for ticket in gone if self._trades[ticket].dirty(0.0)]
+            if dirty:
+                self._write(dirty)
+            for ticket in gone:
+                del self._trades[ticket]
+            for ticket in [ticket for ticket in self._missing if ticket not in open_tickets]:
+                del self._missing[ticket]
+
+
+excursions = ExcursionTracker(getattr(settings, 'EXCURSION_PERSIST_THRESHOLD', 1.0))
@@ -0,0 +1,158 @@
+import csv
+import logging
+from typing import Iterable, Iterator, List, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.nexus.models import Trade, TradeClosePricesMutation
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10000
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+ARROW_TYPES = {
+    'BigAutoField': pa.int64(),
+    'ForeignKey': pa.int64(),
+    'IntegerField': pa.int64(),
+    'FloatField': pa.float64(),
+    'CharField': pa.string(),
+    'DateField': pa.date32(),
+    'DateTimeField': pa.timestamp('us', tz='UTC'),
+}
+
+
+def export_columns(model) -> List[str]:
+    """Column names of a model, foreign keys as their raw <name>_id."""
+    return [field.attname for field in model._meta.concrete_fields]
+
+
+def export_schema(model) -> pa.Schema:
+    return pa.schema([(field.attname, ARROW_TYPES[field.get_internal_type()])
+                      for field in model._meta.concrete_fields])
+
+
+def export_queryset(table: str, trades):
+    """Rows of table ('trades' or 'mutations') for the given Trade queryset, in a stable order."""
+    if table == 'trades':
+        return Trade, trades.order_by('id')
+    if table == 'mutations':
+        return TradeClosePricesMutation, (TradeClosePricesMutation.objects
+                                          .filter(trade__in=trades.values('id'))
+                                          .order_by('trade_id', 'mutation_time', 'id'))
+    raise ValueError(f"Invalid table: {table}. Valid options are: trades, mutations")
+
+
+def _chunks(queryset, columns: List[str]) -> Iterator[List[Tuple]]:
+    # values_list skips model instances, and iterator(chunk_size) reads
+    # through a server-side cursor on PostgreSQL
+    chunk = []
+    for row in queryset.values_list(*columns).iterator(chunk_size=CHUNK_SIZE):
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Sink:
+    """Write-only file that hands over what was written since the last drain."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+class _TextSink:
+    """Text view of a _Sink, for csv.writer."""
+
+    def __init__(self, sink: _Sink):
+        self.sink = sink
+
+    def write(self, text: str):
+        return self.sink.write(text.encode())
+
+
+def csv_stream(queryset, columns: List[str]) -> Iterable[bytes]:
+    sink = _Sink()
+    writer = csv.writer(_TextSink(sink))
+    writer.writerow(columns)
+    for chunk in _chunks(queryset, columns):
+        writer.writerows(chunk)
+        yield sink.drain()
+    yield sink.drain()
+
+
+def _record_batch(chunk: List[Tuple], schema: pa.Schema) -> pa.RecordBatch:
+    columns = list(zip(*chunk))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema)
+
+
+def parquet_stream(queryset, model) -> Iterable[bytes]:
+    """One Parquet row group per chunk, sent as soon as it is written; the footer comes last."""
+    schema = export_schema(model)
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for chunk in _chunks(queryset, schema.names):
+            writer.write_batch(_record_batch(chunk, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def arrow_stream(queryset, model) -> Iterable[bytes]:
+    """Arrow IPC stream format, one record batch per chunk."""
+    schema = export_schema(model)
+    sink = _Sink()
+    writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for chunk in _chunks(queryset, schema.names):
+            writer.write_batch(_record_batch(chunk, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_stream(file_format: str, table: str, trades) -> Iterable[bytes]:
+    """Stream table for the given Trade queryset as csv, parquet or arrow."""
+    model, queryset = export_queryset(table, trades)
+    logger.info(f"Exporting {table} as {file_format}")
+    if file_format == 'csv':
+        return csv_stream(queryset, export_columns(model))
+    if file_format == 'parquet':
+        return parquet_stream(queryset, model)
+    if file_format == 'arrow':
+        return arrow_stream(queryset, model)
+    raise ValueError(f"Invalid format: {file_format}. Valid options are: {', '.join(CONTENT_TYPES)}")
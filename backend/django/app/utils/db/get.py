@@ -13,7 +13,7 @@ def get_trade_with_mutations(ticket: int) -> Optional[Dict[str, Any]]:
             logger.error(f"No trade found with ticket {ticket}")
             return None
 
-        mutations = TradeClosePricesMutation.objects.filter(trade=trade)
+        mutations = TradeClosePricesMutation.objects.filter(trade=trade).order_by('mutation_time', 'id')
         # Convert queryset to list if you need to serialize it
         mutations_list = list(mutations.values())
         
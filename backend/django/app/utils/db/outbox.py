@@ -0,0 +1,188 @@
+import json
+import logging
+import threading
+import traceback
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import redis
+from redis.exceptions import LockError
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, transaction
+
+from app.nexus.models import Trade, TradeClosePricesMutation
+from app.utils.db.create import build_trade, create_trade
+from app.utils.db.stats import record_opened_trade
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_KEY = 'outbox:trades'
+LOCK_TIMEOUT = 60
+
+
+class TradeOutbox:
+    """
+    Executed orders waiting to be persisted as Trades, kept in a Redis list.
+
+    The entry cycles call enqueue() right after an order fills, which is a
+    single RPUSH, so a slow database never delays the next order. drain(),
+    run by a beat task, persists the queued orders in batches: Trades and
+    their initial mutations with one bulk INSERT each. Orders are keyed by
+    broker ticket, so one that is delivered twice is stored once. When a
+    batch fails its orders are stored one by one, and those that still fail
+    move to the dead letter list (key + ':dead'), kept for inspection instead
+    of blocking the ones behind them.
+
+    Without a Redis URL, or when Redis fails, enqueue() falls back to
+    create_trade in the calling process.
+    """
+
+    def __init__(self, url: Optional[str], batch_size: int = 100, key: str = OUTBOX_KEY):
+        self.url = url
+        self.batch_size = batch_size
+        self.key = key
+        self.lock_key = f'{key}:lock'
+        self.dead_letter_key = f'{key}:dead'
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = redis.Redis.from_url(self.url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        return self._client
+
+    def enqueue(self, order, symbol: str, capital: float, position_size_usd: float,
+                leverage: float, commission: float, type: str, broker: str,
+                market: str, strategy: str, timeframe: str, order_volume: float,
+                sl: float, tp: float = None):
+        """Queue an executed order; same arguments as create_trade."""
+        entry = {
+            'order': {'order': order.get('order'), 'price': order.get('price')},
+            'symbol': symbol, 'capital': capital, 'position_size_usd': position_size_usd,
+            'leverage': leverage, 'commission': commission, 'type': type, 'broker': broker,
+            # Stored as create_trade stores it, e.g. 'MT5Timeframe.H1'
+            'market': market, 'strategy': strategy, 'timeframe': str(timeframe), 'order_volume': order_volume,
+            'sl': sl, 'tp': tp,
+            # The fill time, not the time the writer gets to it
+            'entry_time': datetime.now(timezone.utc).isoformat(),
+        }
+        if self.enabled:
+            try:
+                self.client().rpush(self.key, json.dumps(entry, default=float))
+                return
+            except (TypeError, ValueError) as e:
+                logger.error(f"Could not queue order {entry['order']['order']}, persisting it directly: {e}")
+            except redis.RedisError as e:
+                logger.warning(f"Trade outbox unavailable, persisting order {entry['order']['order']} directly: {e}")
+        create_trade(**self._arguments(entry))
+
+    @staticmethod
+    def _arguments(entry: Dict) -> Dict:
+        return dict(entry, entry_time=datetime.fromisoformat(entry['entry_time']))
+
+    def _persist(self, entries: List[Dict]) -> int:
+        """Store a batch of queued orders, skipping tickets already stored. Returns the number of new trades."""
+        tickets = {str(entry['order']['order']) for entry in entries}
+        stored = set(Trade.objects.filter(transaction_broker_id__in=tickets)
+                     .values_list('transaction_broker_id', flat=True))
+
+        pairs = []
+        for entry in entries:
+            ticket = str(entry['order']['order'])
+            if ticket in stored:
+                continue
+            stored.add(ticket)
+            pairs.append(build_trade(**self._arguments(entry)))
+        if not pairs:
+            return 0
+
+        with transaction.atomic():
+            trades = Trade.objects.bulk_create([trade for trade, _ in pairs])
+            TradeClosePricesMutation.objects.bulk_create([mutation for _, mutation in pairs])
+            for trade in trades:
+                record_opened_trade(trade)
+        return len(trades)
+
+    def _persist_each(self, entries: List[Tuple[bytes, Dict]]) -> Tuple[int, List[bytes]]:
+        """Store a failed batch one order at a time. Returns the number of new trades and the raw entries that failed."""
+        created, failed = 0, []
+        for item, entry in entries:
+            try:
+                created += self._persist([entry])
+            except (OperationalError, InterfaceError):
+                # The database is down, not the entry at fault; the batch stays queued
+                raise
+            except Exception as e:
+                logger.error(f"Moving trade outbox entry to {self.dead_letter_key}: {item!r}: {e}\n{traceback.format_exc()}")
+                failed.append(item)
+        return created, failed
+
+    def drain(self) -> int:
+        """Persist everything queued so far. Returns the number of trades created."""
+        if not self.enabled:
+            return 0
+        client = self.client()
+        # One writer at a time, so a batch is never stored twice concurrently
+        lock = client.lock(self.lock_key, timeout=LOCK_TIMEOUT)
+        if not lock.acquire(blocking=False):
+            return 0
+
+        created = 0
+        try:
+            while True:
+                # Restarts the lock timeout, and raises if another writer took the lock over
+                lock.reacquire()
+                raw = client.lrange(self.key, 0, self.batch_size - 1)
+                if not raw:
+                    break
+                entries, dead = [], []
+                for item in raw:
+                    try:
+                        entries.append((item, json.loads(item)))
+                    except ValueError:
+                        logger.error(f"Moving malformed trade outbox entry to {self.dead_letter_key}: {item!r}")
+                        dead.append(item)
+                try:
+                    created += self._persist([entry for _, entry in entries])
+                except Exception as e:
+                    logger.warning(f"Trade outbox batch failed, storing its {len(entries)} entries one by one: {e}")
+                    batch_created, failed = self._persist_each(entries)
+                    created += batch_created
+                    dead.extend(failed)
+
+                # Removed only once stored. Should the trim fail, the next run skips the stored tickets;
+                # without the lock, the writer that holds it now trims them instead
+                lock.reacquire()
+                pipeline = client.pipeline()
+                if dead:
+                    pipeline.rpush(self.dead_letter_key, *dead)
+                pipeline.ltrim(self.key, len(raw), -1)
+                pipeline.execute()
+        except LockError:
+            logger.warning("Lost the trade outbox lock, leaving the rest to the writer that holds it")
+        except Exception as e:
+            logger.error(f"Error draining trade outbox: {e}\n{traceback.format_exc()}")
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                pass
+        return created
+
+    def pending(self) -> int:
+        return self.client().llen(self.key) if self.enabled else 0
+
+    def dead_letters(self) -> int:
+        return self.client().llen(self.dead_letter_key) if self.enabled else 0
+
+
+trade_outbox = TradeOutbox(
+    getattr(settings, 'TRADE_OUTBOX_URL', None),
+    batch_size=getattr(settings, 'TRADE_OUTBOX_BATCH_SIZE', 100),
+)
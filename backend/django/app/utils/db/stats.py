@@ -0,0 +1,196 @@
+import logging
+import traceback
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+
+from app.nexus.models import Trade, TradeClosePricesMutation, TradeDailySummary
+
+logger = logging.getLogger(__name__)
+
+GROUP_FIELDS = ['strategy', 'symbol', 'day']
+
+SUMMARY_SUMS = [
+    'trades_opened', 'position_size_opened_usd', 'trades_closed', 'wins', 'losses', 'pnl',
+    'pnl_excluding_commission', 'gross_profit', 'gross_loss', 'commission', 'r_multiple_sum', 'r_multiple_count',
+]
+
+
+def _day(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _increment(day: date, strategy: str, symbol: str, **deltas):
+    """Add deltas to one summary row, creating it on first use."""
+    summary, _ = TradeDailySummary.objects.get_or_create(day=day, strategy=strategy, symbol=symbol)
+    TradeDailySummary.objects.filter(pk=summary.pk).update(
+        **{field: F(field) + delta for field, delta in deltas.items() if delta}
+    )
+
+
+def _initial_sl_pnl(trade):
+    """The PnL at the stop loss set when the trade was opened (its first mutation)."""
+    return (TradeClosePricesMutation.objects
+            .filter(trade=trade)
+            .order_by('mutation_time', 'id')
+            .values('pnl_at_new_sl_price')[:1])
+
+
+def _closed_deltas(trade: Trade, initial_sl_pnl: Optional[float]) -> Dict:
+    pnl = trade.pnl or 0.0
+    deltas = {
+        'trades_closed': 1,
+        'wins': 1 if pnl > 0 else 0,
+        'losses': 1 if pnl < 0 else 0,
+        'pnl': pnl,
+        'pnl_excluding_commission': trade.pnl_excluding_commission or 0.0,
+        'gross_profit': pnl if pnl > 0 else 0.0,
+        'gross_loss': -pnl if pnl < 0 else 0.0,
+        'commission': trade.order_commission or 0.0,
+    }
+    if initial_sl_pnl:
+        deltas['r_multiple_sum'] = pnl / abs(initial_sl_pnl)
+        deltas['r_multiple_count'] = 1
+    return deltas
+
+
+def record_opened_trade(trade: Trade):
+    """Count a newly created trade in its entry day's summary."""
+    try:
+        # A savepoint, so a failure here never breaks the caller's transaction
+        with transaction.atomic():
+            _increment(_day(trade.entry_time), trade.strategy, trade.symbol,
+                       trades_opened=1, position_size_opened_usd=trade.position_size_usd or 0.0)
+    except Exception as e:
+        logger.error(f"Error updating trade summary for opened trade {trade.id}: {e}\n{traceback.format_exc()}")
+
+
+def record_closed_trade(trade: Trade):
+    """Fold a just-closed trade into its close day's summary."""
+    try:
+        with transaction.atomic():
+            initial_sl_pnl = _initial_sl_pnl(trade).values_list('pnl_at_new_sl_price', flat=True).first()
+            _increment(_day(trade.close_time), trade.strategy, trade.symbol, **_closed_deltas(trade, initial_sl_pnl))
+    except Exception as e:
+        logger.error(f"Error updating trade summary for closed trade {trade.id}: {e}\n{traceback.format_exc()}")
+
+
+def rebuild_trade_stats(batch_size: int = 5000) -> int:
+    """Recompute every summary row from the Trade table. Returns the number of rows."""
+    rows = {}
+
+    def row(day, strategy, symbol):
+        key = (day, strategy, symbol)
+        if key not in rows:
+            rows[key] = {field: 0 for field in SUMMARY_SUMS}
+        return rows[key]
+
+    trades = Trade.objects.annotate(initial_sl_pnl=Subquery(_initial_sl_pnl(OuterRef('pk')))).order_by('id')
+    for trade in trades.iterator(chunk_size=batch_size):
+        opened = row(_day(trade.entry_time), trade.strategy, trade.symbol)
+        opened['trades_opened'] += 1
+        opened['position_size_opened_usd'] += trade.position_size_usd or 0.0
+        if trade.close_time is not None:
+            closed = row(_day(trade.close_time), trade.strategy, trade.symbol)
+            for field, delta in _closed_deltas(trade, trade.initial_sl_pnl).items():
+                closed[field] += delta
+
+    with transaction.atomic():
+        TradeDailySummary.objects.all().delete()
+        TradeDailySummary.objects.bulk_create(
+            [TradeDailySummary(day=day, strategy=strategy, symbol=symbol, **values)
+             for (day, strategy, symbol), values in rows.items()],
+            batch_size=batch_size,
+        )
+    return len(rows)
+
+
+# --- Queries ---
+
+def _summaries(strategy: Optional[str] = None, symbol: Optional[str] = None,
+               date_from: Optional[date] = None, date_to: Optional[date] = None):
+    queryset = TradeDailySummary.objects.all()
+    if strategy:
+        queryset = queryset.filter(strategy=strategy)
+    if symbol:
+        queryset = queryset.filter(symbol=symbol)
+    if date_from:
+        queryset = queryset.filter(day__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(day__lte=date_to)
+    return queryset
+
+
+def _ratios(row: Dict) -> Dict:
+    decided = row['wins'] + row['losses']
+    row['win_rate'] = row['wins'] / decided if decided else None
+    row['profit_factor'] = row['gross_profit'] / row['gross_loss'] if row['gross_loss'] else None
+    row['average_r'] = row['r_multiple_sum'] / row['r_multiple_count'] if row['r_multiple_count'] else None
+    row['average_pnl'] = row['pnl'] / row['trades_closed'] if row['trades_closed'] else None
+    return row
+
+
+def trade_stats(group_by: List[str], **filters) -> List[Dict]:
+    """Totals and ratios over the summary table, grouped by any of day, strategy and symbol."""
+    # Annotations may not reuse the model's field names
+    sums = {f'total_{field}': Sum(field) for field in SUMMARY_SUMS}
+    queryset = _summaries(**filters)
+    if group_by:
+        rows = queryset.values(*group_by).annotate(**sums).order_by(*group_by)
+    else:
+        rows = [queryset.aggregate(**sums)]
+
+    results = []
+    for row in rows:
+        result = {field: row[field] for field in group_by}
+        result.update({field: row[f'total_{field}'] or 0 for field in SUMMARY_SUMS})
+        results.append(_ratios(result))
+    return results
+
+
+def drawdown(**filters) -> Dict:
+    """Peak-to-trough drawdown of cumulative realized PnL, walked day by day."""
+    daily = _summaries(**filters).values('day').annotate(day_pnl=Sum('pnl')).order_by('day')
+
+    # Equity starts at zero, so a losing first day is already a drawdown
+    equity = peak = max_drawdown = 0.0
+    peak_day = trough_day = max_peak_day = None
+    for row in daily:
+        equity += row['day_pnl']
+        if equity > peak:
+            peak, peak_day = equity, row['day']
+        if peak - equity > max_drawdown:
+            max_drawdown = peak - equity
+            max_peak_day, trough_day = peak_day, row['day']
+
+    return {
+        'realized_pnl': equity,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_peak_day': max_peak_day,
+        'max_drawdown_trough_day': trough_day,
+        'current_drawdown': peak - equity,
+    }
+
+
+def exposure(strategy: Optional[str] = None, symbol: Optional[str] = None) -> List[Dict]:
+    """Open position size and net direction per strategy and symbol."""
+    queryset = Trade.objects.filter(close_time__isnull=True)
+    if strategy:
+        queryset = queryset.filter(strategy=strategy)
+    if symbol:
+        queryset = queryset.filter(symbol=symbol)
+    rows = (queryset
+            .values('strategy', 'symbol')
+            .annotate(
+                open_trades=Count('id'),
+                open_position_size_usd=Sum('position_size_usd'),
+                long_usd=Sum('position_size_usd', filter=Q(type='BUY')),
+                short_usd=Sum('position_size_usd', filter=Q(type='SELL')),
+                open_capital=Sum('capital'),
+            )
+            .order_by('strategy', 'symbol'))
+    return [dict(row, net_usd=(row['long_usd'] or 0.0) - (row['short_usd'] or 0.0)) for row in rows]
@@ -0,0 +1,212 @@
+import json
+import time
+import struct
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import redis
+from django.conf import settings
+from prometheus_client import Counter
+
+from app.utils.constants import MT5Timeframe
+from app.quant.indicators.trend import get_enhanced_swing_points
+from app.quant.indicators.mean_reversion import mean_reversion
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'indicators:'
+LRU_KEY = f'{PREFIX}lru'
+
+# How long a worker waits for another one computing the same entry
+LOCK_TIMEOUT = 10.0
+WAIT_TIMEOUT = 2.0
+WAIT_INTERVAL = 0.05
+
+CACHE_REQUESTS = Counter(
+    'quant_indicator_cache_requests_total',
+    'Indicator cache lookups by result.',
+    ['indicator', 'result'],
+)
+
+_U32 = struct.Struct('<I')
+
+SIGNAL_CODES = {0: 0, 'top': 1, 'bottom': -1}
+SIGNAL_VALUES = {code: value for value, code in SIGNAL_CODES.items()}
+
+
+def encode_arrays(arrays: Dict[str, np.ndarray]) -> bytes:
+    """u32 header_length | JSON header {name: [dtype, length]} | array buffers in header order."""
+    header = {name: [array.dtype.str, len(array)] for name, array in arrays.items()}
+    header_bytes = json.dumps(header).encode()
+    buffers = [np.ascontiguousarray(array).tobytes() for array in arrays.values()]
+    return b''.join([_U32.pack(len(header_bytes)), header_bytes] + buffers)
+
+
+def decode_arrays(data: bytes) -> Dict[str, np.ndarray]:
+    (header_length,) = _U32.unpack_from(data, 0)
+    offset = _U32.size + header_length
+    header = json.loads(data[_U32.size:offset])
+    arrays = {}
+    for name, (dtype_str, length) in header.items():
+        dtype = np.dtype(dtype_str)
+        arrays[name] = np.frombuffer(data, dtype=dtype, count=length, offset=offset)
+        offset += length * dtype.itemsize
+    return arrays
+
+
+def bars_fingerprint(rates: pd.DataFrame) -> str:
+    """
+    Identify a bar window by its length, last bar time and last bar values.
+
+    The last bar may still be forming, so its prices and volume are part of the
+    key: a closed bar hits the same entry across the pool, a forming one only
+    until its next tick.
+    """
+    last = rates.iloc[-1]
+    values = np.array([last[column] for column in ('open', 'high', 'low', 'close', 'tick_volume') if column in rates],
+                      dtype=np.float64)
+    digest = hashlib.blake2b(values.tobytes(), digest_size=8).hexdigest()
+    return f"{len(rates)}:{last['time']}:{digest}"
+
+
+class IndicatorCache:
+    """
+    Indicator results shared by every worker process, stored in Redis.
+
+    Entries are compact numpy arrays keyed by (symbol, timeframe, indicator,
+    params, bars). Recency is tracked in a sorted set and the least recently
+    used entries beyond max_entries are deleted, so the cache can live on the
+    Redis instance that also serves as Celery broker without a global
+    maxmemory eviction policy. When several workers miss on the same entry,
+    one computes it under a short lock while the others wait for its result.
+
+    Redis errors never fail a cycle: the indicator is computed locally instead.
+    """
+
+    def __init__(self, url: Optional[str], max_entries: int = 5000, ttl: int = 7 * 24 * 3600):
+        self.url = url
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = redis.Redis.from_url(self.url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        return self._client
+
+    @staticmethod
+    def key(symbol: str, timeframe: MT5Timeframe, indicator: str, params: Dict, rates: pd.DataFrame) -> str:
+        params_str = ','.join(f"{name}={params[name]}" for name in sorted(params))
+        return f"{PREFIX}{symbol}:{timeframe.value}:{indicator}:{params_str}:{bars_fingerprint(rates)}"
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        pipe = self.client().pipeline(transaction=False)
+        pipe.get(key)
+        pipe.zadd(LRU_KEY, {key: time.time()}, xx=True)
+        data, _ = pipe.execute()
+        return None if data is None else decode_arrays(data)
+
+    def set(self, key: str, arrays: Dict[str, np.ndarray]):
+        client = self.client()
+        pipe = client.pipeline(transaction=False)
+        pipe.set(key, encode_arrays(arrays), ex=self.ttl)
+        pipe.zadd(LRU_KEY, {key: time.time()})
+        pipe.zcard(LRU_KEY)
+        _, _, size = pipe.execute()
+
+        if size > self.max_entries:
+            evicted = [member for member, _ in client.zpopmin(LRU_KEY, size - self.max_entries)]
+            if evicted:
+                client.delete(*evicted)
+
+    def _wait_for(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            arrays = self.get(key)
+            if arrays is not None:
+                return arrays
+        return None
+
+    def get_or_compute(self, key: str, indicator: str,
+                       compute: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        if not self.enabled:
+            return compute()
+
+        try:
+            arrays = self.get(key)
+            if arrays is not None:
+                CACHE_REQUESTS.labels(indicator, 'hit').inc()
+                return arrays
+
+            lock_key = f"{key}:lock"
+            if not self.client().set(lock_key, 1, nx=True, px=int(LOCK_TIMEOUT * 1000)):
+                arrays = self._wait_for(key)
+                if arrays is not None:
+                    CACHE_REQUESTS.labels(indicator, 'hit').inc()
+                    return arrays
+
+            CACHE_REQUESTS.labels(indicator, 'miss').inc()
+            arrays = compute()
+            self.set(key, arrays)
+            self.client().delete(lock_key)
+            return arrays
+
+        except redis.RedisError as e:
+            CACHE_REQUESTS.labels(indicator, 'error').inc()
+            logger.warning(f"Indicator cache unavailable, computing {indicator} locally: {e}")
+            return compute()
+
+
+indicator_cache = IndicatorCache(
+    getattr(settings, 'INDICATOR_CACHE_URL', None),
+    max_entries=getattr(settings, 'INDICATOR_CACHE_MAX_ENTRIES', 5000),
+)
+
+
+# --- Cached indicators ---
+
+def swing_points(symbol: str, timeframe: MT5Timeframe, rates: pd.DataFrame):
+    """get_enhanced_swing_points through the cache, with the same return value."""
+    def compute():
+        highs, lows = get_enhanced_swing_points(rates)
+        # Prices stay float64 so cached and uncached decisions agree exactly
+        return {
+            'high_index': np.array([point['index'] for point in highs], dtype=np.int32),
+            'high_price': np.array([point['price'] for point in highs], dtype=np.float64),
+            'low_index': np.array([point['index'] for point in lows], dtype=np.int32),
+            'low_price': np.array([point['price'] for point in lows], dtype=np.float64),
+        }
+
+    if rates is None or rates.empty:
+        return [], []
+    key = IndicatorCache.key(symbol, timeframe, 'swing_points', {}, rates)
+    arrays = indicator_cache.get_or_compute(key, 'swing_points', compute)
+    highs = [{'index': int(i), 'price': price} for i, price in zip(arrays['high_index'], arrays['high_price'])]
+    lows = [{'index': int(i), 'price': price} for i, price in zip(arrays['low_index'], arrays['low_price'])]
+    return highs, lows
+
+
+def mean_reversion_signals(symbol: str, timeframe: MT5Timeframe, data: pd.DataFrame,
+                           window: int = 20, num_std_dev: float = 2) -> pd.Series:
+    """mean_reversion signals through the cache, stored as int8 codes."""
+    def compute():
+        signals = mean_reversion(data[['close']].copy(), window=window, num_std_dev=num_std_dev)
+        return {'signal': np.array([SIGNAL_CODES[value] for value in signals], dtype=np.int8)}
+
+    params = {'window': window, 'num_std_dev': num_std_dev}
+    key = IndicatorCache.key(symbol, timeframe, 'mean_reversion', params, data)
+    arrays = indicator_cache.get_or_compute(key, 'mean_reversion', compute)
+    return pd.Series([SIGNAL_VALUES[int(code)] for code in arrays['signal']], index=data.index,
+                     name='mean_reversion', dtype=object)
@@ -0,0 +1,210 @@
+import os
+import json
+import shutil
+import logging
+import contextvars
+from time import perf_counter
+from datetime import datetime
+from functools import wraps
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from prometheus_client import Histogram, Counter, CollectorRegistry, start_http_server, multiprocess
+
+from app.utils.constants import TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+PHASE_FETCH = 'fetch'
+PHASE_INDICATORS = 'indicators'
+PHASE_SIZING = 'sizing'
+PHASE_ORDER_SEND = 'order_send'
+PHASE_DB_WRITE = 'db_write'
+PHASE_DB_READ = 'db_read'
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PHASE_DURATION = Histogram(
+    'quant_cycle_phase_duration_seconds',
+    'Time spent in one phase of a strategy cycle.',
+    ['strategy', 'phase', 'symbol'],
+    buckets=LATENCY_BUCKETS,
+)
+
+CYCLE_DURATION = Histogram(
+    'quant_cycle_duration_seconds',
+    'Wall-clock time of a full strategy cycle.',
+    ['strategy'],
+    buckets=LATENCY_BUCKETS,
+)
+
+CYCLE_FAILURES = Counter(
+    'quant_cycle_failures_total',
+    'Strategy cycles that raised or recorded a failure with record_failure().',
+    ['strategy'],
+)
+
+_current_cycle = contextvars.ContextVar('quant_current_cycle', default=None)
+_trace_logger = None
+
+
+class CycleTrace:
+    """Spans collected while a single strategy cycle runs."""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.started_at = datetime.now(TIMEZONE)
+        self.spans = []
+        self.duration = None
+        self.failed = False
+
+    def add_span(self, phase, symbol, duration, error=None):
+        span = {'phase': phase, 'symbol': symbol, 'duration': round(duration, 6)}
+        if error is not None:
+            span['error'] = error
+        self.spans.append(span)
+
+    def as_dict(self):
+        return {
+            'strategy': self.strategy,
+            'started_at': self.started_at.isoformat(),
+            'duration': round(self.duration, 6) if self.duration is not None else None,
+            'spans': self.spans,
+            'failed': self.failed,
+        }
+
+
+def _get_trace_logger():
+    global _trace_logger
+    trace_file = getattr(settings, 'QUANT_CYCLE_TRACE_FILE', None)
+    if not trace_file:
+        return None
+
+    if _trace_logger is None:
+        trace_logger = logging.getLogger('quant.cycle_traces')
+        trace_logger.propagate = False
+        trace_logger.setLevel(logging.INFO)
+        handler = RotatingFileHandler(
+            trace_file,
+            maxBytes=getattr(settings, 'QUANT_CYCLE_TRACE_MAX_BYTES', 10 * 1024 * 1024),
+            backupCount=getattr(settings, 'QUANT_CYCLE_TRACE_BACKUP_COUNT', 5),
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        trace_logger.addHandler(handler)
+        _trace_logger = trace_logger
+
+    return _trace_logger
+
+
+@contextmanager
+def cycle(strategy):
+    """
+    Time a full strategy cycle and collect the spans recorded inside it.
+
+    Phases opened inside the block inherit the strategy label, and the collected
+    trace is appended to QUANT_CYCLE_TRACE_FILE when that setting is configured.
+    """
+    trace = CycleTrace(strategy)
+    token = _current_cycle.set(trace)
+    start = perf_counter()
+    try:
+        yield trace
+    except Exception:
+        trace.failed = True
+        raise
+    finally:
+        trace.duration = perf_counter() - start
+        _current_cycle.reset(token)
+        CYCLE_DURATION.labels(strategy=strategy).observe(trace.duration)
+        if trace.failed:
+            CYCLE_FAILURES.labels(strategy=strategy).inc()
+
+        trace_logger = _get_trace_logger()
+        if trace_logger is not None:
+            trace_logger.info(json.dumps(trace.as_dict()))
+
+
+def record_failure():
+    """
+    Mark the running cycle as failed, for errors the algorithm catches and logs
+    itself. A cycle counts once in quant_cycle_failures_total however many
+    failures it records.
+    """
+    trace = _current_cycle.get()
+    if trace is not None:
+        trace.failed = True
+
+
+@contextmanager
+def phase(name, symbol=None, strategy=None):
+    """
+    Time one phase of a cycle (fetch, indicators, sizing, order_send, db_write).
+
+    :param name: The phase name, one of the PHASE_* constants.
+    :param symbol: The symbol being processed, if the phase is symbol specific.
+    :param strategy: Overrides the strategy of the enclosing cycle.
+    """
+    trace = _current_cycle.get()
+    if strategy is None:
+        strategy = trace.strategy if trace is not None else 'none'
+
+    start = perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration = perf_counter() - start
+        PHASE_DURATION.labels(strategy=strategy, phase=name, symbol=symbol or 'all').observe(duration)
+        if trace is not None:
+            trace.add_span(name, symbol, duration, error)
+
+
+def instrumented(name, symbol_arg=None):
+    """
+    Decorator form of phase(). When symbol_arg is given, the symbol label is read
+    from that keyword argument (or the first positional argument).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            symbol = None
+            if symbol_arg is not None:
+                symbol = kwargs.get(symbol_arg, args[0] if args else None)
+            with phase(name, symbol=symbol):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_metrics_server():
+    """
+    Serve the metrics of every Celery pool process from the main worker process.
+
+    Pool processes write to PROMETHEUS_MULTIPROC_DIR; without it the server only
+    exposes the metrics of the process it runs in.
+    """
+    port = getattr(settings, 'QUANT_METRICS_PORT', None)
+    if not port:
+        return
+
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        # Stale files from a previous worker would be merged into the new counters.
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(int(port), registry=registry)
+    else:
+        start_http_server(int(port))
+
+    logger.info(f"Serving quant metrics on port {port}")
+
+
+def mark_process_dead(pid):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
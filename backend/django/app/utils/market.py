@@ -1,10 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from app.utils.constants import CRYPTOCURRENCIES, TIMEZONE
+from app.utils.constants import TIMEZONE
 from app.utils.api.data import fetch_data_pos, symbol_info_tick
+from app.utils.symbols import symbols
 
 def is_market_open(symbol):
-    if symbol in CRYPTOCURRENCIES:
+    if symbols.always_open(symbol):
         return True
     else:
         # Check whether the market is open, if it's a crypto then market doesn't close
@@ -15,7 +16,7 @@ def is_market_open(symbol):
             current_time = datetime.now(TIMEZONE)
             time_difference = current_time - tick_time
 
-            if time_difference > timedelta(minutes=5):
+            if time_difference > symbols.max_tick_age(symbol):
                 return False
             else:
                 return True
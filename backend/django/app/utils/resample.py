@@ -0,0 +1,327 @@
+"""
+Bar resampling: derive higher timeframes from M1 bars or ticks.
+
+Buckets follow MT5's server-time alignment: intraday and D1 bars start on
+multiples of their length, W1 bars on Sunday 00:00 and MN1 bars on the first
+of the month. session_offset shifts every boundary by that many seconds, for
+bars whose timestamps are not already in broker server time.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.utils.constants import MT5Timeframe
+from app.utils.api.data import fetch_data_pos
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_SECONDS = {
+    MT5Timeframe.M1: 60,
+    MT5Timeframe.M5: 5 * 60,
+    MT5Timeframe.M15: 15 * 60,
+    MT5Timeframe.M30: 30 * 60,
+    MT5Timeframe.H1: 60 * 60,
+    MT5Timeframe.H4: 4 * 60 * 60,
+    MT5Timeframe.D1: 24 * 60 * 60,
+    MT5Timeframe.W1: 7 * 24 * 60 * 60,
+}
+
+# 1970-01-01 was a Thursday; MT5 weeks start on Sunday
+_FIRST_SUNDAY = 3 * 24 * 60 * 60
+
+BAR_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume']
+
+
+def to_seconds(times) -> np.ndarray:
+    """Bar or tick times (Unix seconds, datetimes or ISO strings) as int64 seconds."""
+    times = pd.Series(times)
+    if pd.api.types.is_numeric_dtype(times):
+        return times.to_numpy(dtype=np.int64)
+    return pd.to_datetime(times).to_numpy().astype('datetime64[s]').astype(np.int64)
+
+
+def bucket_starts(times: np.ndarray, timeframe: MT5Timeframe, session_offset: int = 0) -> np.ndarray:
+    """The start (Unix seconds) of the timeframe bar each time falls in."""
+    shifted = times - session_offset
+    if timeframe == MT5Timeframe.MN1:
+        months = shifted.astype('datetime64[s]').astype('datetime64[M]')
+        return months.astype('datetime64[s]').astype(np.int64) + session_offset
+    period = TIMEFRAME_SECONDS[timeframe]
+    anchor = _FIRST_SUNDAY if timeframe == MT5Timeframe.W1 else 0
+    return times - (shifted - anchor) % period
+
+
+def _aggregate(buckets: np.ndarray, open_, high, low, close, tick_volume, spread, real_volume) -> pd.DataFrame:
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]]) if len(buckets) else np.empty(0, dtype=np.intp)
+    if not len(starts):
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    return pd.DataFrame({
+        'time': pd.to_datetime(buckets[starts], unit='s'),
+        'open': open_[starts],
+        'high': np.maximum.reduceat(high, starts),
+        'low': np.minimum.reduceat(low, starts),
+        'close': close[ends],
+        'tick_volume': np.add.reduceat(tick_volume, starts),
+        'spread': np.minimum.reduceat(spread, starts),
+        'real_volume': np.add.reduceat(real_volume, starts),
+    })
+
+
+def resample(bars: pd.DataFrame, timeframe: MT5Timeframe, session_offset: int = 0) -> pd.DataFrame:
+    """
+    Aggregate time-sorted bars of a lower timeframe into timeframe bars.
+
+    Open is the first open of a bucket, close the last close, high/low their
+    extremes, volumes are summed and spread is the bucket minimum as MT5
+    reports it.
+    """
+    if bars is None or bars.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    buckets = bucket_starts(to_seconds(bars['time']), timeframe, session_offset)
+
+    def column(name, dtype):
+        if name in bars:
+            return bars[name].to_numpy(dtype=dtype)
+        return np.zeros(len(bars), dtype=dtype)
+
+    return _aggregate(
+        buckets,
+        column('open', np.float64), column('high', np.float64), column('low', np.float64),
+        column('close', np.float64), column('tick_volume', np.int64), column('spread', np.int64),
+        column('real_volume', np.int64),
+    )
+
+
+def ticks_to_bars(ticks: pd.DataFrame, timeframe: MT5Timeframe, price: str = 'bid',
+                  point: Optional[float] = None, session_offset: int = 0) -> pd.DataFrame:
+    """
+    Build timeframe bars from time-sorted ticks (e.g. from the tick archive).
+
+    Bars are drawn on price ('bid' like MT5 does for forex, 'last' for
+    exchange symbols). Spread is filled in points when point is given.
+    """
+    if ticks is None or ticks.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    ticks = ticks[ticks[price] != 0]
+    buckets = bucket_starts(ticks['time_msc'].to_numpy(dtype=np.int64) // 1000, timeframe, session_offset)
+    prices = ticks[price].to_numpy(dtype=np.float64)
+
+    if point:
+        spread = np.round((ticks['ask'].to_numpy(dtype=np.float64) - ticks['bid'].to_numpy(dtype=np.float64)) / point)
+        spread = spread.astype(np.int64)
+    else:
+        spread = np.zeros(len(ticks), dtype=np.int64)
+
+    return _aggregate(
+        buckets, prices, prices, prices, prices,
+        np.ones(len(ticks), dtype=np.int64), spread,
+        ticks['volume'].to_numpy(dtype=np.int64),
+    )
+
+
+class IncrementalResampler:
+    """
+    Keeps higher-timeframe bars of one symbol current from a stream of M1 bars.
+
+    Completed bars come from seed() history or from M1 bars once their bucket
+    closes; the bar in progress is rebuilt from the buffered M1 bars of its
+    bucket on every read. Only M1 bars since the start of the oldest open
+    bucket are kept.
+    """
+
+    def __init__(self, timeframes: Iterable[MT5Timeframe], max_bars: int = 1000, session_offset: int = 0):
+        self.timeframes = [tf for tf in timeframes if tf != MT5Timeframe.M1]
+        self.max_bars = max_bars
+        self.session_offset = session_offset
+        self._history: Dict[MT5Timeframe, pd.DataFrame] = {tf: pd.DataFrame(columns=BAR_COLUMNS) for tf in self.timeframes}
+        self._m1 = pd.DataFrame(columns=BAR_COLUMNS)
+        self._m1_times = np.empty(0, dtype=np.int64)
+        # The buffer holds every M1 bar from this time on
+        self._covered_from = None
+
+    @property
+    def last_m1_time(self) -> Optional[int]:
+        return int(self._m1_times[-1]) if len(self._m1_times) else None
+
+    def open_bucket_start(self, time: int) -> int:
+        """The start of the oldest bucket still open at time, across all timeframes."""
+        times = np.array([time], dtype=np.int64)
+        return int(min(bucket_starts(times, tf, self.session_offset)[0] for tf in self.timeframes))
+
+    def seed(self, timeframe: MT5Timeframe, bars: pd.DataFrame):
+        """Load completed history for timeframe, e.g. straight from the terminal."""
+        bars = bars[BAR_COLUMNS].copy()
+        bars['time'] = pd.to_datetime(to_seconds(bars['time']), unit='s')
+        self._history[timeframe] = bars.tail(self.max_bars).reset_index(drop=True)
+
+    def update(self, m1_bars: pd.DataFrame, covered_from: Optional[int] = None):
+        """
+        Merge new M1 bars, the last of which may still be forming.
+
+        Buffered bars at or after the first new bar are replaced, so passing an
+        overlapping window on every poll is safe. covered_from is the time from
+        which m1_bars is known to be gap-free when the buffer starts empty; it
+        defaults to the first bar.
+        """
+        if m1_bars is None or m1_bars.empty:
+            return
+        m1_bars = m1_bars[BAR_COLUMNS].copy()
+        times = to_seconds(m1_bars['time'])
+        m1_bars['time'] = pd.to_datetime(times, unit='s')
+
+        if self._covered_from is None or times[0] < self._covered_from:
+            self._covered_from = int(times[0]) if covered_from is None else min(covered_from, int(times[0]))
+
+        keep = self._m1_times < times[0]
+        self._m1 = pd.concat([self._m1[keep], m1_bars], ignore_index=True)
+        self._m1_times = np.concatenate([self._m1_times[keep], times])
+
+        for timeframe in self.timeframes:
+            self._close_buckets(timeframe)
+
+        start = self.open_bucket_start(self.last_m1_time)
+        keep = self._m1_times >= start
+        self._m1 = self._m1[keep].reset_index(drop=True)
+        self._m1_times = self._m1_times[keep]
+        self._covered_from = max(self._covered_from, start)
+
+    def _close_buckets(self, timeframe: MT5Timeframe):
+        buckets = bucket_starts(self._m1_times, timeframe, self.session_offset)
+        # Only buckets that have ended and that the buffer holds in full
+        closed = (buckets < buckets[-1]) & (buckets >= self._covered_from)
+        if not closed.any():
+            return
+
+        completed = resample(self._m1[closed], timeframe, self.session_offset)
+        history = self._history[timeframe]
+        history = history[history['time'] < completed['time'].iloc[0]]
+        history = pd.concat([history, completed], ignore_index=True)
+        self._history[timeframe] = history.tail(self.max_bars).reset_index(drop=True)
+
+    def bars(self, timeframe: MT5Timeframe, count: Optional[int] = None) -> pd.DataFrame:
+        """Completed bars followed by the bar in progress, newest last."""
+        history = self._history[timeframe]
+        if len(self._m1_times):
+            current_start = bucket_starts(self._m1_times[-1:], timeframe, self.session_offset)[0]
+            if current_start >= self._covered_from:
+                current = resample(self._m1[self._m1_times >= current_start], timeframe, self.session_offset)
+                history = history[history['time'] < current['time'].iloc[0]]
+                history = pd.concat([history, current], ignore_index=True)
+        if count is not None:
+            history = history.tail(count)
+        return history.reset_index(drop=True)
+
+    def has_history(self, timeframe: MT5Timeframe, count: int) -> bool:
+        # The bar in progress comes from the M1 buffer
+        return len(self._history[timeframe]) >= min(count, self.max_bars) - 1
+
+
+class ResampledBarFeed:
+    """
+    Serve several timeframes per symbol from one M1 fetch per cycle.
+
+    Each timeframe is seeded once from the terminal; after that only the M1
+    bars since the last poll are fetched and every higher timeframe is
+    derived locally.
+
+    Bar times are broker server time, usually a few hours ahead of UTC.
+    server_offset (seconds) is that difference; it is raised whenever the
+    terminal returns a bar newer than the clock allows, so it needs no
+    configuration for servers ahead of UTC.
+    """
+
+    # Falling further behind than this reseeds instead of catching up on M1
+    MAX_CATCH_UP_BARS = 1440
+    # Server offsets are whole quarter hours
+    OFFSET_STEP = 15 * 60
+
+    def __init__(self, timeframes: Iterable[MT5Timeframe], max_bars: int = 1000, session_offset: int = 0,
+                 server_offset: int = 0):
+        self.timeframes = list(timeframes)
+        self.max_bars = max_bars
+        self.session_offset = session_offset
+        self.server_offset = server_offset
+        self._resamplers: Dict[str, IncrementalResampler] = {}
+        self._lock = threading.Lock()
+
+    def _new_resampler(self, symbol: str) -> IncrementalResampler:
+        resampler = IncrementalResampler(self.timeframes, self.max_bars, self.session_offset)
+        self._resamplers[symbol] = resampler
+        return resampler
+
+    def server_now(self) -> int:
+        return int(time.time()) + self.server_offset
+
+    def _fetch_m1(self, symbol: str, count: int) -> Optional[pd.DataFrame]:
+        m1_bars = fetch_data_pos(symbol, MT5Timeframe.M1, max(int(count), 2))
+        if m1_bars is None or m1_bars.empty:
+            return None
+        ahead = int(to_seconds(m1_bars['time'].tail(1))[0]) - int(time.time())
+        if ahead > self.server_offset:
+            self.server_offset = -(-ahead // self.OFFSET_STEP) * self.OFFSET_STEP
+            logger.info(f"Bars of {symbol} are {ahead}s ahead of UTC, server offset set to {self.server_offset}s")
+        return m1_bars
+
+    def _seed(self, symbol: str, resampler: IncrementalResampler) -> bool:
+        """Fill the M1 buffer of a new resampler with every bucket still open."""
+        offset = None
+        # A raised server offset means now was behind the bars and the fetch may not reach back to
+        # covered_from, so it is repeated with the corrected clock
+        while offset != self.server_offset:
+            offset = self.server_offset
+            now = self.server_now()
+            # Enough M1 bars to rebuild every open bucket, the longest first
+            covered_from = resampler.open_bucket_start(now)
+            m1_bars = self._fetch_m1(symbol, (now - covered_from) // 60 + 2)
+            if m1_bars is None:
+                return False
+        resampler.update(m1_bars, covered_from=covered_from)
+        return True
+
+    def refresh(self, symbol: str) -> bool:
+        """
+        Pull new M1 bars for symbol. Returns False if the terminal gave none;
+        the symbol's bars are then fetched from the terminal until a refresh
+        succeeds.
+        """
+        with self._lock:
+            resampler = self._resamplers.get(symbol)
+            if resampler is None or resampler.last_m1_time is None:
+                refreshed = self._seed(symbol, resampler or self._new_resampler(symbol))
+            else:
+                last = resampler.last_m1_time
+                count = (self.server_now() - last) // 60 + 2
+                m1_bars = self._fetch_m1(symbol, count) if count <= self.MAX_CATCH_UP_BARS else None
+                if m1_bars is not None and int(to_seconds(m1_bars['time'].head(1))[0]) <= last:
+                    resampler.update(m1_bars)
+                    refreshed = True
+                else:
+                    # Too far behind, or the bars do not reach back to the buffer
+                    logger.info(f"{symbol} resampler fell behind since {last}, reseeding")
+                    refreshed = self._seed(symbol, self._new_resampler(symbol))
+
+            if not refreshed:
+                # Stale bars are worse than a direct fetch
+                logger.warning(f"Could not refresh M1 bars of {symbol}, fetching its timeframes directly")
+                self._resamplers.pop(symbol, None)
+            return refreshed
+
+    def bars(self, symbol: str, timeframe: MT5Timeframe, count: int) -> Optional[pd.DataFrame]:
+        """The last count bars of timeframe for symbol, fetching only what is missing."""
+        if timeframe == MT5Timeframe.M1 or timeframe not in self.timeframes:
+            return fetch_data_pos(symbol, timeframe, count)
+
+        with self._lock:
+            resampler = self._resamplers.get(symbol) or self._new_resampler(symbol)
+            if not resampler.has_history(timeframe, count):
+                history = fetch_data_pos(symbol, timeframe, min(count, self.max_bars))
+                if history is None or history.empty:
+                    return history
+                resampler.seed(timeframe, history)
+            return resampler.bars(timeframe, count)
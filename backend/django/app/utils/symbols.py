@@ -0,0 +1,137 @@
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Optional
+
+import numpy as np
+from django.conf import settings
+
+from app.utils.constants import METALS, OILS, CRYPTOCURRENCIES, CURRENCY_PAIRS
+from app.utils.api.data import symbol_info
+
+logger = logging.getLogger(__name__)
+
+# A symbol the terminal could not classify (unknown, or the terminal was unreachable) is asked again after this
+UNCLASSIFIED_RETRY_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class AssetClass:
+    name: str
+    commission_rate: float  # Of the notional, for opening and closing
+    always_open: bool = False
+    # Without always_open, the market counts as closed once the last tick is this old
+    max_tick_age: timedelta = timedelta(minutes=5)
+
+
+ASSET_CLASSES: Dict[str, AssetClass] = {
+    'crypto': AssetClass('crypto', 0.0005, always_open=True),  # 0.05%
+    'forex': AssetClass('forex', 0.00025),
+    'metal': AssetClass('metal', 0.00025),
+    'oil': AssetClass('oil', 0.00025),
+}
+
+# Keywords of symbol_info().path (e.g. 'Forex\Majors\EURUSD') per asset class
+PATH_KEYWORDS = [
+    ('crypto', 'crypto'),
+    ('forex', 'forex'),
+    ('metal', 'metal'),
+    ('energ', 'oil'),
+    ('oil', 'oil'),
+]
+
+
+class SymbolRegistry:
+    """
+    Symbol to asset class lookups in one dict.
+
+    Built at import from the lists in constants, then SYMBOL_CLASSES from the
+    settings ({symbol: asset class}). A symbol found in neither is classified
+    from its symbol_info().path in the terminal. A match is kept for good, a
+    miss only for UNCLASSIFIED_RETRY_SECONDS.
+    """
+
+    def __init__(self, classes: Dict[str, AssetClass]):
+        self.classes = dict(classes)
+        self._symbols: Dict[str, AssetClass] = {}
+        self._unclassified: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def register(self, symbol: str, asset_class: str):
+        if asset_class not in self.classes:
+            raise ValueError(f"Unknown asset class {asset_class} for {symbol}. Valid options are: {', '.join(self.classes)}")
+        with self._lock:
+            self._symbols[symbol] = self.classes[asset_class]
+            self._unclassified.pop(symbol, None)
+
+    def register_many(self, symbols, asset_class: str):
+        for symbol in symbols:
+            self.register(symbol, asset_class)
+
+    def _from_terminal(self, symbol: str) -> Optional[AssetClass]:
+        info = symbol_info(symbol)
+        if info is None or info.empty or 'path' not in info:
+            return None
+        path = str(info['path'].iloc[0]).lower()
+        for keyword, asset_class in PATH_KEYWORDS:
+            if keyword in path:
+                logger.info(f"Classified {symbol} as {asset_class} from its path {path}")
+                return self.classes[asset_class]
+        return None
+
+    def asset_class(self, symbol: str) -> Optional[AssetClass]:
+        asset_class = self._symbols.get(symbol)
+        if asset_class is not None:
+            return asset_class
+        if time.monotonic() - self._unclassified.get(symbol, float('-inf')) < UNCLASSIFIED_RETRY_SECONDS:
+            return None
+
+        # A request to the terminal, made without the lock so other lookups never wait on it
+        try:
+            asset_class = self._from_terminal(symbol)
+        except Exception as e:
+            logger.error(f"Error classifying symbol {symbol}: {e}")
+            asset_class = None
+        with self._lock:
+            if asset_class is None:
+                logger.warning(f"Could not classify symbol {symbol}, retrying in {UNCLASSIFIED_RETRY_SECONDS:.0f}s")
+                self._unclassified[symbol] = time.monotonic()
+            else:
+                self._symbols.setdefault(symbol, asset_class)
+                self._unclassified.pop(symbol, None)
+            return self._symbols.get(symbol)
+
+    def commission_rate(self, symbol: str) -> float:
+        """The commission rate of symbol, NaN if it is unknown."""
+        asset_class = self.asset_class(symbol)
+        return asset_class.commission_rate if asset_class is not None else np.nan
+
+    def commission_rates(self, symbols) -> np.ndarray:
+        """Commission rate per element of an array of symbols, NaN where unknown."""
+        unique, inverse = np.unique(np.asarray(symbols, dtype=object).astype(str), return_inverse=True)
+        rates = np.array([self.commission_rate(symbol) for symbol in unique], dtype=np.float64)
+        return rates[inverse].reshape(np.shape(symbols))
+
+    def always_open(self, symbol: str) -> bool:
+        asset_class = self.asset_class(symbol)
+        return asset_class is not None and asset_class.always_open
+
+    def max_tick_age(self, symbol: str) -> timedelta:
+        asset_class = self.asset_class(symbol)
+        return asset_class.max_tick_age if asset_class is not None else AssetClass.max_tick_age
+
+
+def build_registry() -> SymbolRegistry:
+    registry = SymbolRegistry(ASSET_CLASSES)
+    registry.register_many(CURRENCY_PAIRS, 'forex')
+    registry.register_many(METALS, 'metal')
+    registry.register_many(OILS, 'oil')
+    registry.register_many(CRYPTOCURRENCIES, 'crypto')
+    for symbol, asset_class in getattr(settings, 'SYMBOL_CLASSES', {}).items():
+        registry.register(symbol, asset_class)
+    return registry
+
+
+symbols = build_registry()
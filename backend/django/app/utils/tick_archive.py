@@ -0,0 +1,261 @@
+"""
+On-disk tick archive, one file per symbol per UTC day.
+
+    {TICK_ARCHIVE_DIR}/{SYMBOL}/{YYYY-MM-DD}.ticks
+
+    file   = magic | header | block ... | index
+    header = u32 version | u32 digits | u32 block_count | u64 index_offset
+    index  = block_count * (i8 first_time_msc | i8 last_time_msc | u8 offset | u4 length | u4 count)
+
+Each block holds up to BLOCK_TICKS ticks, zlib-compressed, as column buffers in
+COLUMNS order. time_msc and the prices (scaled to integers by 10 ** digits) are
+delta-encoded, so a quiet market compresses to little more than zeros. Readers
+memory-map the file, binary-search the index and only inflate blocks that
+overlap the requested range.
+"""
+
+import os
+import mmap
+import zlib
+import struct
+import logging
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MT5TICKS'
+VERSION = 1
+BLOCK_TICKS = 65536
+COMPRESSION_LEVEL = 6
+MAX_DIGITS = 8
+
+_HEADER = struct.Struct('<IIIQ')
+_INDEX_DTYPE = np.dtype([
+    ('first_time_msc', '<i8'),
+    ('last_time_msc', '<i8'),
+    ('offset', '<u8'),
+    ('length', '<u4'),
+    ('count', '<u4'),
+])
+
+PRICE_COLUMNS = ('bid', 'ask', 'last')
+
+# (name, stored dtype, delta-encoded)
+COLUMNS = (
+    ('time_msc', np.dtype('<i8'), True),
+    ('bid', np.dtype('<i8'), True),
+    ('ask', np.dtype('<i8'), True),
+    ('last', np.dtype('<i8'), True),
+    ('volume', np.dtype('<u8'), False),
+    ('volume_real', np.dtype('<f8'), False),
+    ('flags', np.dtype('<u4'), False),
+)
+COLUMN_NAMES = [name for name, _, _ in COLUMNS]
+
+
+def archive_dir() -> str:
+    return getattr(settings, 'TICK_ARCHIVE_DIR', None) or os.path.join(settings.BASE_DIR, 'data', 'ticks')
+
+
+def day_path(symbol: str, day: date, root: Optional[str] = None) -> str:
+    return os.path.join(root or archive_dir(), symbol, f"{day.isoformat()}.ticks")
+
+
+def _to_msc(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def infer_digits(ticks: pd.DataFrame) -> int:
+    """The fewest decimal places that represent every price exactly."""
+    prices = np.concatenate([ticks[column].to_numpy(dtype=np.float64) for column in PRICE_COLUMNS])
+    prices = prices[prices != 0]
+    for digits in range(MAX_DIGITS + 1):
+        scaled = prices * 10 ** digits
+        if np.all(np.abs(scaled - np.round(scaled)) < 1e-6):
+            return digits
+    return MAX_DIGITS
+
+
+def _encode_block(block: pd.DataFrame, scale: int) -> bytes:
+    buffers = []
+    for name, dtype, delta in COLUMNS:
+        if name in PRICE_COLUMNS:
+            values = np.round(block[name].to_numpy(dtype=np.float64) * scale).astype(dtype)
+        else:
+            values = block[name].to_numpy().astype(dtype)
+        if delta:
+            values = np.diff(values, prepend=np.zeros(1, dtype=dtype))
+        buffers.append(values.tobytes())
+    return zlib.compress(b''.join(buffers), COMPRESSION_LEVEL)
+
+
+def _decode_block(data, count: int, scale: int) -> pd.DataFrame:
+    raw = zlib.decompress(data)
+    columns = {}
+    offset = 0
+    for name, dtype, delta in COLUMNS:
+        values = np.frombuffer(raw, dtype=dtype, count=count, offset=offset)
+        offset += count * dtype.itemsize
+        if delta:
+            values = np.cumsum(values)
+        if name in PRICE_COLUMNS:
+            values = values / scale
+        columns[name] = values
+    frame = pd.DataFrame(columns)
+    frame.insert(0, 'time', pd.to_datetime(frame['time_msc'], unit='ms'))
+    return frame
+
+
+def write_day(symbol: str, day: date, ticks: pd.DataFrame, digits: Optional[int] = None,
+              root: Optional[str] = None) -> str:
+    """
+    Replace the archive file for one symbol and day with ticks.
+
+    ticks needs the columns of MT5 tick arrays (time_msc, bid, ask, last,
+    volume, volume_real, flags). The file is written next to its final path
+    and renamed into place, so readers never see a partial day.
+    """
+    path = day_path(symbol, day, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    ticks = ticks.sort_values('time_msc', kind='stable').reset_index(drop=True)
+    if digits is None:
+        digits = infer_digits(ticks) if len(ticks) else 0
+    scale = 10 ** digits
+
+    index = np.zeros((len(ticks) + BLOCK_TICKS - 1) // BLOCK_TICKS, dtype=_INDEX_DTYPE)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER.pack(VERSION, digits, len(index), 0))
+            for i, start in enumerate(range(0, len(ticks), BLOCK_TICKS)):
+                block = ticks.iloc[start:start + BLOCK_TICKS]
+                data = _encode_block(block, scale)
+                time_msc = block['time_msc'].to_numpy()
+                index[i] = (time_msc[0], time_msc[-1], f.tell(), len(data), len(block))
+                f.write(data)
+
+            index_offset = f.tell()
+            f.write(index.tobytes())
+            f.seek(len(MAGIC))
+            f.write(_HEADER.pack(VERSION, digits, len(index), index_offset))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    logger.debug(f"Archived {len(ticks)} {symbol} ticks for {day} in {len(index)} blocks")
+    return path
+
+
+def write_ticks(symbol: str, ticks: pd.DataFrame, digits: Optional[int] = None, root: Optional[str] = None):
+    """
+    Merge ticks into the archive, one file per UTC day they span.
+
+    Archived ticks inside the time range of the new ones are replaced by them;
+    ticks outside it are kept.
+    """
+    if ticks.empty:
+        return
+    days = pd.to_datetime(ticks['time_msc'], unit='ms').dt.date
+    for day, day_ticks in ticks.groupby(days, sort=True):
+        low, high = day_ticks['time_msc'].min(), day_ticks['time_msc'].max()
+        existing = read_day(symbol, day, root=root)
+        if existing is not None and not existing.empty:
+            kept = existing[(existing['time_msc'] < low) | (existing['time_msc'] > high)]
+            day_ticks = pd.concat([kept[COLUMN_NAMES], day_ticks[COLUMN_NAMES]], ignore_index=True)
+        write_day(symbol, day, day_ticks, digits=digits, root=root)
+
+
+class _DayFile:
+    """A memory-mapped archive file and its block index."""
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a tick archive file")
+        version, digits, block_count, index_offset = _HEADER.unpack_from(self._map, len(MAGIC))
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path} has unsupported archive version {version}")
+
+        self.scale = 10 ** digits
+        # Slicing copies, so no numpy view pins the map open
+        index_end = index_offset + block_count * _INDEX_DTYPE.itemsize
+        self.index = np.frombuffer(self._map[index_offset:index_end], dtype=_INDEX_DTYPE)
+
+    def blocks(self, start_msc: int, end_msc: int) -> Iterator[pd.DataFrame]:
+        """Decode the blocks overlapping [start_msc, end_msc], trimmed to it."""
+        first = np.searchsorted(self.index['last_time_msc'], start_msc, side='left')
+        last = np.searchsorted(self.index['first_time_msc'], end_msc, side='right')
+        for entry in self.index[first:last]:
+            offset = int(entry['offset'])
+            frame = _decode_block(self._map[offset:offset + int(entry['length'])], int(entry['count']), self.scale)
+            if entry['first_time_msc'] < start_msc or entry['last_time_msc'] > end_msc:
+                time_msc = frame['time_msc'].to_numpy()
+                frame = frame[(time_msc >= start_msc) & (time_msc <= end_msc)].reset_index(drop=True)
+            if not frame.empty:
+                yield frame
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_ticks(symbol: str, start: datetime, end: datetime, root: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield archived ticks between start and end (inclusive) block by block, so a
+    replay over months holds at most one block per step in memory.
+    """
+    start_msc, end_msc = _to_msc(start), _to_msc(end)
+    day = datetime.fromtimestamp(start_msc / 1000, tz=timezone.utc).date()
+    last_day = datetime.fromtimestamp(end_msc / 1000, tz=timezone.utc).date()
+
+    while day <= last_day:
+        path = day_path(symbol, day, root)
+        if os.path.exists(path):
+            with _DayFile(path) as day_file:
+                yield from day_file.blocks(start_msc, end_msc)
+        day += timedelta(days=1)
+
+
+def read_ticks(symbol: str, start: datetime, end: datetime, root: Optional[str] = None) -> pd.DataFrame:
+    """Archived ticks between start and end (inclusive) as one DataFrame."""
+    frames = list(iter_ticks(symbol, start, end, root=root))
+    if not frames:
+        return pd.DataFrame(columns=['time'] + COLUMN_NAMES)
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def read_day(symbol: str, day: date, root: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Every archived tick of one day, or None if the day is not archived."""
+    path = day_path(symbol, day, root)
+    if not os.path.exists(path):
+        return None
+    with _DayFile(path) as day_file:
+        frames = list(day_file.blocks(np.iinfo(np.int64).min, np.iinfo(np.int64).max))
+    if not frames:
+        return pd.DataFrame(columns=['time'] + COLUMN_NAMES)
+    return pd.concat(frames, ignore_index=True)
@@ -2,10 +2,13 @@ import logging
 import os
 from flask import Flask
 from dotenv import load_dotenv
-import MetaTrader5 as mt5
 from flasgger import Swagger
 from werkzeug.middleware.proxy_fix import ProxyFix
 from swagger import swagger_config
+from metrics import init_metrics
+from terminal import init_terminal
+from connection import connection
+from compression import init_compression
 
 # Import routes
 from routes.health import health_bp
@@ -15,6 +18,9 @@ from routes.position import position_bp
 from routes.order import order_bp
 from routes.history import history_bp
 from routes.error import error_bp
+from routes.metrics import metrics_bp
+from routes.stream import stream_bp
+from routes.ticks import ticks_bp
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -32,10 +38,18 @@ app.register_blueprint(position_bp)
 app.register_blueprint(order_bp)
 app.register_blueprint(history_bp)
 app.register_blueprint(error_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(stream_bp)
+app.register_blueprint(ticks_bp)
+
+init_metrics(app)
+init_terminal(app)
+init_compression(app)
 
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
 if __name__ == '__main__':
-    if not mt5.initialize():
+    if not connection.connect():
         logger.error("Failed to initialize MT5.")
+    connection.start_monitor()
     app.run(host='0.0.0.0', port=int(os.environ.get('MT5_API_PORT')))
\ No newline at end of file
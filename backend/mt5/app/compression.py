@@ -0,0 +1,69 @@
+import gzip
+import logging
+import os
+
+from flask import request
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+MIN_SIZE = int(os.environ.get('MT5_API_COMPRESSION_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.environ.get('MT5_API_GZIP_LEVEL', 5))
+ZSTD_LEVEL = int(os.environ.get('MT5_API_ZSTD_LEVEL', 3))
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/plain', 'text/csv',
+                          'application/vnd.mt5.columnar'}
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if zstandard is not None and accepted['zstd']:
+        return 'zstd'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(data, encoding):
+    if encoding == 'zstd':
+        # ZstdCompressor instances are not thread safe, so one per response
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def init_compression(app):
+    """Compress buffered responses with zstd when the client accepts it, gzip otherwise."""
+
+    @app.after_request
+    def _compress_response(response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+
+        response.set_data(_compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        # A strong ETag names the identity representation; weaken it for the encoded one.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
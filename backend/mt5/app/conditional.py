@@ -0,0 +1,35 @@
+import hashlib
+
+from flask import Response, request
+
+
+def bars_etag(symbol, timeframe, rates, *params):
+    """
+    ETag for a bar response: symbol, timeframe and the time of the last bar,
+    plus a digest of that bar so updates to the still-forming bar are seen.
+    Any request parameter that changes the body (bar count, orient, range)
+    goes in params.
+    """
+    if len(rates):
+        last_bar = f"{int(rates['time'][-1])}:{hashlib.blake2b(rates[-1:].tobytes(), digest_size=8).hexdigest()}"
+    else:
+        last_bar = 'empty'
+    key = ':'.join(str(part) for part in (symbol, timeframe, len(rates), last_bar) + params)
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def not_modified(etag):
+    """A 304 response if the client already holds this representation, else None."""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return None
+
+
+def with_etag(response, etag):
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate before reusing it.
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
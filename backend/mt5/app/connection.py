@@ -0,0 +1,123 @@
+import logging
+import os
+import time
+import threading
+
+import MetaTrader5 as mt5
+from prometheus_client import Gauge, Counter
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL = float(os.environ.get('MT5_CONNECTION_CHECK_INTERVAL', 5))
+RECONNECT_BACKOFF_INITIAL = float(os.environ.get('MT5_RECONNECT_BACKOFF_INITIAL', 1))
+RECONNECT_BACKOFF_MAX = float(os.environ.get('MT5_RECONNECT_BACKOFF_MAX', 60))
+
+TERMINAL_CONNECTED = Gauge(
+    'mt5_terminal_connected',
+    'Whether the last connection check found the terminal initialized and connected to the trade server.',
+)
+
+TERMINAL_RECONNECTS = Counter(
+    'mt5_terminal_reconnects_total',
+    'Attempts to re-initialize the terminal after a failed connection check.',
+    ['result'],
+)
+
+
+class ConnectionManager:
+    """
+    Owns the terminal connection for the whole process.
+
+    initialize() runs once at startup and afterwards only when terminal_info()
+    reports the terminal gone, with exponential backoff between attempts. The
+    last known state is cached so health probes never touch the terminal.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._monitor = None
+        self.initialized = False
+        self.connected = False
+        self.last_check = None
+        self.last_error = None
+        self._backoff = RECONNECT_BACKOFF_INITIAL
+        self._next_attempt = 0.0
+
+    def connect(self):
+        """Initialize the terminal. Returns True when it is usable."""
+        with self._lock:
+            return self._initialize()
+
+    def _initialize(self):
+        self.initialized = bool(mt5.initialize())
+        if not self.initialized:
+            self.last_error = mt5.last_error()
+            logger.error(f"Failed to initialize MT5: {self.last_error}")
+        self._refresh()
+        return self.connected
+
+    def _refresh(self):
+        info = mt5.terminal_info() if self.initialized else None
+        self.connected = info is not None and bool(info.connected)
+        if info is None and self.initialized:
+            self.initialized = False
+            self.last_error = mt5.last_error()
+        self.last_check = time.time()
+        TERMINAL_CONNECTED.set(1 if self.connected else 0)
+
+    def ensure_connected(self, max_age=CHECK_INTERVAL):
+        """
+        Return True if the terminal is usable, re-checking it at most every
+        max_age seconds and reconnecting (with backoff) when the check fails.
+        """
+        if self.connected and self.last_check is not None and time.time() - self.last_check < max_age:
+            return True
+
+        with self._lock:
+            if self.initialized:
+                self._refresh()
+                if self.connected:
+                    self._backoff = RECONNECT_BACKOFF_INITIAL
+                    return True
+
+            now = time.time()
+            if now < self._next_attempt:
+                return False
+
+            logger.warning("MT5 terminal not connected, re-initializing.")
+            connected = self._initialize()
+            TERMINAL_RECONNECTS.labels(result='success' if connected else 'failure').inc()
+            if connected:
+                self._backoff = RECONNECT_BACKOFF_INITIAL
+                self._next_attempt = 0.0
+            else:
+                self._next_attempt = now + self._backoff
+                self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+            return connected
+
+    def start_monitor(self, interval=CHECK_INTERVAL):
+        """Keep the cached state fresh from a background thread."""
+        if self._monitor is not None:
+            return
+
+        def run():
+            while True:
+                try:
+                    self.ensure_connected(max_age=interval)
+                except Exception as e:
+                    logger.error(f"Connection check failed: {e}")
+                time.sleep(interval)
+
+        self._monitor = threading.Thread(target=run, name='mt5-connection-monitor', daemon=True)
+        self._monitor.start()
+
+    def status(self):
+        return {
+            "mt5_initialized": self.initialized,
+            "mt5_connected": self.connected,
+            "last_check": self.last_check,
+            "last_error": list(self.last_error) if self.last_error else None,
+        }
+
+
+connection = ConnectionManager()
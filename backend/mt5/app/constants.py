@@ -12,6 +12,20 @@ class MT5Timeframe(Enum):
     W1 = mt5.TIMEFRAME_W1       # weekly
     MN1 = mt5.TIMEFRAME_MN1     # monthly
 
+# Bar length in seconds, used to slice long ranges into chunks. Months are
+# approximated as 31 days; chunk boundaries only need to be disjoint.
+TIMEFRAME_SECONDS = {
+    mt5.TIMEFRAME_M1: 60,
+    mt5.TIMEFRAME_M5: 300,
+    mt5.TIMEFRAME_M15: 900,
+    mt5.TIMEFRAME_M30: 1800,
+    mt5.TIMEFRAME_H1: 3600,
+    mt5.TIMEFRAME_H4: 14400,
+    mt5.TIMEFRAME_D1: 86400,
+    mt5.TIMEFRAME_W1: 604800,
+    mt5.TIMEFRAME_MN1: 2678400,
+}
+
 TRADE_RETCODE_DESCRIPTION = {
     mt5.TRADE_RETCODE_REQUOTE: "Requote",
     mt5.TRADE_RETCODE_REJECT: "Request rejected",
@@ -0,0 +1,45 @@
+"""
+Length-prefixed binary columnar frames.
+
+A response is a sequence of frames:
+
+    frame   = u32 payload_length | payload
+    payload = u32 header_length | header (JSON) | column buffers
+
+The header is {"cursor", "count", "columns": [[name, dtype], ...]} and the
+column buffers follow it in the same order, each count * itemsize bytes of
+little-endian numpy data. The last frame of a stream has count 0 and either
+"done": true or "error" set. All integers are little-endian.
+"""
+
+import struct
+
+import numpy as np
+
+from serialization import dumps
+
+MIMETYPE = 'application/vnd.mt5.columnar'
+
+_U32 = struct.Struct('<I')
+
+
+def encode_frame(array=None, cursor=None, **extra):
+    """One frame holding the fields of a structured array (or just a header)."""
+    count = 0 if array is None else len(array)
+    columns = []
+    buffers = []
+    if array is not None:
+        for name in array.dtype.names:
+            column = np.ascontiguousarray(array[name])
+            dtype = column.dtype.newbyteorder('<') if column.dtype.byteorder == '>' else column.dtype
+            columns.append([name, dtype.str])
+            buffers.append(column.astype(dtype, copy=False).tobytes())
+
+    header = dumps({"cursor": cursor, "count": count, "columns": columns, **extra})
+    payload = b''.join([_U32.pack(len(header)), header] + buffers)
+    return _U32.pack(len(payload)) + payload
+
+
+def encode_array(array):
+    """A complete single-chunk response body."""
+    return encode_frame(array) + encode_frame(done=True)
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 import pandas as pd
 from constants import MT5Timeframe
+from connection import connection
 import logging
 
 logger = logging.getLogger(__name__)
@@ -115,9 +116,9 @@ def close_all_positions(order_type='all', magic=None, type_filling=mt5.ORDER_FIL
         return []
 
 def get_positions(magic=None):
-    # First check if MT5 is initialized
-    if not mt5.initialize():
-        logger.error("Failed to initialize MT5.")
+    # Uses the cached connection state; only re-initializes if the terminal dropped
+    if not connection.ensure_connected():
+        logger.error("MT5 terminal is not connected.")
         return pd.DataFrame()
 
     total_positions = mt5.positions_total()
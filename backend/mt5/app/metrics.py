@@ -0,0 +1,153 @@
+import logging
+import time
+from functools import wraps
+
+import MetaTrader5 as mt5
+from flask import request, g
+from prometheus_client import Counter, Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+from constants import TRADE_RETCODE_DESCRIPTION
+
+logger = logging.getLogger(__name__)
+
+# Terminal functions whose latency is recorded. Anything not listed here is
+# called straight through without instrumentation.
+TERMINAL_FUNCTIONS = [
+    'initialize',
+    'terminal_info',
+    'account_info',
+    'copy_rates_from_pos',
+    'copy_rates_range',
+    'symbol_info',
+    'symbol_info_tick',
+    'positions_total',
+    'positions_get',
+    'order_send',
+    'history_deals_get',
+    'history_orders_get',
+    'last_error',
+]
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUEST_LATENCY = Histogram(
+    'mt5_api_request_duration_seconds',
+    'Time spent handling an HTTP request, from routing to response.',
+    ['method', 'endpoint', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+
+TERMINAL_CALL_LATENCY = Histogram(
+    'mt5_terminal_call_duration_seconds',
+    'Time spent inside a MetaTrader5 terminal call.',
+    ['function'],
+    buckets=LATENCY_BUCKETS,
+)
+
+TERMINAL_CALL_FAILURES = Counter(
+    'mt5_terminal_call_failures_total',
+    'Terminal calls that returned None or raised.',
+    ['function'],
+)
+
+ORDER_RETCODES = Counter(
+    'mt5_order_retcode_total',
+    'Results of order_send keyed by trade return code.',
+    ['retcode', 'description'],
+)
+
+REQUEST_PAYLOAD_SIZE = Histogram(
+    'mt5_api_request_size_bytes',
+    'Size of the HTTP request body.',
+    ['endpoint'],
+    buckets=SIZE_BUCKETS,
+)
+
+RESPONSE_PAYLOAD_SIZE = Histogram(
+    'mt5_api_response_size_bytes',
+    'Size of the HTTP response body.',
+    ['endpoint'],
+    buckets=SIZE_BUCKETS,
+)
+
+
+def _record_order_result(result):
+    if result is None:
+        ORDER_RETCODES.labels(retcode='none', description='No result returned').inc()
+        return
+    retcode = getattr(result, 'retcode', None)
+    description = TRADE_RETCODE_DESCRIPTION.get(retcode, 'Unknown return code')
+    ORDER_RETCODES.labels(retcode=str(retcode), description=description).inc()
+
+
+def _timed_terminal_call(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            TERMINAL_CALL_FAILURES.labels(function=name).inc()
+            raise
+        finally:
+            TERMINAL_CALL_LATENCY.labels(function=name).observe(time.perf_counter() - start)
+
+        if result is None:
+            TERMINAL_CALL_FAILURES.labels(function=name).inc()
+        if name == 'order_send':
+            _record_order_result(result)
+        return result
+
+    wrapper.__mt5_instrumented__ = True
+    return wrapper
+
+
+def instrument_terminal():
+    """Wrap the MetaTrader5 module functions in place so every call site is timed."""
+    for name in TERMINAL_FUNCTIONS:
+        func = getattr(mt5, name, None)
+        if func is None or getattr(func, '__mt5_instrumented__', False):
+            continue
+        setattr(mt5, name, _timed_terminal_call(name, func))
+
+
+def _endpoint_label():
+    # Use the URL rule rather than the raw path so /symbol_info/<symbol> stays one series.
+    if request.url_rule is not None:
+        return request.url_rule.rule
+    return 'unmatched'
+
+
+def init_metrics(app):
+    instrument_terminal()
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_start_time = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        start = g.pop('request_start_time', None)
+        endpoint = _endpoint_label()
+        if endpoint == '/metrics':
+            return response
+
+        if start is not None:
+            REQUEST_LATENCY.labels(
+                method=request.method,
+                endpoint=endpoint,
+                status=str(response.status_code),
+            ).observe(time.perf_counter() - start)
+
+        if request.content_length:
+            REQUEST_PAYLOAD_SIZE.labels(endpoint=endpoint).observe(request.content_length)
+        # Streamed responses have no known length and are skipped.
+        if response.content_length is not None:
+            RESPONSE_PAYLOAD_SIZE.labels(endpoint=endpoint).observe(response.content_length)
+
+        return response
+
+
+def render_metrics():
+    return generate_latest(), CONTENT_TYPE_LATEST
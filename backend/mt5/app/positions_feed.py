@@ -0,0 +1,127 @@
+import logging
+import os
+import time
+import uuid
+import threading
+from collections import deque
+
+import MetaTrader5 as mt5
+
+logger = logging.getLogger(__name__)
+
+HISTORY_SIZE = int(os.environ.get('MT5_POSITION_FEED_HISTORY', 5000))
+MIN_REFRESH_INTERVAL = float(os.environ.get('MT5_POSITION_FEED_MIN_INTERVAL', 0.1))
+
+CHANGE_OPENED = 'opened'
+CHANGE_MODIFIED = 'modified'
+CHANGE_CLOSED = 'closed'
+
+
+class PositionFeed:
+    """
+    Keeps the last positions snapshot and a bounded log of changes to it.
+
+    Every opened, closed or modified ticket (time_update_msc moved) bumps a
+    monotonic version, so clients can ask for everything after the version they
+    last saw instead of downloading every position. The epoch changes on each
+    process start; a client holding a version from another epoch, or one older
+    than the retained log, gets a full snapshot instead.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE, min_refresh_interval=MIN_REFRESH_INTERVAL):
+        self._lock = threading.Lock()
+        self._snapshot = {}
+        self._log = deque(maxlen=history_size)
+        self._last_refresh = 0.0
+        self.min_refresh_interval = min_refresh_interval
+        self.epoch = uuid.uuid4().hex
+        self.version = 0
+
+    def refresh(self, force=False):
+        """
+        Diff the terminal's open positions against the snapshot. Calls within
+        min_refresh_interval of the last refresh reuse it, so many pollers share
+        one positions_get() call. Returns False if the terminal call failed.
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._last_refresh < self.min_refresh_interval:
+                return True
+
+            positions = mt5.positions_get()
+            if positions is None:
+                logger.error(f"Failed to retrieve positions: {mt5.last_error()}")
+                return False
+            self._last_refresh = time.monotonic()
+
+            current = {position.ticket: position._asdict() for position in positions}
+
+            for ticket, position in current.items():
+                previous = self._snapshot.get(ticket)
+                if previous is None:
+                    self._record(CHANGE_OPENED, ticket, position)
+                elif previous['time_update_msc'] != position['time_update_msc']:
+                    self._record(CHANGE_MODIFIED, ticket, position)
+
+            for ticket in self._snapshot.keys() - current.keys():
+                self._record(CHANGE_CLOSED, ticket, None)
+
+            self._snapshot = current
+            return True
+
+    def _record(self, kind, ticket, position):
+        self.version += 1
+        self._log.append((self.version, kind, ticket, position))
+
+    def changes(self, since=None, epoch=None):
+        """
+        Changes after version `since`, one entry per ticket with its latest state.
+
+        Falls back to the full snapshot (full=True) when the client has no
+        version yet, comes from another epoch or is older than the retained log.
+        """
+        with self._lock:
+            oldest = self._log[0][0] if self._log else self.version + 1
+            full = (
+                since is None
+                or epoch != self.epoch
+                or since > self.version
+                or since < oldest - 1
+            )
+
+            if full:
+                return {
+                    "epoch": self.epoch,
+                    "version": self.version,
+                    "full": True,
+                    "opened": list(self._snapshot.values()),
+                    "modified": [],
+                    "closed": [],
+                }
+
+            latest = {}
+            for version, kind, ticket, position in self._log:
+                if version <= since:
+                    continue
+                first_kind = latest[ticket][0] if ticket in latest else kind
+                latest[ticket] = (first_kind, kind, position)
+
+            opened, modified, closed = [], [], []
+            for ticket, (first_kind, kind, position) in latest.items():
+                if kind == CHANGE_CLOSED:
+                    closed.append(ticket)
+                elif first_kind == CHANGE_OPENED:
+                    opened.append(position)
+                else:
+                    modified.append(position)
+
+            return {
+                "epoch": self.epoch,
+                "version": self.version,
+                "full": False,
+                "opened": opened,
+                "modified": modified,
+                "closed": closed,
+            }
+
+
+position_feed = PositionFeed()
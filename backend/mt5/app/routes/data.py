@@ -1,11 +1,12 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, request
 import MetaTrader5 as mt5
 import logging
 from datetime import datetime
 import pytz
-import pandas as pd
 from flasgger import swag_from
 from lib import get_timeframe
+from serialization import json_response, structured_response, get_orient
+from conditional import bars_etag, not_modified, with_etag
 
 data_bp = Blueprint('data', __name__)
 logger = logging.getLogger(__name__)
@@ -36,6 +37,15 @@ logger = logging.getLogger(__name__)
             'required': False,
             'default': 100,
             'description': 'Number of bars to fetch.'
+        },
+        {
+            'name': 'orient',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'default': 'records',
+            'enum': ['records', 'columns'],
+            'description': 'Response shape: a list of bars (records) or one array per field (columns).'
         }
     ],
     'responses': {
@@ -58,6 +68,9 @@ logger = logging.getLogger(__name__)
                 }
             }
         },
+        304: {
+            'description': 'Not modified since the ETag sent in If-None-Match.'
+        },
         400: {
             'description': 'Invalid request parameters.'
         },
@@ -79,26 +92,29 @@ def fetch_data_pos_endpoint():
         symbol = request.args.get('symbol')
         timeframe = request.args.get('timeframe', 'M1')
         num_bars = int(request.args.get('num_bars', 100))
+        orient = get_orient()
         
         if not symbol:
-            return jsonify({"error": "Symbol parameter is required"}), 400
+            return json_response({"error": "Symbol parameter is required"}), 400
 
         mt5_timeframe = get_timeframe(timeframe)
         
         rates = mt5.copy_rates_from_pos(symbol, mt5_timeframe, 0, num_bars)
         if rates is None:
-            return jsonify({"error": "Failed to get rates data"}), 404
-        
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        
-        return jsonify(df.to_dict(orient='records'))
+            return json_response({"error": "Failed to get rates data"}), 404
+
+        etag = bars_etag(symbol, mt5_timeframe, rates, num_bars, orient)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        return with_etag(structured_response(rates, orient), etag)
     
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error in fetch_data_pos: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @data_bp.route('/fetch_data_range', methods=['GET'])
 @swag_from({
@@ -134,6 +150,15 @@ def fetch_data_pos_endpoint():
             'required': True,
             'format': 'date-time',
             'description': 'End datetime in ISO format.'
+        },
+        {
+            'name': 'orient',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'default': 'records',
+            'enum': ['records', 'columns'],
+            'description': 'Response shape: a list of bars (records) or one array per field (columns).'
         }
     ],
     'responses': {
@@ -156,6 +181,9 @@ def fetch_data_pos_endpoint():
                 }
             }
         },
+        304: {
+            'description': 'Not modified since the ETag sent in If-None-Match.'
+        },
         400: {
             'description': 'Invalid request parameters.'
         },
@@ -178,9 +206,10 @@ def fetch_data_range_endpoint():
         timeframe = request.args.get('timeframe', 'M1')
         start_str = request.args.get('start')
         end_str = request.args.get('end')
+        orient = get_orient()
         
         if not all([symbol, start_str, end_str]):
-            return jsonify({"error": "Symbol, start, and end parameters are required"}), 400
+            return json_response({"error": "Symbol, start, and end parameters are required"}), 400
 
         mt5_timeframe = get_timeframe(timeframe)
         
@@ -191,18 +220,20 @@ def fetch_data_range_endpoint():
         
         rates = mt5.copy_rates_range(symbol, mt5_timeframe, start_date, end_date)
         if rates is None:
-            return jsonify({"error": "Failed to get rates data"}), 404
-        
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        
-        return jsonify(df.to_dict(orient='records'))
+            return json_response({"error": "Failed to get rates data"}), 404
+
+        etag = bars_etag(symbol, mt5_timeframe, rates, start_date.isoformat(), end_date.isoformat(), orient)
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+
+        return with_etag(structured_response(rates, orient), etag)
     
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return json_response({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error in fetch_data_range: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
     
 @data_bp.route('/account_info', methods=['GET'])
 @swag_from({
@@ -263,44 +294,10 @@ def account_info_endpoint():
     try:
         account = mt5.account_info()
         if account is None:
-            return jsonify({"error": "Failed to get account information"}), 404
-
-        # Convert account info to a dictionary
-        account_dict = {
-            'login': account.login,
-            'trade_mode': account.trade_mode,
-            'leverage': account.leverage,
-            'limit_orders': account.limit_orders,
-            'margin_so_mode': account.margin_so_mode,
-            'trade_allowed': account.trade_allowed,
-            'trade_expert': account.trade_expert,
-            'margin_mode': account.margin_mode,
-            'currency_digits': account.currency_digits,
-            'margin_initial': account.margin_initial,
-            'margin_maintenance': account.margin_maintenance,
-            'margin_rate_initial': account.margin_rate_initial,
-            'margin_rate_maintenance': account.margin_rate_maintenance,
-            'margin_liquidation': account.margin_liquidation,
-            'margin_call': account.margin_call,
-            'balance': account.balance,
-            'credit': account.credit,
-            'equity': account.equity,
-            'profit': account.profit,
-            'margin': account.margin,
-            'margin_free': account.margin_free,
-            'margin_level': account.margin_level,
-            'margin_level_so': account.margin_level_so,
-            'assets': account.assets,
-            'liabilities': account.liabilities,
-            'commission_blocked': account.commission_blocked,
-            'name': account.name,
-            'server': account.server,
-            'currency': account.currency,
-            'company': account.company
-        }
+            return json_response({"error": "Failed to get account information"}), 404
 
-        return jsonify(account_dict), 200
+        return json_response(account)
 
     except Exception as e:
         logger.error(f"Error in account_info_endpoint: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return json_response({"error": "Internal server error"}), 500
\ No newline at end of file
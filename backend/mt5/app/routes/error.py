@@ -1,7 +1,8 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 import logging
 import MetaTrader5 as mt5
 from flasgger import swag_from
+from serialization import json_response
 
 error_bp = Blueprint('error', __name__)
 logger = logging.getLogger(__name__)
@@ -33,10 +34,10 @@ def last_error_endpoint():
     """
     try:
         error = mt5.last_error()
-        return jsonify({"error_code": error[0], "error_message": error[1]})
+        return json_response({"error_code": error[0], "error_message": error[1]})
     except Exception as e:
         logger.error(f"Error in last_error: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @error_bp.route('/last_error_str', methods=['GET'])
 @swag_from({
@@ -64,7 +65,7 @@ def last_error_str_endpoint():
     """
     try:
         error_code, error_str = mt5.last_error()
-        return jsonify({"error_message": error_str})
+        return json_response({"error_message": error_str})
     except Exception as e:
         logger.error(f"Error in last_error_str: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return json_response({"error": "Internal server error"}), 500
\ No newline at end of file
@@ -1,23 +1,40 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, request
 import MetaTrader5 as mt5
 from flasgger import swag_from
+from connection import connection
+from serialization import json_response
 
 health_bp = Blueprint('health', __name__)
 
 @health_bp.route('/health')
 @swag_from({
     'tags': ['Health'],
+    'parameters': [
+        {
+            'name': 'deep',
+            'in': 'query',
+            'type': 'boolean',
+            'required': False,
+            'default': False,
+            'description': 'Query the terminal and account now instead of returning the cached connection state, and answer 503 when unhealthy (readiness).'
+        }
+    ],
     'responses': {
         200: {
-            'description': 'Health check successful',
+            'description': 'Health check successful. Without deep the status is always 200 (liveness); the body reports the connection state.',
             'schema': {
                 'type': 'object',
                 'properties': {
                     'status': {'type': 'string'},
                     'mt5_connected': {'type': 'boolean'},
-                    'mt5_initialized': {'type': 'boolean'}
+                    'mt5_initialized': {'type': 'boolean'},
+                    'last_check': {'type': 'number'},
+                    'last_error': {'type': 'array', 'items': {}}
                 }
             }
+        },
+        503: {
+            'description': 'Only with deep=true: terminal not initialized or not connected to the trade server.'
         }
     }
 })
@@ -25,14 +42,23 @@ def health_check():
     """
     Health Check Endpoint
     ---
-    description: Check the health status of the application and MT5 connection.
+    description: Check the health status of the application and MT5 connection. By default this is a liveness check that answers 200 from the connection state cached by the connection monitor and never calls the terminal; pass deep=true for a readiness check that queries the terminal and account directly and answers 503 when unhealthy.
     responses:
       200:
         description: Health check successful
     """
-    initialized = mt5.initialize() if mt5 is not None else False
-    return jsonify({
-        "status": "healthy",
-        "mt5_connected": mt5 is not None,
-        "mt5_initialized": initialized
-    }), 200
\ No newline at end of file
+    deep = request.args.get('deep', 'false').lower() in ('1', 'true', 'yes')
+
+    if deep:
+        connection.ensure_connected(max_age=0)
+        status = connection.status()
+        account = mt5.account_info() if connection.connected else None
+        status['account_connected'] = account is not None
+        healthy = connection.connected and account is not None
+    else:
+        status = connection.status()
+        healthy = connection.connected
+
+    status['status'] = "healthy" if healthy else "unhealthy"
+    # A terminal that disconnected must not get the API container restarted, so only readiness fails
+    return json_response(status), 200 if healthy or not deep else 503
@@ -1,8 +1,9 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, request
 import MetaTrader5 as mt5
 import logging
 from datetime import datetime
 from flasgger import swag_from
+from serialization import json_response
 from lib import get_deal_from_ticket, get_order_from_ticket
 
 history_bp = Blueprint('history', __name__)
@@ -61,20 +62,20 @@ def get_deal_from_ticket_endpoint():
     try:
         ticket = request.args.get('ticket')
         if not ticket:
-            return jsonify({"error": "Ticket parameter is required"}), 400
+            return json_response({"error": "Ticket parameter is required"}), 400
         
         ticket = int(ticket)
         deal = get_deal_from_ticket(ticket)
         if deal is None:
-            return jsonify({"error": "Failed to get deal information"}), 404
+            return json_response({"error": "Failed to get deal information"}), 404
         
-        return jsonify(deal)
+        return json_response(deal)
     
     except ValueError:
-        return jsonify({"error": "Invalid ticket format"}), 400
+        return json_response({"error": "Invalid ticket format"}), 400
     except Exception as e:
         logger.error(f"Error in get_deal_from_ticket: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @history_bp.route('/get_order_from_ticket', methods=['GET'])
 @swag_from({
@@ -119,20 +120,20 @@ def get_order_from_ticket_endpoint():
     try:
         ticket = request.args.get('ticket')
         if not ticket:
-            return jsonify({"error": "Ticket parameter is required"}), 400
+            return json_response({"error": "Ticket parameter is required"}), 400
         
         ticket = int(ticket)
         order = get_order_from_ticket(ticket)
         if order is None:
-            return jsonify({"error": "Failed to get order information"}), 404
+            return json_response({"error": "Failed to get order information"}), 404
         
-        return jsonify(order)
+        return json_response(order)
     
     except ValueError:
-        return jsonify({"error": "Invalid ticket format"}), 400
+        return json_response({"error": "Invalid ticket format"}), 400
     except Exception as e:
         logger.error(f"Error in get_order_from_ticket: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @history_bp.route('/history_deals_get', methods=['GET'])
 @swag_from({
@@ -196,7 +197,7 @@ def history_deals_get_endpoint():
         position = request.args.get('position')
         
         if not all([from_date, to_date, position]):
-            return jsonify({"error": "from_date, to_date, and position parameters are required"}), 400
+            return json_response({"error": "from_date, to_date, and position parameters are required"}), 400
         
         from_date = datetime.fromisoformat(from_date.replace('Z', '+00:00'))
         to_date = datetime.fromisoformat(to_date.replace('Z', '+00:00'))
@@ -207,16 +208,15 @@ def history_deals_get_endpoint():
         deals = mt5.history_deals_get(from_timestamp, to_timestamp, position=position)
         
         if deals is None:
-            return jsonify({"error": "Failed to get deals history"}), 404
+            return json_response({"error": "Failed to get deals history"}), 404
         
-        deals_list = [deal._asdict() for deal in deals]
-        return jsonify(deals_list)
+        return json_response(deals)
     
     except ValueError:
-        return jsonify({"error": "Invalid parameter format"}), 400
+        return json_response({"error": "Invalid parameter format"}), 400
     except Exception as e:
         logger.error(f"Error in history_deals_get: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @history_bp.route('/history_orders_get', methods=['GET'])
 @swag_from({
@@ -261,18 +261,17 @@ def history_orders_get_endpoint():
     try:
         ticket = request.args.get('ticket')
         if not ticket:
-            return jsonify({"error": "Ticket parameter is required"}), 400
+            return json_response({"error": "Ticket parameter is required"}), 400
         
         ticket = int(ticket)
         orders = mt5.history_orders_get(ticket=ticket)
         if orders is None:
-            return jsonify({"error": "Failed to get orders history"}), 404
+            return json_response({"error": "Failed to get orders history"}), 404
         
-        orders_list = [order._asdict() for order in orders]
-        return jsonify(orders_list)
+        return json_response(orders)
     
     except ValueError:
-        return jsonify({"error": "Invalid ticket format"}), 400
+        return json_response({"error": "Invalid ticket format"}), 400
     except Exception as e:
         logger.error(f"Error in history_orders_get: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return json_response({"error": "Internal server error"}), 500
\ No newline at end of file
@@ -0,0 +1,23 @@
+from flask import Blueprint, Response
+from flasgger import swag_from
+from metrics import render_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/metrics', methods=['GET'])
+@swag_from({
+    'tags': ['Metrics'],
+    'responses': {
+        200: {
+            'description': 'Prometheus metrics in text exposition format.'
+        }
+    }
+})
+def metrics_endpoint():
+    """
+    Prometheus Metrics
+    ---
+    description: Expose request latency, terminal call latency, order retcode counters and payload sizes for Prometheus.
+    """
+    payload, content_type = render_metrics()
+    return Response(payload, mimetype=content_type)
@@ -1,7 +1,8 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, request
 import MetaTrader5 as mt5
 import logging
 from flasgger import swag_from
+from serialization import json_response
 
 order_bp = Blueprint('order', __name__)
 logger = logging.getLogger(__name__)
@@ -69,11 +70,11 @@ def send_market_order_endpoint():
     try:
         data = request.get_json()
         if not data:
-            return jsonify({"error": "Order data is required"}), 400
+            return json_response({"error": "Order data is required"}), 400
 
         required_fields = ['symbol', 'volume', 'type']
         if not all(field in data for field in required_fields):
-            return jsonify({"error": "Missing required fields"}), 400
+            return json_response({"error": "Missing required fields"}), 400
 
         order_type_dict = {
             'BUY': mt5.ORDER_TYPE_BUY,
@@ -89,10 +90,10 @@ def send_market_order_endpoint():
         order_type_filling_str = data.get('type_filling', 'ORDER_FILLING_IOC')
 
         if order_type_str not in order_type_dict:
-            return jsonify({"error": "Invalid order type"}), 400
+            return json_response({"error": "Invalid order type"}), 400
 
         if order_type_filling_str not in order_type_filling_dict:
-            return jsonify({"error": "Invalid order type filling"}), 400
+            return json_response({"error": "Invalid order type filling"}), 400
 
         # Prepare the order request
         request_data = {
@@ -110,7 +111,7 @@ def send_market_order_endpoint():
         # Get current price
         tick = mt5.symbol_info_tick(data['symbol'])
         if tick is None:
-            return jsonify({"error": "Failed to get symbol price"}), 400
+            return json_response({"error": "Failed to get symbol price"}), 400
 
         # Set price based on order type
         if order_type_str == 'BUY':
@@ -118,7 +119,7 @@ def send_market_order_endpoint():
         elif order_type_str == 'SELL':
             request_data["price"] = tick.bid
         else:
-            return jsonify({"error": "Invalid order type"}), 400
+            return json_response({"error": "Invalid order type"}), 400
 
         # Add optional SL/TP if provided
         if 'sl' in data:
@@ -131,7 +132,7 @@ def send_market_order_endpoint():
         if result is None:  # Handle failed order submission
             logger.error(f"Error in send_market_order: {request_data} - {mt5.ORDER_FILLING_FOK} - {mt5.ORDER_FILLING_IOC}")
             error_code, error_str = mt5.last_error()
-            return jsonify({
+            return json_response({
                 "error": "Order failed",
                 "mt5_error": error_str
             }), 400
@@ -139,17 +140,17 @@ def send_market_order_endpoint():
         if result.retcode != mt5.TRADE_RETCODE_DONE:
             error_code, error_str = mt5.last_error()
             
-            return jsonify({
+            return json_response({
                 "error": f"Order failed: {result.comment}",
                 "mt5_error": error_str,
                 "result": result._asdict()
             }), 400
 
-        return jsonify({
+        return json_response({
             "message": "Order executed successfully",
             "result": result._asdict()
         })
     
     except Exception as e:
         logger.error(f"Error in send_market_order: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return json_response({"error": "Internal server error"}), 500
\ No newline at end of file
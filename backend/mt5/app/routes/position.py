@@ -1,8 +1,11 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, request
 import MetaTrader5 as mt5
 import logging
-from lib import close_position, close_all_positions, get_positions
+from lib import close_position, close_all_positions
+from connection import connection
+from positions_feed import position_feed
 from flasgger import swag_from
+from serialization import json_response
 
 position_bp = Blueprint('position', __name__)
 logger = logging.getLogger(__name__)
@@ -71,17 +74,17 @@ def close_position_endpoint():
     try:
         data = request.get_json()
         if not data or 'position' not in data:
-            return jsonify({"error": "Position data is required"}), 400
+            return json_response({"error": "Position data is required"}), 400
         
         result = close_position(data['position'])
         if result is None:
-            return jsonify({"error": "Failed to close position"}), 400
+            return json_response({"error": "Failed to close position"}), 400
         
-        return jsonify({"message": "Position closed successfully", "result": result._asdict()})
+        return json_response({"message": "Position closed successfully", "result": result._asdict()})
     
     except Exception as e:
         logger.error(f"Error in close_position: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @position_bp.route('/close_all_positions', methods=['POST'])
 @swag_from({
@@ -145,16 +148,16 @@ def close_all_positions_endpoint():
         
         results = close_all_positions(order_type, magic)
         if not results:
-            return jsonify({"message": "No positions were closed"}), 200
+            return json_response({"message": "No positions were closed"}), 200
         
-        return jsonify({
+        return json_response({
             "message": f"Closed {len(results)} positions",
             "results": [result._asdict() for result in results]
         })
     
     except Exception as e:
         logger.error(f"Error in close_all_positions: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @position_bp.route('/modify_sl_tp', methods=['POST'])
 @swag_from({
@@ -213,7 +216,7 @@ def modify_sl_tp_endpoint():
     try:
         data = request.get_json()
         if not data or 'position' not in data:
-            return jsonify({"error": "Position data is required"}), 400
+            return json_response({"error": "Position data is required"}), 400
         
         position = data['position']
         sl = data.get('sl')
@@ -228,13 +231,13 @@ def modify_sl_tp_endpoint():
         
         result = mt5.order_send(request_data)
         if result.retcode != mt5.TRADE_RETCODE_DONE:
-            return jsonify({"error": f"Failed to modify SL/TP: {result.comment}"}), 400
+            return json_response({"error": f"Failed to modify SL/TP: {result.comment}"}), 400
         
-        return jsonify({"message": "SL/TP modified successfully", "result": result._asdict()})
+        return json_response({"message": "SL/TP modified successfully", "result": result._asdict()})
     
     except Exception as e:
         logger.error(f"Error in modify_sl_tp: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @position_bp.route('/get_positions', methods=['GET'])
 @swag_from({
@@ -250,37 +253,33 @@ def modify_sl_tp_endpoint():
     ],
     'responses': {
         200: {
-            'description': 'Positions retrieved successfully.',
+            'description': 'Positions retrieved successfully. Without open positions the body is {"positions": []}.',
             'schema': {
-                'type': 'object',
-                'properties': {
-                    'positions': {
-                        'type': 'array',
-                        'items': {
-                            'type': 'object',
-                            'properties': {
-                                'ticket': {'type': 'integer'},
-                                'time': {'type': 'string', 'format': 'date-time'},
-                                'type': {'type': 'integer'},
-                                'magic': {'type': 'integer'},
-                                'symbol': {'type': 'string'},
-                                'volume': {'type': 'number'},
-                                'price_open': {'type': 'number'},
-                                'sl': {'type': 'number'},
-                                'tp': {'type': 'number'},
-                                'price_current': {'type': 'number'},
-                                'swap': {'type': 'number'},
-                                'profit': {'type': 'number'},
-                                'comment': {'type': 'string'},
-                                'external_id': {'type': 'string'}
-                            }
-                        }
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {
+                        'ticket': {'type': 'integer'},
+                        'time': {'type': 'integer'},
+                        'time_update_msc': {'type': 'integer'},
+                        'type': {'type': 'integer'},
+                        'magic': {'type': 'integer'},
+                        'symbol': {'type': 'string'},
+                        'volume': {'type': 'number'},
+                        'price_open': {'type': 'number'},
+                        'sl': {'type': 'number'},
+                        'tp': {'type': 'number'},
+                        'price_current': {'type': 'number'},
+                        'swap': {'type': 'number'},
+                        'profit': {'type': 'number'},
+                        'comment': {'type': 'string'},
+                        'external_id': {'type': 'string'}
                     }
                 }
             }
         },
-        400: {
-            'description': 'Bad request or failed to retrieve positions.'
+        503: {
+            'description': 'MT5 terminal is not connected.'
         },
         500: {
             'description': 'Internal server error.'
@@ -296,19 +295,25 @@ def get_positions_endpoint():
     try:
         magic = request.args.get('magic', type=int)
 
-        positions_df = get_positions(magic)
+        if not connection.ensure_connected():
+            return json_response({"error": "MT5 terminal is not connected"}), 503
+
+        positions = mt5.positions_get()
+        if positions is None:
+            return json_response({"error": "Failed to retrieve positions"}), 500
+
+        if magic is not None:
+            positions = [position for position in positions if position.magic == magic]
 
-        if positions_df is None:
-            return jsonify({"error": "Failed to retrieve positions"}), 500
-            
-        if positions_df.empty:
-            return jsonify({"positions": []}), 200
-            
-        return jsonify(positions_df.to_dict(orient='records')), 200
+        if not positions:
+            # Kept from the original API; clients check for this shape
+            return json_response({"positions": []}), 200
+
+        return json_response(positions), 200
     
     except Exception as e:
         logger.error(f"Error in get_positions: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
+        return json_response({"error": "Internal server error"}), 500
 
 @position_bp.route('/positions_total', methods=['GET'])
 @swag_from({
@@ -340,10 +345,71 @@ def positions_total_endpoint():
     try:
         total = mt5.positions_total()
         if total is None:
-            return jsonify({"error": "Failed to get positions total"}), 400
+            return json_response({"error": "Failed to get positions total"}), 400
         
-        return jsonify({"total": total})
+        return json_response({"total": total})
     
     except Exception as e:
         logger.error(f"Error in positions_total: {str(e)}")
-        return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
+        return json_response({"error": "Internal server error"}), 500
+
+@position_bp.route('/positions/changes', methods=['GET'])
+@swag_from({
+    'tags': ['Position'],
+    'parameters': [
+        {
+            'name': 'since',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Version returned by the previous call. Omit to get the full snapshot.'
+        },
+        {
+            'name': 'epoch',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Epoch returned by the previous call. A different epoch means the server restarted and a full snapshot is returned.'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Position changes since the given version.',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'epoch': {'type': 'string'},
+                    'version': {'type': 'integer'},
+                    'full': {'type': 'boolean'},
+                    'opened': {'type': 'array', 'items': {'type': 'object'}},
+                    'modified': {'type': 'array', 'items': {'type': 'object'}},
+                    'closed': {'type': 'array', 'items': {'type': 'integer'}}
+                }
+            }
+        },
+        503: {
+            'description': 'Failed to retrieve positions from the terminal.'
+        },
+        500: {
+            'description': 'Internal server error.'
+        }
+    }
+})
+def position_changes_endpoint():
+    """
+    Get Position Changes
+    ---
+    description: Return positions opened, modified (time_update_msc changed) or closed since a version. When full is true the opened list is the complete snapshot and the client should replace its state.
+    """
+    try:
+        since = request.args.get('since', type=int)
+        epoch = request.args.get('epoch')
+
+        if not position_feed.refresh():
+            return json_response({"error": "Failed to retrieve positions"}), 503
+
+        return json_response(position_feed.changes(since, epoch)), 200
+
+    except Exception as e:
+        logger.error(f"Error in position_changes: {str(e)}")
+        return json_response({"error": "Internal server error"}), 500
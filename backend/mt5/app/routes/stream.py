@@ -0,0 +1,271 @@
+from flask import Blueprint, request, Response, stream_with_context
+import MetaTrader5 as mt5
+import logging
+import os
+from datetime import datetime, timezone
+from flasgger import swag_from
+from lib import get_timeframe
+from constants import TIMEFRAME_SECONDS
+from serialization import json_response, dumps, structured_to_columns
+
+stream_bp = Blueprint('stream', __name__)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_BARS = int(os.environ.get('MT5_API_STREAM_CHUNK_BARS', 50000))
+MAX_CHUNK_BARS = 500000
+DEFAULT_CHUNK_DAYS = int(os.environ.get('MT5_API_STREAM_CHUNK_DAYS', 7))
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def parse_datetime(value):
+    """ISO 8601 (a trailing Z is accepted) or Unix seconds, as an aware UTC datetime."""
+    if value.isdigit():
+        return datetime.fromtimestamp(int(value), tz=timezone.utc)
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def ndjson_line(payload):
+    return dumps(payload) + b'\n'
+
+
+def iter_slices(start, end, step, fetch):
+    """
+    Walk [start, end] in [slice_start, slice_start + step) windows.
+
+    Yields (cursor, rows) for every non-empty window, where cursor is where to
+    resume after it (None once the range is exhausted). A failed window raises
+    SliceError carrying the cursor of that window.
+    """
+    cursor = start
+    while cursor <= end:
+        slice_end = min(cursor + step - 1, end)
+        try:
+            rows = fetch(cursor, slice_end)
+        except Exception as e:
+            logger.error(f"Stream slice {cursor}-{slice_end} failed: {str(e)}")
+            rows = None
+
+        if rows is None:
+            error_code, error_str = mt5.last_error()
+            raise SliceError(error_str, cursor)
+
+        cursor = slice_end + 1
+        if len(rows):
+            yield (cursor if cursor <= end else None), rows
+
+
+class SliceError(Exception):
+    def __init__(self, message, cursor):
+        super().__init__(message)
+        self.cursor = cursor
+
+
+def ndjson_stream(slices, encode):
+    """One NDJSON line per chunk, then a done or error line."""
+    try:
+        for cursor, rows in slices:
+            yield ndjson_line({"cursor": cursor, "count": len(rows), "data": encode(rows)})
+    except SliceError as e:
+        yield ndjson_line({"error": str(e), "cursor": e.cursor})
+        return
+    yield ndjson_line({"done": True, "cursor": None})
+
+
+@stream_bp.route('/fetch_data_range/stream', methods=['GET'])
+@swag_from({
+    'tags': ['Data'],
+    'parameters': [
+        {
+            'name': 'symbol',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'description': 'Symbol name to fetch data for.'
+        },
+        {
+            'name': 'timeframe',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'default': 'M1',
+            'description': 'Timeframe for the data (e.g., M1, M5, H1).'
+        },
+        {
+            'name': 'start',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'format': 'date-time',
+            'description': 'Start datetime in ISO format or Unix seconds.'
+        },
+        {
+            'name': 'end',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'format': 'date-time',
+            'description': 'End datetime in ISO format or Unix seconds.'
+        },
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Resume from the cursor of the last line received; overrides start.'
+        },
+        {
+            'name': 'chunk_bars',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': DEFAULT_CHUNK_BARS,
+            'description': 'Maximum bars per chunk.'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'NDJSON stream. Each line is {"cursor", "count", "data"} with data in columns orient; the last line is {"done": true} or {"error", "cursor"}.'
+        },
+        400: {
+            'description': 'Invalid request parameters.'
+        },
+        500: {
+            'description': 'Internal server error.'
+        }
+    }
+})
+def fetch_data_range_stream_endpoint():
+    """
+    Stream Data within a Date Range
+    ---
+    description: Stream historical bars for a symbol in time-sliced chunks as NDJSON, so long ranges never materialize in memory. Each chunk carries a cursor to resume an interrupted download.
+    """
+    try:
+        symbol = request.args.get('symbol')
+        timeframe = request.args.get('timeframe', 'M1')
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        cursor = request.args.get('cursor', type=int)
+        chunk_bars = min(request.args.get('chunk_bars', DEFAULT_CHUNK_BARS, type=int), MAX_CHUNK_BARS)
+
+        if not all([symbol, start_str, end_str]):
+            return json_response({"error": "Symbol, start, and end parameters are required"}), 400
+        if chunk_bars <= 0:
+            return json_response({"error": "chunk_bars must be positive"}), 400
+
+        mt5_timeframe = get_timeframe(timeframe)
+        start = int(parse_datetime(start_str).timestamp()) if cursor is None else cursor
+        end = int(parse_datetime(end_str).timestamp())
+        step = TIMEFRAME_SECONDS[mt5_timeframe] * chunk_bars
+
+        def fetch(slice_start, slice_end):
+            return mt5.copy_rates_range(
+                symbol,
+                mt5_timeframe,
+                datetime.fromtimestamp(slice_start, tz=timezone.utc),
+                datetime.fromtimestamp(slice_end, tz=timezone.utc),
+            )
+
+        generator = ndjson_stream(iter_slices(start, end, step, fetch), structured_to_columns)
+        return Response(stream_with_context(generator), mimetype=NDJSON_MIMETYPE)
+
+    except ValueError as e:
+        return json_response({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in fetch_data_range_stream: {str(e)}")
+        return json_response({"error": "Internal server error"}), 500
+
+
+@stream_bp.route('/history_deals_get/stream', methods=['GET'])
+@swag_from({
+    'tags': ['History'],
+    'parameters': [
+        {
+            'name': 'from_date',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'format': 'date-time',
+            'description': 'Start date in ISO format or Unix seconds.'
+        },
+        {
+            'name': 'to_date',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'format': 'date-time',
+            'description': 'End date in ISO format or Unix seconds.'
+        },
+        {
+            'name': 'group',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Symbol group filter, e.g. "*USD*".'
+        },
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Resume from the cursor of the last line received; overrides from_date.'
+        },
+        {
+            'name': 'chunk_days',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': DEFAULT_CHUNK_DAYS,
+            'description': 'Days of history per chunk.'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'NDJSON stream. Each line is {"cursor", "count", "data"} with data a list of deals; the last line is {"done": true} or {"error", "cursor"}.'
+        },
+        400: {
+            'description': 'Invalid parameter format or missing parameters.'
+        },
+        500: {
+            'description': 'Internal server error.'
+        }
+    }
+})
+def history_deals_stream_endpoint():
+    """
+    Stream Deals History
+    ---
+    description: Stream historical deals in day-sliced chunks as NDJSON, with a cursor per chunk to resume an interrupted download.
+    """
+    try:
+        from_str = request.args.get('from_date')
+        to_str = request.args.get('to_date')
+        group = request.args.get('group')
+        cursor = request.args.get('cursor', type=int)
+        chunk_days = request.args.get('chunk_days', DEFAULT_CHUNK_DAYS, type=int)
+
+        if not all([from_str, to_str]):
+            return json_response({"error": "from_date and to_date parameters are required"}), 400
+        if chunk_days <= 0:
+            return json_response({"error": "chunk_days must be positive"}), 400
+
+        start = int(parse_datetime(from_str).timestamp()) if cursor is None else cursor
+        end = int(parse_datetime(to_str).timestamp())
+
+        def fetch(slice_start, slice_end):
+            if group:
+                return mt5.history_deals_get(slice_start, slice_end, group=group)
+            return mt5.history_deals_get(slice_start, slice_end)
+
+        generator = ndjson_stream(iter_slices(start, end, chunk_days * 86400, fetch), list)
+        return Response(stream_with_context(generator), mimetype=NDJSON_MIMETYPE)
+
+    except ValueError:
+        return json_response({"error": "Invalid parameter format"}), 400
+    except Exception as e:
+        logger.error(f"Error in history_deals_stream: {str(e)}")
+        return json_response({"error": "Internal server error"}), 500
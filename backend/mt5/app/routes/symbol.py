@@ -1,6 +1,7 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint
 import MetaTrader5 as mt5
 from flasgger import swag_from
+from serialization import json_response
 import logging
 
 symbol_bp = Blueprint('symbol', __name__)
@@ -45,10 +46,9 @@ def get_symbol_info_tick_endpoint(symbol):
     """
     tick = mt5.symbol_info_tick(symbol)
     if tick is None:
-        return jsonify({"error": "Failed to get symbol tick info"}), 404
+        return json_response({"error": "Failed to get symbol tick info"}), 404
     
-    tick_dict = tick._asdict()
-    return jsonify(tick_dict)
+    return json_response(tick)
 
 @symbol_bp.route('/symbol_info/<symbol>', methods=['GET'])
 @swag_from({
@@ -95,7 +95,6 @@ def get_symbol_info(symbol):
     """
     symbol_info = mt5.symbol_info(symbol)
     if symbol_info is None:
-        return jsonify({"error": "Failed to get symbol info"}), 404
+        return json_response({"error": "Failed to get symbol info"}), 404
     
-    symbol_info_dict = symbol_info._asdict()
-    return jsonify(symbol_info_dict)
\ No newline at end of file
+    return json_response(symbol_info)
\ No newline at end of file
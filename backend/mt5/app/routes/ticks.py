@@ -0,0 +1,236 @@
+from flask import Blueprint, request, Response, stream_with_context
+import MetaTrader5 as mt5
+import logging
+import os
+from datetime import datetime, timezone
+from flasgger import swag_from
+from serialization import json_response, structured_to_columns
+from frames import MIMETYPE as FRAMES_MIMETYPE, encode_frame, encode_array
+from routes.stream import parse_datetime, iter_slices, SliceError, ndjson_stream, NDJSON_MIMETYPE
+
+ticks_bp = Blueprint('ticks', __name__)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SECONDS = int(os.environ.get('MT5_API_TICK_CHUNK_SECONDS', 3600))
+MAX_TICKS = int(os.environ.get('MT5_API_MAX_TICKS', 1000000))
+
+TICK_FLAGS = {
+    'ALL': mt5.COPY_TICKS_ALL,
+    'INFO': mt5.COPY_TICKS_INFO,
+    'TRADE': mt5.COPY_TICKS_TRADE,
+}
+
+FORMAT_BINARY = 'binary'
+FORMAT_JSON = 'json'
+FORMAT_NDJSON = 'ndjson'
+
+TICK_FIELDS_DESCRIPTION = 'Fields: time, bid, ask, last, volume, time_msc, flags, volume_real.'
+
+
+def get_tick_flags():
+    flags = request.args.get('flags', 'ALL').upper()
+    if flags not in TICK_FLAGS:
+        raise ValueError(f"Invalid flags: '{flags}'. Valid options are: {', '.join(TICK_FLAGS)}.")
+    return TICK_FLAGS[flags]
+
+
+def get_format(allowed):
+    response_format = request.args.get('format', FORMAT_BINARY).lower()
+    if response_format not in allowed:
+        raise ValueError(f"Invalid format: '{response_format}'. Valid options are: {', '.join(allowed)}.")
+    return response_format
+
+
+def ticks_response(ticks, response_format):
+    if response_format == FORMAT_JSON:
+        return json_response(structured_to_columns(ticks))
+    return Response(encode_array(ticks), mimetype=FRAMES_MIMETYPE)
+
+
+def frame_stream(slices):
+    """One binary frame per chunk, then a done or error frame."""
+    try:
+        for cursor, rows in slices:
+            yield encode_frame(rows, cursor)
+    except SliceError as e:
+        yield encode_frame(cursor=e.cursor, error=str(e))
+        return
+    yield encode_frame(done=True)
+
+
+@ticks_bp.route('/copy_ticks_range', methods=['GET'])
+@swag_from({
+    'tags': ['Ticks'],
+    'parameters': [
+        {'name': 'symbol', 'in': 'query', 'type': 'string', 'required': True, 'description': 'Symbol name.'},
+        {'name': 'start', 'in': 'query', 'type': 'string', 'required': True, 'format': 'date-time',
+         'description': 'Start datetime in ISO format or Unix seconds.'},
+        {'name': 'end', 'in': 'query', 'type': 'string', 'required': True, 'format': 'date-time',
+         'description': 'End datetime in ISO format or Unix seconds.'},
+        {'name': 'flags', 'in': 'query', 'type': 'string', 'required': False, 'default': 'ALL',
+         'enum': ['ALL', 'INFO', 'TRADE'], 'description': 'Tick types to copy.'},
+        {'name': 'format', 'in': 'query', 'type': 'string', 'required': False, 'default': 'binary',
+         'enum': ['binary', 'json'], 'description': 'Binary columnar frames or JSON in columns orient.'}
+    ],
+    'responses': {
+        200: {'description': f'Ticks in the requested format. {TICK_FIELDS_DESCRIPTION}'},
+        400: {'description': 'Invalid request parameters.'},
+        404: {'description': 'Failed to get ticks.'},
+        413: {'description': 'Range holds more than MT5_API_MAX_TICKS ticks; use /copy_ticks_range/stream.'},
+        500: {'description': 'Internal server error.'}
+    }
+})
+def copy_ticks_range_endpoint():
+    """
+    Copy Ticks within a Date Range
+    ---
+    description: Retrieve ticks for a symbol between two dates as binary columnar frames (default) or columnar JSON.
+    """
+    try:
+        symbol = request.args.get('symbol')
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        flags = get_tick_flags()
+        response_format = get_format((FORMAT_BINARY, FORMAT_JSON))
+
+        if not all([symbol, start_str, end_str]):
+            return json_response({"error": "Symbol, start, and end parameters are required"}), 400
+
+        ticks = mt5.copy_ticks_range(symbol, parse_datetime(start_str), parse_datetime(end_str), flags)
+        if ticks is None:
+            return json_response({"error": "Failed to get ticks"}), 404
+        if len(ticks) > MAX_TICKS:
+            return json_response({"error": f"Range holds {len(ticks)} ticks, use /copy_ticks_range/stream"}), 413
+
+        return ticks_response(ticks, response_format)
+
+    except ValueError as e:
+        return json_response({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in copy_ticks_range: {str(e)}")
+        return json_response({"error": "Internal server error"}), 500
+
+
+@ticks_bp.route('/copy_ticks_from', methods=['GET'])
+@swag_from({
+    'tags': ['Ticks'],
+    'parameters': [
+        {'name': 'symbol', 'in': 'query', 'type': 'string', 'required': True, 'description': 'Symbol name.'},
+        {'name': 'start', 'in': 'query', 'type': 'string', 'required': True, 'format': 'date-time',
+         'description': 'Datetime of the first tick in ISO format or Unix seconds.'},
+        {'name': 'count', 'in': 'query', 'type': 'integer', 'required': False, 'default': 1000,
+         'description': 'Number of ticks to copy, at most MT5_API_MAX_TICKS.'},
+        {'name': 'flags', 'in': 'query', 'type': 'string', 'required': False, 'default': 'ALL',
+         'enum': ['ALL', 'INFO', 'TRADE'], 'description': 'Tick types to copy.'},
+        {'name': 'format', 'in': 'query', 'type': 'string', 'required': False, 'default': 'binary',
+         'enum': ['binary', 'json'], 'description': 'Binary columnar frames or JSON in columns orient.'}
+    ],
+    'responses': {
+        200: {'description': f'Ticks in the requested format. {TICK_FIELDS_DESCRIPTION}'},
+        400: {'description': 'Invalid request parameters.'},
+        404: {'description': 'Failed to get ticks.'},
+        500: {'description': 'Internal server error.'}
+    }
+})
+def copy_ticks_from_endpoint():
+    """
+    Copy Ticks from a Date
+    ---
+    description: Retrieve a number of ticks for a symbol starting at a date as binary columnar frames (default) or columnar JSON.
+    """
+    try:
+        symbol = request.args.get('symbol')
+        start_str = request.args.get('start')
+        count = request.args.get('count', 1000, type=int)
+        flags = get_tick_flags()
+        response_format = get_format((FORMAT_BINARY, FORMAT_JSON))
+
+        if not all([symbol, start_str]):
+            return json_response({"error": "Symbol and start parameters are required"}), 400
+        if not 0 < count <= MAX_TICKS:
+            return json_response({"error": f"count must be between 1 and {MAX_TICKS}"}), 400
+
+        ticks = mt5.copy_ticks_from(symbol, parse_datetime(start_str), count, flags)
+        if ticks is None:
+            return json_response({"error": "Failed to get ticks"}), 404
+
+        return ticks_response(ticks, response_format)
+
+    except ValueError as e:
+        return json_response({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in copy_ticks_from: {str(e)}")
+        return json_response({"error": "Internal server error"}), 500
+
+
+@ticks_bp.route('/copy_ticks_range/stream', methods=['GET'])
+@swag_from({
+    'tags': ['Ticks'],
+    'parameters': [
+        {'name': 'symbol', 'in': 'query', 'type': 'string', 'required': True, 'description': 'Symbol name.'},
+        {'name': 'start', 'in': 'query', 'type': 'string', 'required': True, 'format': 'date-time',
+         'description': 'Start datetime in ISO format or Unix seconds.'},
+        {'name': 'end', 'in': 'query', 'type': 'string', 'required': True, 'format': 'date-time',
+         'description': 'End datetime in ISO format or Unix seconds.'},
+        {'name': 'cursor', 'in': 'query', 'type': 'integer', 'required': False,
+         'description': 'Resume from the cursor (Unix seconds) of the last frame received; overrides start.'},
+        {'name': 'chunk_seconds', 'in': 'query', 'type': 'integer', 'required': False, 'default': DEFAULT_CHUNK_SECONDS,
+         'description': 'Seconds of ticks per chunk.'},
+        {'name': 'flags', 'in': 'query', 'type': 'string', 'required': False, 'default': 'ALL',
+         'enum': ['ALL', 'INFO', 'TRADE'], 'description': 'Tick types to copy.'},
+        {'name': 'format', 'in': 'query', 'type': 'string', 'required': False, 'default': 'binary',
+         'enum': ['binary', 'ndjson'], 'description': 'Binary columnar frames or NDJSON lines in columns orient.'}
+    ],
+    'responses': {
+        200: {'description': f'A stream of chunks, each with the cursor to resume from. {TICK_FIELDS_DESCRIPTION}'},
+        400: {'description': 'Invalid request parameters.'},
+        500: {'description': 'Internal server error.'}
+    }
+})
+def copy_ticks_range_stream_endpoint():
+    """
+    Stream Ticks within a Date Range
+    ---
+    description: Stream ticks between two dates in time-sliced chunks, as binary columnar frames (default) or NDJSON, with a resumption cursor per chunk.
+    """
+    try:
+        symbol = request.args.get('symbol')
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        cursor = request.args.get('cursor', type=int)
+        chunk_seconds = request.args.get('chunk_seconds', DEFAULT_CHUNK_SECONDS, type=int)
+        flags = get_tick_flags()
+        response_format = get_format((FORMAT_BINARY, FORMAT_NDJSON))
+
+        if not all([symbol, start_str, end_str]):
+            return json_response({"error": "Symbol, start, and end parameters are required"}), 400
+        if chunk_seconds <= 0:
+            return json_response({"error": "chunk_seconds must be positive"}), 400
+
+        start = int(parse_datetime(start_str).timestamp()) if cursor is None else cursor
+        end = int(parse_datetime(end_str).timestamp())
+
+        def fetch(slice_start, slice_end):
+            # Ask for one second more and cut at the boundary so ticks inside the
+            # window's last second are kept and none is sent twice.
+            ticks = mt5.copy_ticks_range(
+                symbol,
+                datetime.fromtimestamp(slice_start, tz=timezone.utc),
+                datetime.fromtimestamp(slice_end + 1, tz=timezone.utc),
+                flags,
+            )
+            if ticks is None:
+                return None
+            time_msc = ticks['time_msc']
+            return ticks[(time_msc >= slice_start * 1000) & (time_msc < (slice_end + 1) * 1000)]
+
+        slices = iter_slices(start, end, chunk_seconds, fetch)
+        if response_format == FORMAT_NDJSON:
+            return Response(stream_with_context(ndjson_stream(slices, structured_to_columns)), mimetype=NDJSON_MIMETYPE)
+        return Response(stream_with_context(frame_stream(slices)), mimetype=FRAMES_MIMETYPE)
+
+    except ValueError as e:
+        return json_response({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error in copy_ticks_range_stream: {str(e)}")
+        return json_response({"error": "Internal server error"}), 500
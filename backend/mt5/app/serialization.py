@@ -0,0 +1,79 @@
+import datetime
+
+import numpy as np
+import orjson
+from flask import Response, request
+
+# Naive datetimes from the terminal are UTC; numpy scalars and arrays are
+# serialized natively instead of going through tolist().
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+ORIENT_RECORDS = 'records'
+ORIENT_COLUMNS = 'columns'
+ORIENTS = (ORIENT_RECORDS, ORIENT_COLUMNS)
+
+# Structured array fields holding Unix seconds, rendered as ISO 8601 timestamps.
+TIME_FIELDS = {'time'}
+
+
+def _default(obj):
+    # MT5 result structures are namedtuples, which orjson does not serialize
+    if hasattr(obj, '_asdict'):
+        return obj._asdict()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, datetime.date):
+        return obj.isoformat()
+    # pandas objects, for routes that still build DataFrames in lib.py
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict(orient='records')
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(payload):
+    return orjson.dumps(payload, default=_default, option=ORJSON_OPTIONS)
+
+
+def json_response(payload, status=200):
+    """Drop-in replacement for jsonify() that encodes with orjson."""
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def _column(array, name):
+    column = array[name]
+    if name in TIME_FIELDS:
+        # datetime64[s].tolist() yields naive datetimes, which orjson emits as UTC
+        return column.astype('datetime64[s]').tolist()
+    return column.tolist()
+
+
+def structured_to_columns(array):
+    """{'time': [...], 'open': [...], ...} from a numpy structured array."""
+    return {name: _column(array, name) for name in array.dtype.names}
+
+
+def structured_to_records(array):
+    """[{'time': ..., 'open': ...}, ...] from a numpy structured array."""
+    names = array.dtype.names
+    columns = [_column(array, name) for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def get_orient():
+    """Response shape requested with ?orient=records|columns (default records)."""
+    orient = request.args.get('orient', ORIENT_RECORDS).lower()
+    if orient not in ORIENTS:
+        raise ValueError(f"Invalid orient: '{orient}'. Valid options are: {', '.join(ORIENTS)}.")
+    return orient
+
+
+def structured_response(array, orient=ORIENT_RECORDS, status=200):
+    if orient == ORIENT_COLUMNS:
+        payload = structured_to_columns(array)
+    else:
+        payload = structured_to_records(array)
+    return json_response(payload, status)
@@ -0,0 +1,26 @@
+import logging
+import os
+from waitress import serve
+from app import app
+from connection import connection
+
+logger = logging.getLogger(__name__)
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
+    if not connection.connect():
+        logger.error("Failed to initialize MT5.")
+    connection.start_monitor()
+
+    # Request threads only parse, serialize and wait; terminal calls are
+    # funnelled through the executor in terminal.py.
+    serve(
+        app,
+        host='0.0.0.0',
+        port=int(os.environ.get('MT5_API_PORT')),
+        threads=int(os.environ.get('MT5_API_THREADS', 16)),
+        connection_limit=int(os.environ.get('MT5_API_CONNECTION_LIMIT', 100)),
+        channel_timeout=int(os.environ.get('MT5_API_CHANNEL_TIMEOUT', 120)),
+        ident='mt5-api',
+    )
@@ -0,0 +1,191 @@
+import logging
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+import MetaTrader5 as mt5
+from flask import request, g
+from prometheus_client import Gauge, Histogram, Counter
+
+from serialization import json_response
+
+logger = logging.getLogger(__name__)
+
+# The MetaTrader5 package talks to a single terminal over one IPC channel and is
+# not safe to call from several threads at once. Every call listed here is run on
+# a dedicated executor; the request threads only wait for the result.
+TERMINAL_FUNCTIONS = [
+    'initialize',
+    'login',
+    'shutdown',
+    'terminal_info',
+    'account_info',
+    'symbols_total',
+    'symbols_get',
+    'symbol_select',
+    'symbol_info',
+    'symbol_info_tick',
+    'copy_rates_from',
+    'copy_rates_from_pos',
+    'copy_rates_range',
+    'copy_ticks_from',
+    'copy_ticks_range',
+    'orders_total',
+    'orders_get',
+    'order_check',
+    'order_send',
+    'positions_total',
+    'positions_get',
+    'history_orders_total',
+    'history_orders_get',
+    'history_deals_total',
+    'history_deals_get',
+    'last_error',
+]
+
+TERMINAL_WORKERS = int(os.environ.get('MT5_TERMINAL_WORKERS', 1))
+DEFAULT_ROUTE_CONCURRENCY = int(os.environ.get('MT5_API_ROUTE_CONCURRENCY', 8))
+ROUTE_QUEUE_TIMEOUT = float(os.environ.get('MT5_API_ROUTE_QUEUE_TIMEOUT', 10))
+
+# Routes that hold the terminal longest get fewer slots so they cannot starve
+# order placement and position reads.
+ROUTE_CONCURRENCY_LIMITS = {
+    '/fetch_data_range': 2,
+    '/fetch_data_range/stream': 2,
+    '/copy_ticks_range': 2,
+    '/copy_ticks_range/stream': 2,
+    '/copy_ticks_from': 2,
+    '/get_deal_from_ticket': 2,
+    '/history_deals_get': 2,
+    '/history_deals_get/stream': 2,
+    '/history_orders_get': 2,
+    '/close_all_positions': 1,
+}
+
+# Routes that never touch the terminal and are not limited.
+UNLIMITED_ROUTES = {'/metrics', '/health', '/apidocs/', '/apispec_1.json'}
+
+TERMINAL_QUEUE_DEPTH = Gauge(
+    'mt5_terminal_queue_depth',
+    'Terminal calls submitted and not yet started.',
+)
+
+TERMINAL_QUEUE_WAIT = Histogram(
+    'mt5_terminal_queue_wait_seconds',
+    'Time a terminal call waited for the executor before it started.',
+    ['function'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+ROUTE_IN_FLIGHT = Gauge(
+    'mt5_api_requests_in_flight',
+    'Requests currently holding a concurrency slot.',
+    ['endpoint'],
+)
+
+ROUTE_WAITING = Gauge(
+    'mt5_api_requests_waiting',
+    'Requests waiting for a concurrency slot.',
+    ['endpoint'],
+)
+
+ROUTE_REJECTED = Counter(
+    'mt5_api_requests_rejected_total',
+    'Requests rejected because no concurrency slot freed up in time.',
+    ['endpoint'],
+)
+
+_executor = ThreadPoolExecutor(max_workers=TERMINAL_WORKERS, thread_name_prefix='mt5-terminal')
+_executor_threads = set()
+_route_semaphores = {}
+_route_semaphores_lock = threading.Lock()
+
+
+def _register_executor_thread():
+    _executor_threads.add(threading.get_ident())
+
+
+def _serialized_terminal_call(name, func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Calls made from the executor itself (e.g. last_error after a failure
+        # inside a wrapped call) must not queue behind themselves.
+        if threading.get_ident() in _executor_threads:
+            return func(*args, **kwargs)
+
+        submitted = time.perf_counter()
+        TERMINAL_QUEUE_DEPTH.inc()
+
+        def run():
+            _register_executor_thread()
+            TERMINAL_QUEUE_DEPTH.dec()
+            TERMINAL_QUEUE_WAIT.labels(function=name).observe(time.perf_counter() - submitted)
+            return func(*args, **kwargs)
+
+        return _executor.submit(run).result()
+
+    wrapper.__mt5_serialized__ = True
+    return wrapper
+
+
+def serialize_terminal():
+    """Route every MetaTrader5 call through the terminal executor, in place."""
+    for name in TERMINAL_FUNCTIONS:
+        func = getattr(mt5, name, None)
+        if func is None or getattr(func, '__mt5_serialized__', False):
+            continue
+        setattr(mt5, name, _serialized_terminal_call(name, func))
+
+
+def _route_semaphore(endpoint):
+    with _route_semaphores_lock:
+        semaphore = _route_semaphores.get(endpoint)
+        if semaphore is None:
+            limit = ROUTE_CONCURRENCY_LIMITS.get(endpoint, DEFAULT_ROUTE_CONCURRENCY)
+            semaphore = threading.BoundedSemaphore(limit)
+            _route_semaphores[endpoint] = semaphore
+        return semaphore
+
+
+def init_terminal(app):
+    """
+    Serialize terminal access and apply per-route concurrency limits.
+
+    Must run after init_metrics so terminal call latency excludes queue wait.
+    """
+    serialize_terminal()
+
+    @app.before_request
+    def _acquire_route_slot():
+        if request.url_rule is None:
+            return None
+        endpoint = request.url_rule.rule
+        if endpoint in UNLIMITED_ROUTES:
+            return None
+
+        semaphore = _route_semaphore(endpoint)
+        ROUTE_WAITING.labels(endpoint=endpoint).inc()
+        try:
+            acquired = semaphore.acquire(timeout=ROUTE_QUEUE_TIMEOUT)
+        finally:
+            ROUTE_WAITING.labels(endpoint=endpoint).dec()
+
+        if not acquired:
+            ROUTE_REJECTED.labels(endpoint=endpoint).inc()
+            logger.warning(f"Rejected request to {endpoint}: concurrency limit reached")
+            response = json_response({"error": "Too many concurrent requests, retry later"})
+            response.headers['Retry-After'] = '1'
+            return response, 503
+
+        g.route_slot = endpoint
+        ROUTE_IN_FLIGHT.labels(endpoint=endpoint).inc()
+        return None
+
+    @app.teardown_request
+    def _release_route_slot(exc):
+        endpoint = g.pop('route_slot', None)
+        if endpoint is not None:
+            ROUTE_IN_FLIGHT.labels(endpoint=endpoint).dec()
+            _route_semaphore(endpoint).release()